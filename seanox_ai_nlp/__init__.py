@@ -11,17 +11,47 @@ from .units import (
     NUMERIC_VALIDATION_PATTERN,
     NUMERIC_EXPRESSION_VALIDATION_PATTERN,
     units,
+    units_async,
+    units_incremental,
+    NumericLocale,
+    NumericPatterns,
+    numeric_patterns,
     SpacingMode,
-    spacing
+    spacing,
+    spacing_async,
+    NumericType,
+    Numeric,
+    decompose,
+    UnitFactor,
+    UnitExpression,
+    parse_unit,
+    UnitIndex,
+    units_bytes,
+    char_offsets,
+    numeric_bytes_patterns,
+    units_parquet,
+    Scanner,
+    ScannerMatch,
+    profile_units,
+    UnitsProfile,
+    PatternProfile
 )
 
 from .synthetics import (
     synthetics,
+    synthetics_batch,
+    synthetics_parallel,
+    synthetics_cache,
+    synthetics_bundle,
     Synthetic,
+    TemplateCacheInfo,
     TemplateException,
     TemplateConditionException,
     TemplateExpressionException,
-    TemplateSyntaxException
+    TemplateSyntaxException,
+    write_jsonl,
+    write_parquet,
+    write_docbin
 )
 
 from .relations import (
@@ -50,16 +80,46 @@ __all__ = [
     "NUMERIC_VALIDATION_PATTERN",
     "NUMERIC_EXPRESSION_VALIDATION_PATTERN",
     "units",
+    "units_async",
+    "units_incremental",
+    "NumericLocale",
+    "NumericPatterns",
+    "numeric_patterns",
     "SpacingMode",
     "spacing",
+    "spacing_async",
+    "NumericType",
+    "Numeric",
+    "decompose",
+    "UnitFactor",
+    "UnitExpression",
+    "parse_unit",
+    "UnitIndex",
+    "units_bytes",
+    "char_offsets",
+    "numeric_bytes_patterns",
+    "units_parquet",
+    "Scanner",
+    "ScannerMatch",
+    "profile_units",
+    "UnitsProfile",
+    "PatternProfile",
 
     # synthetics
     "synthetics",
+    "synthetics_batch",
+    "synthetics_parallel",
+    "synthetics_cache",
+    "synthetics_bundle",
     "Synthetic",
+    "TemplateCacheInfo",
     "TemplateException",
     "TemplateConditionException",
     "TemplateExpressionException",
     "TemplateSyntaxException",
+    "write_jsonl",
+    "write_parquet",
+    "write_docbin",
 
     # relations
     "Entity",
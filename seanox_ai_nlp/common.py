@@ -0,0 +1,51 @@
+# seanox_ai_npl/common.py
+
+# DESIGN NOTE
+#
+# Helpers that are shared by the modules of the package, e.g. by the batch
+# extraction of units and the writers of synthetics. They do not depend on the
+# modules of the package, so that they can be imported from everywhere.
+#
+# - Optional dependencies are only imported when they are used, so that the
+#   modules remain usable without them.
+# - Work for worker processes is submitted with a limited number of tasks in
+#   progress (twice the number of workers), so that large or unbounded inputs
+#   are not submitted at once. The results are returned in the order of the
+#   tasks.
+
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Iterable, Iterator
+
+
+def _import_pyarrow(usage: str) -> tuple[Any, Any]:
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as exception:
+        raise ImportError(
+            f"{usage} requires pyarrow,"
+            " install it with: pip install seanox-ai-nlp[parquet]"
+        ) from exception
+    return pyarrow, pyarrow.parquet
+
+
+def _map_bounded(function: Callable, tasks: Iterable[tuple], workers: int) -> Iterator[Any]:
+    if workers <= 1:
+        for task in tasks:
+            yield function(*task)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        try:
+            for task in tasks:
+                pending.append(executor.submit(function, *task))
+                if len(pending) >= workers * 2:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
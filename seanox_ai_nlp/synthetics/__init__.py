@@ -2,18 +2,37 @@
 
 from .synthetics import (
     synthetics,
+    synthetics_batch,
+    synthetics_parallel,
+    synthetics_cache,
+    synthetics_bundle,
     Synthetic,
+    TemplateCacheInfo,
     TemplateException,
     TemplateConditionException,
     TemplateExpressionException,
     TemplateSyntaxException
 )
 
+from .writers import (
+    write_jsonl,
+    write_parquet,
+    write_docbin
+)
+
 __all__ = [
     "synthetics",
+    "synthetics_batch",
+    "synthetics_parallel",
+    "synthetics_cache",
+    "synthetics_bundle",
     "Synthetic",
+    "TemplateCacheInfo",
     "TemplateException",
     "TemplateConditionException",
     "TemplateExpressionException",
-    "TemplateSyntaxException"
+    "TemplateSyntaxException",
+    "write_jsonl",
+    "write_parquet",
+    "write_docbin"
 ]
@@ -1,16 +1,29 @@
 # seanox_ai_npl/synthetics/synthetics.py
 
-from collections import deque, defaultdict
+from collections import deque, defaultdict, OrderedDict
 from dataclasses import dataclass
+from functools import lru_cache
 from jinja2 import (
-    Environment, BaseLoader, DebugUndefined, Undefined, TemplateAssertionError
+    Environment, BaseLoader, DebugUndefined, Undefined, TemplateAssertionError, pass_context
 )
-from typing import Callable, Any, Optional
-
+from jinja2.runtime import Context
+from seanox_ai_nlp.common import _map_bounded
+from typing import Callable, Any, Iterable, Iterator, NamedTuple, Optional
+
+import ast
+import hashlib
+import importlib.metadata
+import itertools
+import jinja2
 import jsonschema
+import marshal
 import os
 import random
 import re
+import sys
+import threading
+import time
+import weakref
 import yaml
 
 
@@ -53,6 +66,19 @@ _ENTITY_MARKER_NAME_PATTERN = re.compile(rf"^{_ENTITY_MARKER_NAME_RAW_PATTERN}$"
 _ENTITY_MARKER_PATTERN = _re_compile(_ENTITY_MARKER_RAW_PATTERN)
 _ENTITY_MARKER_REGEX_PATTERN = _re_compile(rf"\{{\$(?:)({_ENTITY_MARKER_NAME_RAW_PATTERN})\}}")
 
+# Marker-free annotation: the filter annotate records the labels in the render
+# context and encloses the value in sentinels, noncharacters that are reserved
+# for internal use, with the index of the label as a character after the start
+# sentinel, starting with the private use area.
+_ANNOTATION_LABELS = "_synthetics_annotation_labels"
+_ANNOTATION_SENTINEL_START = "\ufdd0"
+_ANNOTATION_SENTINEL_END = "\ufdd1"
+_ANNOTATION_SENTINEL_LABEL = 0xE000
+_ANNOTATION_SENTINEL_PATTERN = re.compile(
+    f"{_ANNOTATION_SENTINEL_START}(.)([^{_ANNOTATION_SENTINEL_START}{_ANNOTATION_SENTINEL_END}]*){_ANNOTATION_SENTINEL_END}",
+    re.DOTALL
+)
+
 _SEGMENT_PLACEHOLDER_NAME = r"(?:\w(?:[\w\-\:]*\w)?)"
 _SEGMENT_PLACEHOLDER_INLINE = rf"@({_SEGMENT_PLACEHOLDER_NAME})"
 _SEGMENT_PLACEHOLDER_BRACED = rf"{{@({_SEGMENT_PLACEHOLDER_NAME})}}"
@@ -151,7 +177,7 @@ def _annotate(value: Any = "", label: str = "") -> str:
     )
 
 
-def _random_range(items: list[Any], limit: int = -1) -> list[Any]:
+def _random_range(items: list[Any], limit: int = -1, rng: random.Random = None) -> list[Any]:
     """
     Randomly selects and shuffles a subset of items from the provided list.
 
@@ -168,6 +194,8 @@ def _random_range(items: list[Any], limit: int = -1) -> list[Any]:
         items (list[Any]): The list of items to choose from.
         limit (int, optional): Maximum number of items to include. If negative,
             no limit is applied.
+        rng (random.Random, optional): Random number generator, default is the
+            random module.
 
     Returns:
         list[Any]: A randomly selected and shuffled subset of the input list.
@@ -178,13 +206,15 @@ def _random_range(items: list[Any], limit: int = -1) -> list[Any]:
         limit = len(items)
     elif limit <= 0:
         return []
-    count = random.randint(1, min(limit, len(items)))
-    selection = random.sample(items, count)
-    random.shuffle(selection)
+    if rng is None:
+        rng = random
+    count = rng.randint(1, min(limit, len(items)))
+    selection = rng.sample(items, count)
+    rng.shuffle(selection)
     return selection
 
 
-def _random_range_join(items: list[Any], separator: str = ", ", limit: int = -1) -> str:
+def _random_range_join(items: list[Any], separator: str = ", ", limit: int = -1, rng: random.Random = None) -> str:
     """
     The method is intended as a function in the template. It randomly selects
     and joins a subset of strings from the provided list using the given
@@ -207,16 +237,24 @@ def _random_range_join(items: list[Any], separator: str = ", ", limit: int = -1)
         separator (str): The string used to separate the selected items.
         limit (int, optional): Maximum number of items to include. If negative,
             no limit is applied.
+        rng (random.Random, optional): Random number generator, default is the
+            random module.
 
     Returns:
         str: A string of randomly selected and joined items, or an empty string
             if `items` is empty.
     """
-    selection = [str(item) for item in _random_range(items, limit)]
+    selection = [str(item) for item in _random_range(items, limit, rng)]
     return separator.join(selection)
 
 
-def _random_range_join_phrase(items: list[Any], separator: str = ", ", word: str = ", ", limit: int = -1) -> str:
+def _random_range_join_phrase(
+        items: list[Any],
+        separator: str = ", ",
+        word: str = ", ",
+        limit: int = -1,
+        rng: random.Random = None
+) -> str:
     """
     The method is intended as a function in the template. It randomly selects
     and joins a subset of strings from the provided list into a natural-language
@@ -246,11 +284,13 @@ def _random_range_join_phrase(items: list[Any], separator: str = ", ", word: str
             "or").
         limit (int, optional): Maximum number of items to include. If negative,
             no limit is applied.
+        rng (random.Random, optional): Random number generator, default is the
+            random module.
 
     Returns:
         str: A natural-language phrase of randomly selected items, or an empty string if `items` is empty.
     """
-    selection = [str(item) for item in _random_range(items, limit)]
+    selection = [str(item) for item in _random_range(items, limit, rng)]
     if len(selection) <= 0:
         return ""
     elif len(selection) == 1:
@@ -261,7 +301,7 @@ def _random_range_join_phrase(items: list[Any], separator: str = ", ", word: str
         return f"{separator.join(selection[:-1])}{word}{selection[-1]}"
 
 
-def _random_set(items: list[Any], count: int = -1) -> list[Any]:
+def _random_set(items: list[Any], count: int = -1, rng: random.Random = None) -> list[Any]:
     """
     The method is intended as a function in the template. It randomly selects a
     subset of items from the provided list.
@@ -281,6 +321,8 @@ def _random_set(items: list[Any], count: int = -1) -> list[Any]:
     Args:
         items (list[Any]): The list of strings to choose from.
         count (int): The number of items to select.
+        rng (random.Random, optional): Random number generator, default is the
+            random module.
 
     Returns:
         list[str]: A randomly selected subset of items, or an empty list if
@@ -292,7 +334,9 @@ def _random_set(items: list[Any], count: int = -1) -> list[Any]:
         count = len(items)
     elif count <= 0:
         return []
-    return random.sample(items, min(count, len(items)))
+    if rng is None:
+        rng = random
+    return rng.sample(items, min(count, len(items)))
 
 
 def _normalize(text: str = "") -> str:
@@ -321,6 +365,70 @@ def _normalize(text: str = "") -> str:
     return text
 
 
+# The built-in random filters use the random number generator of the rendering,
+# which is the object random in the template context (random module or the rng
+# of the call), so that the generation does not depend on the global state.
+
+def _get_rng(context: Context) -> Any:
+    rng = context.get("random")
+    return rng if rng is not None else random
+
+
+@pass_context
+def _filter_annotate(context: Context, value: Any = "", label: str = "") -> str:
+    # Without the labels in the context the markers are used, as in the
+    # validation of the templates when loading.
+    labels = context.get(_ANNOTATION_LABELS)
+    if labels is None:
+        return _annotate(value, label)
+    value = str(value)
+    if not label or not _ENTITY_MARKER_NAME_PATTERN.match(label.strip()):
+        return value
+    if not value or not value.strip():
+        return value
+    label = label.strip()
+    start = labels.get(label)
+    if start is None:
+        start = labels[label] = _ANNOTATION_SENTINEL_START + chr(_ANNOTATION_SENTINEL_LABEL + len(labels))
+    return f"{start}{value}{_ANNOTATION_SENTINEL_END}"
+
+
+@pass_context
+def _filter_random(context: Context, items: Any) -> Any:
+    # Replaces the built-in random filter of Jinja2, which uses the random
+    # module.
+    try:
+        return _get_rng(context).choice(items)
+    except IndexError:
+        return context.environment.undefined("No random item, sequence was empty.")
+
+
+@pass_context
+def _filter_random_range(context: Context, items: list[Any], limit: int = -1) -> list[Any]:
+    return _random_range(items, limit, _get_rng(context))
+
+
+@pass_context
+def _filter_random_range_join(context: Context, items: list[Any], separator: str = ", ", limit: int = -1) -> str:
+    return _random_range_join(items, separator, limit, _get_rng(context))
+
+
+@pass_context
+def _filter_random_range_join_phrase(
+        context: Context,
+        items: list[Any],
+        separator: str = ", ",
+        word: str = ", ",
+        limit: int = -1
+) -> str:
+    return _random_range_join_phrase(items, separator, word, limit, _get_rng(context))
+
+
+@pass_context
+def _filter_random_set(context: Context, items: list[Any], count: int = -1) -> list[Any]:
+    return _random_set(items, count, _get_rng(context))
+
+
 class TemplateException(Exception):
     def __init__(self, message) -> None:
         super().__init__(message)
@@ -361,6 +469,118 @@ _SAFE_BUILTINS = {
     "isinstance": isinstance,
 }
 
+_CONDITION_GLOBALS = {"__builtins__": _SAFE_BUILTINS}
+
+# Maximum number of memoised results per condition
+_CONDITION_MEMO_SIZE = 4096
+
+_CONDITION_VALUE_TYPES = (str, int, float, bool, type(None))
+
+# Markers for names that are not in the context and for values that cannot be
+# used as part of the key of the memo.
+_CONDITION_MISSING = object()
+_CONDITION_UNSUPPORTED = object()
+
+
+def _get_condition_names(condition: str) -> Optional[tuple[str, ...]]:
+    # Names that the condition reads from the context, including names of
+    # builtins, which can be overwritten by the data. Conditions that use
+    # random or assign names (:=) are not deterministic for the same data and
+    # are not memoised (None).
+    tree = ast.parse(condition, mode="eval")
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.NamedExpr):
+            return None
+        if isinstance(node, ast.Name):
+            names.add(node.id)
+    if "random" in names:
+        return None
+    # re is always the module, it is set in the context after the data.
+    names.discard("re")
+    return tuple(sorted(names))
+
+
+def _freeze_condition_value(value: Any) -> Any:
+    # Hashable representation of a value of the data including its type, so
+    # that 1, 1.0 and True are different keys. Only plain data types are
+    # supported, other objects can change without a change of their hash.
+    value_type = type(value)
+    if value_type in _CONDITION_VALUE_TYPES:
+        return value_type, value
+    if value_type in (list, tuple):
+        values = tuple(_freeze_condition_value(item) for item in value)
+        if _CONDITION_UNSUPPORTED in values:
+            return _CONDITION_UNSUPPORTED
+        return value_type, values
+    if value_type is dict:
+        values = tuple(
+            (_freeze_condition_value(key), _freeze_condition_value(item))
+            for key, item in value.items()
+        )
+        if any(_CONDITION_UNSUPPORTED in pair for pair in values):
+            return _CONDITION_UNSUPPORTED
+        return value_type, values
+    return _CONDITION_UNSUPPORTED
+
+
+class _Condition:
+
+    # Condition shared by all template variants with the same condition
+
+    def __init__(self, name: str, condition: str, code: Any) -> None:
+        self.name = name
+        self.condition = condition
+        self.code = code
+        self.indices = []
+
+
+class _ConditionGroup:
+
+    # Conditions that read the same names from the context. The indices of the
+    # selected variants are memoised per projection of the context onto these
+    # names, so that the conditions are only evaluated again for records that
+    # differ in these names, with one lookup for all conditions of the group.
+
+    def __init__(self, names: Optional[tuple[str, ...]]) -> None:
+        self.names = names
+        self.conditions = []
+        self.memo = {}
+
+    def _create_key(self, context: dict[str, Any], values: dict[str, Any]) -> Optional[tuple]:
+        # values contains the frozen values of the current context, shared by
+        # all groups, so that each value is only frozen once per record.
+        key = []
+        for name in self.names:
+            if name not in values:
+                values[name] = _freeze_condition_value(context[name]) if name in context else _CONDITION_MISSING
+            value = values[name]
+            if value is _CONDITION_UNSUPPORTED:
+                return None
+            key.append(value)
+        return tuple(key)
+
+    def select(self, context: dict[str, Any], values: dict[str, Any]) -> list[int]:
+        key = self._create_key(context, values) if self.names is not None else None
+        if key is not None:
+            indices = self.memo.get(key)
+            if indices is not None:
+                return indices
+        indices = []
+        condition = None
+        try:
+            for condition in self.conditions:
+                if eval(condition.code, _CONDITION_GLOBALS, context):
+                    indices.extend(condition.indices)
+        except Exception as exception:
+            raise TemplateConditionException(
+                f"[{condition.name}] Condition error ({type(exception).__name__}): {str(exception)}"
+                f"{os.linesep}{str(condition.condition)}"
+            )
+        if key is not None and len(self.memo) < _CONDITION_MEMO_SIZE:
+            self.memo[key] = indices
+        return indices
+
 
 def _flat_dict(tree: dict[str, Any], parent: str = "") -> dict[str, str]:
     if not tree:
@@ -375,6 +595,68 @@ def _flat_dict(tree: dict[str, Any], parent: str = "") -> dict[str, str]:
     return items
 
 
+# A bundle is a precompiled template file next to the YAML file (<file>.bundle)
+# with the validated variants and the templates as compiled Jinja code. It is
+# only used if the key matches, i.e. the SHA-256 of the YAML file, the versions
+# of the format, the library, Jinja and Python, and the custom filters by name,
+# module, qualified name and code, otherwise the YAML file is loaded as usual.
+# The code is loaded with marshal, so bundles must be trusted like .pyc files.
+
+_BUNDLE_FILE_SIGNATURE = b"SXSB"
+_BUNDLE_FILE_VERSION = 1
+_BUNDLE_FILE_EXTENSION = ".bundle"
+
+
+@lru_cache(maxsize=1)
+def _get_bundle_version() -> str:
+    try:
+        return importlib.metadata.version("seanox-ai-nlp")
+    except importlib.metadata.PackageNotFoundError:
+        return ""
+
+
+def _get_bundle_filter(name: str, filter: Callable) -> tuple[str, str, str, str]:
+    # Jinja evaluates constant expressions with filters at compile time, so the
+    # compiled code depends on the filter functions and not only on the names.
+    # The qualified name does not distinguish lambdas and locally defined
+    # functions, therefore the SHA-256 of the code is also part of the key.
+    code = getattr(filter, "__code__", None)
+    return (
+        name,
+        getattr(filter, "__module__", None) or "",
+        getattr(filter, "__qualname__", None) or type(filter).__qualname__,
+        hashlib.sha256(marshal.dumps(code)).hexdigest() if code is not None else ""
+    )
+
+
+def _create_bundle_key(content: bytes, filters: Optional[dict[str, Callable]]) -> tuple:
+    return (
+        _BUNDLE_FILE_VERSION,
+        _get_bundle_version(),
+        sys.implementation.cache_tag,
+        jinja2.__version__,
+        hashlib.sha256(content).hexdigest(),
+        tuple(sorted(_get_bundle_filter(name, filter) for name, filter in (filters or {}).items()))
+    )
+
+
+def _load_bundle(path: str, content: bytes, filters: Optional[dict[str, Callable]]) -> Optional[list[tuple]]:
+    try:
+        with open(path + _BUNDLE_FILE_EXTENSION, "rb") as file:
+            data = file.read()
+    except OSError:
+        return None
+    if not data.startswith(_BUNDLE_FILE_SIGNATURE):
+        return None
+    try:
+        bundle = marshal.loads(data[len(_BUNDLE_FILE_SIGNATURE):])
+    except (EOFError, ValueError, TypeError):
+        return None
+    if not isinstance(bundle, dict) or bundle.get("key") != _create_bundle_key(content, filters):
+        return None
+    return bundle.get("variants")
+
+
 class _Template:
 
     @staticmethod
@@ -387,11 +669,12 @@ class _Template:
             undefined=Undefined if not validation else DebugUndefined
         )
 
-        environment.filters["annotate"] = _annotate
-        environment.filters["random_set"] = _random_set
-        environment.filters["random_range"] = _random_range
-        environment.filters["random_range_join"] = _random_range_join
-        environment.filters["random_range_join_phrase"] = _random_range_join_phrase
+        environment.filters["annotate"] = _filter_annotate
+        environment.filters["random"] = _filter_random
+        environment.filters["random_set"] = _filter_random_set
+        environment.filters["random_range"] = _filter_random_range
+        environment.filters["random_range_join"] = _filter_random_range_join
+        environment.filters["random_range_join_phrase"] = _filter_random_range_join_phrase
         environment.filters["normalize"] = _normalize
 
         if filters:
@@ -399,9 +682,17 @@ class _Template:
 
         return environment
 
-    def __init__(self, directory: str, filename: str, filters: dict[str, Callable] = None) -> None:
+    def __init__(
+            self,
+            directory: str,
+            filename: str,
+            filters: dict[str, Callable] = None,
+            bundle: bool = True
+    ) -> None:
 
         self.variants = {}
+        self.payloads = {}
+        self.conditions = []
         self.environment = _Template._create_template_environment(filters)
 
         if not filename or not filename.strip():
@@ -410,8 +701,27 @@ class _Template:
         if not os.path.isfile(path):
             raise FileNotFoundError(f"File not found: {path}")
 
-        with open(path, encoding="utf-8") as file:
-            data = yaml.safe_load(file) or {}
+        with open(path, "rb") as file:
+            content = file.read()
+
+        # A compiled bundle is used if it matches the content of the file, the
+        # versions and the filters, otherwise it is ignored. A damaged bundle
+        # is also ignored, the partially loaded variants are discarded.
+        variants = _load_bundle(path, content, filters) if bundle else None
+        if variants is not None:
+            try:
+                self._load_bundle(variants)
+            except Exception:
+                self.variants.clear()
+                self.payloads.clear()
+                variants = None
+        if variants is None:
+            self._load(content.decode("utf-8"), filters)
+        self._index()
+
+    def _load(self, content: str, filters: Optional[dict[str, Callable]]) -> None:
+
+        data = yaml.safe_load(content) or {}
 
         if data:
             try:
@@ -495,7 +805,7 @@ class _Template:
                 )
 
             try:
-                compile(condition, "<condition>", "eval")
+                code = compile(condition, "<condition>", "eval")
             except Exception as exception:
                 raise TemplateConditionException(
                     f"[{name}] Condition error ({type(exception).__name__}): {str(exception)}"
@@ -521,47 +831,357 @@ class _Template:
                         patterns[label] = pattern
             spans = {label: patterns[label] for label in labels}
 
-            self.variants[index] = (name, template, condition, spans)
-
-            self.registry = deque(maxlen=len(self.variants))
-
-    def generate(self, data: dict[str, Any] = None) -> tuple[str, dict[str, Any]] | None:
-
+            self.variants[index] = (name, template, condition, code, spans)
+            self.payloads[index] = payload
+
+    def _load_bundle(self, variants: list[tuple]) -> None:
+
+        # The bundle contains the variants as they were loaded and validated
+        # from the file, with the templates as compiled Jinja code, so that
+        # parsing, validation and compilation are not required.
+        globals = self.environment.make_globals(None)
+        for index, name, condition, spans, payload, source in variants:
+            template = self.environment.template_class.from_code(self.environment, source, globals)
+            code = compile(condition, "<condition>", "eval")
+            self.variants[index] = (name, template, condition, code, spans)
+            self.payloads[index] = payload
+
+    def _index(self) -> None:
+
+        self.registry = deque(maxlen=len(self.variants))
+        self.registries: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+        # Index of the conditions: variants with the same condition share one
+        # condition, which is evaluated once per record, and conditions which
+        # read the same names from the context form a group with one memo.
+        conditions = {}
+        for index, (name, template, condition, code, spans) in self.variants.items():
+            if condition not in conditions:
+                conditions[condition] = _Condition(name, condition, code)
+            conditions[condition].indices.append(index)
+        groups = {}
+        for condition in conditions.values():
+            names = _get_condition_names(condition.condition)
+            if names not in groups:
+                groups[names] = _ConditionGroup(names)
+            groups[names].conditions.append(condition)
+        self.conditions = list(groups.values())
+
+    def _get_registry(self, rng: random.Random) -> deque:
+        try:
+            registry = self.registries.get(rng)
+            if registry is None:
+                registry = self.registries[rng] = deque(maxlen=len(self.variants))
+            return registry
+        except TypeError:
+            # Generators without weak references get a registry per call.
+            return deque(maxlen=len(self.variants))
+
+    def generate(
+            self,
+            data: dict[str, Any] = None,
+            rng: random.Random = None,
+            markers: bool = True,
+            registry: deque = None
+    ) -> tuple[str, dict[str, Any], Optional[dict[str, str]]] | None:
+
+        # The registry of the recently used variants is shared by the calls on
+        # the template with the random module. An explicit generator has its
+        # own registry, so that the selection only depends on the generator
+        # and not on other calls of the cached template.
+        if registry is None:
+            registry = self.registry if rng is None else self._get_registry(rng)
+        if rng is None:
+            rng = random
         context = dict(data or {})
-        context["random"] = random
+        context["random"] = rng
         context["re"] = re
-
+        labels = None
+        if not markers:
+            labels = context[_ANNOTATION_LABELS] = {}
+
+        # The conditions are evaluated as code objects compiled when loading,
+        # eval() of the string would compile the condition again on each call.
+        # The variants remain in their order, which the random selection uses.
+        values = {}
         templates = []
-        for index, (name, template, condition, spans) in self.variants.items():
-            try:
-                if condition is None or eval(condition, {"__builtins__": _SAFE_BUILTINS}, context):
-                    templates.append(index)
-            except Exception as exception:
-                raise TemplateConditionException(
-                    f"[{name}] Condition error ({type(exception).__name__}): {str(exception)}"
-                    f"{os.linesep}{str(condition)}"
-                )
+        for group in self.conditions:
+            templates.extend(group.select(context, values))
+        templates.sort()
 
         if not templates:
             return None
 
         selection = []
         for index in templates:
-            if index not in self.registry:
+            if index not in registry:
                 selection.append(index)
         if selection:
-            template_id = random.choice(selection)
+            template_id = rng.choice(selection)
         else:
-            template_id = random.choice(templates)
-        self.registry.append(template_id)
+            template_id = rng.choice(templates)
+        registry.append(template_id)
 
-        name, template, condition, spans = self.variants[template_id]
+        name, template, condition, code, spans = self.variants[template_id]
         content = template.render(**context).strip()
 
-        return content, spans
+        return content, spans, labels
+
+
+class TemplateCacheInfo(NamedTuple):
+    """
+    Represents the statistics and the settings of the template cache.
+
+    Attributes:
+        hits (int): Lookups of a cached template
+        misses (int): Lookups that loaded the template
+        reloads (int): Templates loaded again, because the file has changed
+        evictions (int): Templates removed as least recently used
+        size (int): Number of cached templates
+        maxsize (int): Maximum number of cached templates
+        interval (float): Seconds after which a cached template is revalidated
+            against its file, 0 on each lookup, negative never.
+    """
+    hits: int
+    misses: int
+    reloads: int
+    evictions: int
+    size: int
+    maxsize: int
+    interval: float
+
+
+class _TemplateStamp(NamedTuple):
+    mtime: int
+    size: int
+    digest: bytes
+    checked: float
+
+
+def _create_template_stamp(path: str) -> _TemplateStamp:
+    status = os.stat(path)
+    with open(path, "rb") as file:
+        digest = hashlib.sha256(file.read()).digest()
+    return _TemplateStamp(status.st_mtime_ns, status.st_size, digest, time.monotonic())
+
+
+class _TemplateCache(OrderedDict):
+
+    # LRU cache of the loaded templates per signature (data source, template,
+    # filters) in the order of use, the least recently used at the beginning.
+    # The files are revalidated at most once per interval, first by mtime and
+    # size, only if they differ by the SHA-256 of the content, so that a file
+    # that was only touched is not loaded again. The stamp is created before
+    # loading, a change during loading is then detected with the next check.
+    # Templates are loaded outside the lock of the cache, so that lookups of
+    # other templates are not blocked. A lock per signature ensures that
+    # concurrent lookups of the same template load it only once, the others
+    # wait and then use the loaded template.
+
+    def __init__(self, maxsize: int, interval: float) -> None:
+        super().__init__()
+        self.maxsize = maxsize
+        self.interval = interval
+        self.stamps: dict[tuple, _TemplateStamp] = {}
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+        self.evictions = 0
+        self.lock = threading.RLock()
+        self.loading: dict[tuple, threading.Lock] = {}
+
+    def clear(self) -> None:
+        with self.lock:
+            super().clear()
+            self.stamps.clear()
+
+    def evict(self) -> None:
+        while len(self) > self.maxsize:
+            signature, _ = self.popitem(last=False)
+            self.stamps.pop(signature, None)
+            self.evictions += 1
+
+    def _validate(self, signature: tuple, path: str) -> bool:
+        stamp = self.stamps.get(signature)
+        if stamp is None or self.interval < 0:
+            return True
+        now = time.monotonic()
+        if now - stamp.checked < self.interval:
+            return True
+        try:
+            status = os.stat(path)
+            if (status.st_mtime_ns, status.st_size) == (stamp.mtime, stamp.size):
+                self.stamps[signature] = stamp._replace(checked=now)
+                return True
+            update = _create_template_stamp(path)
+        except OSError:
+            return False
+        if update.digest != stamp.digest:
+            return False
+        self.stamps[signature] = update
+        return True
+
+    def _get_valid(self, signature: tuple, path: str) -> Optional[_Template]:
+        value = self.get(signature)
+        if value is not None and self._validate(signature, path):
+            self.hits += 1
+            self.move_to_end(signature)
+            return value
+        return None
+
+    def get_template(self, signature: tuple, datasource: str, template: str, filters: dict[str, Callable]) -> _Template:
+        path = os.path.join(datasource, template)
+        with self.lock:
+            value = self._get_valid(signature, path)
+            if value is not None:
+                return value
+            loading = self.loading.setdefault(signature, threading.Lock())
+
+        with loading:
+            try:
+                with self.lock:
+                    value = self._get_valid(signature, path)
+                    if value is not None:
+                        return value
+                    if signature in self:
+                        self.reloads += 1
+                        del self[signature]
+                        self.stamps.pop(signature, None)
+                    else:
+                        self.misses += 1
+
+                try:
+                    stamp = _create_template_stamp(path)
+                except OSError:
+                    stamp = None
+                value = _Template(datasource, template, filters)
+
+                with self.lock:
+                    self[signature] = value
+                    if stamp is not None:
+                        self.stamps[signature] = stamp
+                    self.evict()
+                    return value
+            finally:
+                with self.lock:
+                    if self.loading.get(signature) is loading:
+                        del self.loading[signature]
+
+
+_TEMPLATE_CACHE_SIZE = 128
+_TEMPLATE_CACHE_INTERVAL = 1.0
+
+_TEMPLATES = _TemplateCache(_TEMPLATE_CACHE_SIZE, _TEMPLATE_CACHE_INTERVAL)
+
+
+def synthetics_cache(maxsize: int = None, interval: float = None, clear: bool = False) -> TemplateCacheInfo:
+    """
+    Configures the cache of the loaded templates and returns its statistics.
+    Without arguments, only the statistics are returned.
+
+    The templates are cached per data source, template file and filters, the
+    least recently used are removed when the maximum size is reached. A cached
+    template is revalidated against its file at most once per interval, by
+    modification time and size and, if they have changed, by the SHA-256 of
+    the content. Changed files are loaded again.
+
+    The cache exists per process, worker processes of synthetics_parallel()
+    have their own cache.
+
+    Args:
+        maxsize (int, optional): Maximum number of cached templates, default
+            128. If reduced, the least recently used templates are removed.
+        interval (float, optional): Seconds after which a cached template is
+            revalidated, default 1.0. With 0 on each lookup, negative values
+            turn off the revalidation.
+        clear (bool, optional): Removes all cached templates. The statistics
+            are retained.
+
+    Returns:
+        TemplateCacheInfo: Statistics and settings after the changes
+
+    Raises:
+        ValueError: If maxsize is less than 1.
+    """
+    with _TEMPLATES.lock:
+        if maxsize is not None:
+            if maxsize < 1:
+                raise ValueError("maxsize must be at least 1")
+            _TEMPLATES.maxsize = maxsize
+            _TEMPLATES.evict()
+        if interval is not None:
+            _TEMPLATES.interval = interval
+        if clear:
+            _TEMPLATES.clear()
+        return TemplateCacheInfo(
+            hits=_TEMPLATES.hits,
+            misses=_TEMPLATES.misses,
+            reloads=_TEMPLATES.reloads,
+            evictions=_TEMPLATES.evictions,
+            size=len(_TEMPLATES),
+            maxsize=_TEMPLATES.maxsize,
+            interval=_TEMPLATES.interval
+        )
+
 
+def synthetics_bundle(datasource: str, template: str, filters: dict[str, Callable] = None) -> str:
+    """
+    Compiles a template file into a bundle next to the file (<template>.bundle)
+    which is used instead of the YAML file when the template is loaded, so that
+    parsing, schema validation and compilation of the Jinja templates are not
+    required, e.g. for worker processes of synthetics_parallel().
+
+    The bundle is bound to the content of the template file, the versions of
+    seanox-ai-nlp, Jinja and Python, and the filters by name, module, qualified
+    name and code of the functions. If one of them changes, the bundle is
+    ignored and the template file is loaded as usual until the bundle is
+    created again. Bundles contain compiled code and must be trusted like .pyc
+    files.
+
+    Args:
+        datasource (str): Path of the template directory
+        template (str): Name of the template file
+        filters (dict[str, Callable], optional): Custom filters, as used for
+            synthetics(). Filters are identified by name, module, qualified
+            name and code. Functions with a closure are not supported, their
+            behavior also depends on the captured variables.
 
-_TEMPLATES: dict[tuple[str, str], _Template] = {}
+    Returns:
+        str: Path of the written bundle
+
+    Raises:
+        FileNotFoundError: If the template file does not exist.
+        TemplateException: If the template file is invalid.
+        ValueError: If a filter is a function with a closure.
+    """
+
+    for name, filter in (filters or {}).items():
+        if getattr(filter, "__closure__", None):
+            raise ValueError(f"Filter with closure cannot be bundled: {name}")
+
+    # The bundle is always created from the YAML file, an existing bundle is
+    # not used for it.
+    value = _Template(datasource, template, filters, bundle=False)
+    path = os.path.join(datasource, template)
+    with open(path, "rb") as file:
+        content = file.read()
+
+    variants = []
+    for index, (name, _, condition, _, spans) in value.variants.items():
+        payload = value.payloads[index]
+        variants.append((index, name, condition, spans, payload, value.environment.compile(payload)))
+    data = _BUNDLE_FILE_SIGNATURE + marshal.dumps({"key": _create_bundle_key(content, filters), "variants": variants})
+
+    target = path + _BUNDLE_FILE_EXTENSION
+    temp = f"{target}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(temp, "wb") as file:
+            file.write(data)
+        os.replace(temp, target)
+    finally:
+        if os.path.exists(temp):
+            os.remove(temp)
+    return target
 
 
 @dataclass
@@ -587,14 +1207,24 @@ class Synthetic:
     spans: list[tuple[int, int, str]]
 
 
-def _re_compile_span_pattern(labels: dict[str, set[str]], pattern: str) -> Optional[re.Pattern]:
+# Compiled span patterns per (pattern, values of the labels used in the
+# pattern), the values are a frozenset so that records with the same entities
+# in a different order share the pattern. The caches are limited, the least
+# recently used patterns are evicted.
+_SPAN_PATTERN_CACHE_SIZE = 4096
+
+
+def _re_compile_span_pattern(labels: dict[str, frozenset[str]], pattern: str) -> Optional[re.Pattern]:
 
     def replacer(match: re.Match) -> str:
-        label = match.group(1)
-        key = next((key for key in labels if key == label), None)
-        if not key or not labels[key]:
+        values = labels.get(match.group(1))
+        if not values:
             raise LookupError
-        return "(?:" + "|".join(re.escape(value) for value in labels[key]) + ")"
+        # Longest values first, so that the alternation does not stop at a
+        # shorter prefix of a value, and a stable order independent of the
+        # order of occurrence.
+        values = sorted(values, key=lambda value: (-len(value), value))
+        return "(?:" + "|".join(re.escape(value) for value in values) + ")"
 
     try:
         return re.compile(_ENTITY_MARKER_REGEX_PATTERN.sub(replacer, pattern))
@@ -602,16 +1232,91 @@ def _re_compile_span_pattern(labels: dict[str, set[str]], pattern: str) -> Optio
         return None
 
 
-def _extract_entities(text: str, patterns: dict[str, Any] = None) -> Synthetic:
+@lru_cache(maxsize=_SPAN_PATTERN_CACHE_SIZE)
+def _get_span_pattern_labels(pattern: str) -> tuple[str, ...]:
+    return tuple(dict.fromkeys(_ENTITY_MARKER_REGEX_PATTERN.findall(pattern)))
+
+
+@lru_cache(maxsize=_SPAN_PATTERN_CACHE_SIZE)
+def _compile_span_pattern(pattern: str, values: frozenset[tuple[str, frozenset[str]]]) -> Optional[re.Pattern]:
+    return _re_compile_span_pattern(dict(values), pattern)
+
+
+def _get_span_pattern(labels: dict[str, dict[str, None]], pattern: str) -> Optional[re.Pattern]:
+    values = frozenset(
+        (name, frozenset(labels[name])) for name in _get_span_pattern_labels(pattern) if name in labels
+    )
+    return _compile_span_pattern(pattern, values)
+
+
+def _extract_spans(
+        plaintext: str,
+        entities: list[tuple[int, int, str]],
+        labels: dict[str, dict[str, None]],
+        patterns: dict[str, Any]
+) -> list[tuple[int, int, str]]:
+
+    spans: list[tuple[int, int, str]] = []
+    if patterns and entities:
+        entity_starts = {start for start, end, label in entities}
+        entity_ends = {end for start, end, label in entities}
+        for label, pattern in patterns.items():
+            pattern = _get_span_pattern(labels, pattern)
+            if not pattern:
+                continue
+            for match in pattern.finditer(plaintext):
+                start, end = match.start(), match.end()
+                if start in entity_starts and end in entity_ends:
+                    spans.append((start, end, label))
+    return spans
+
+
+def _extract_sentinels(text: str, patterns: dict[str, Any], labels: dict[str, str]) -> Synthetic:
+
+    # Counterpart of _extract_entities for the marker-free annotation. The
+    # split by the sentinel pattern returns the text between the annotations,
+    # the label index and the value alternately, so that the plain text and
+    # the positions of the entities come from the parts without parsing
+    # markers. There are no markers in the rendered text and so there is no
+    # annotated text.
+    parts = _ANNOTATION_SENTINEL_PATTERN.split(text)
+    if len(parts) <= 1:
+        return Synthetic(text, "", [], [])
+
+    names = list(labels)
+    entities: list[tuple[int, int, str]] = []
+    values: dict[str, dict[str, None]] = defaultdict(dict)
+    offset = 0
+    for intermediate_text, index, value in zip(parts[0::3], parts[1::3], parts[2::3]):
+        label = names[ord(index) - _ANNOTATION_SENTINEL_LABEL]
+        offset += len(intermediate_text)
+        entities.append((offset, offset + len(value), label))
+        offset += len(value)
+        values[label][value] = None
+
+    del parts[1::3]
+    plaintext = "".join(parts)
+
+    return Synthetic(plaintext, "", entities, _extract_spans(plaintext, entities, values, patterns))
+
+
+def _extract_entities(text: str, patterns: dict[str, Any] = None, labels: dict[str, str] = None) -> Synthetic:
+
+    if labels is not None:
+        return _extract_sentinels(text, patterns, labels)
 
-    if patterns is None:
-        patterns = {}
     entities: list[tuple[int, int, str]] = []
-    plaintext = ""
+    parts: list[str] = []
+    offset = 0
     last_end = 0
 
-    labels: dict[str, set[str]] = defaultdict(set)
+    # Values per label in the order of their occurrence (dict instead of set),
+    # so that the span patterns do not depend on the hash seed of the process.
+    values: dict[str, dict[str, None]] = defaultdict(dict)
 
+    # Single pass over the markers, the plain text is collected in parts and
+    # joined once at the end. The offset is the length of the plain text so far
+    # and gives the positions of the entities in the plain text.
     for match in _ENTITY_MARKER_PATTERN.finditer(text):
         span_start, span_end = match.span()
 
@@ -620,50 +1325,49 @@ def _extract_entities(text: str, patterns: dict[str, Any] = None) -> Synthetic:
 
         # Intermediate text, text without marker between the last end position
         # (cursor) and the current location of the marker being searched for.
-        # The intermediate text is taken over and the cursor is repositioned at
-        # the end of the plain text so that the correct span positions can be
-        # calculated based on the plain text.
         intermediate_text = text[last_end:span_start]
-        plaintext += intermediate_text
+        parts.append(intermediate_text)
+        offset += len(intermediate_text)
 
-        try:
-            entity_name = label
-            entity_start = len(plaintext)
-            entity_end = entity_start + len(value)
-            plaintext += value
-            entities.append((entity_start, entity_end, entity_name))
-            labels[entity_name].add(value)
-        except ValueError:
-            plaintext += value
+        parts.append(value)
+        entities.append((offset, offset + len(value), label))
+        offset += len(value)
+        values[label][value] = None
 
         last_end = span_end
 
     # text at the end, if no marker follows must be adopted
-    plaintext += text[last_end:]
+    parts.append(text[last_end:])
+    plaintext = "".join(parts)
 
-    entity_starts = {start for start, end, label in entities}
-    entity_ends = {end for start, end, label in entities}
+    return Synthetic(plaintext, text, entities, _extract_spans(plaintext, entities, values, patterns))
 
-    labels = {key: list(value) for key, value in labels.items()}
 
-    spans: list[tuple[int, int, str]] = []
-    for label, pattern in patterns.items():
-        pattern = _re_compile_span_pattern(labels, pattern)
-        if not pattern:
-            continue
-        for match in pattern.finditer(plaintext):
-            start, end = match.start(), match.end()
-            if start in entity_starts and end in entity_ends:
-                spans.append((start, end, label))
+def _get_template(datasource: str, template: str, filters: dict[str, Callable] = None) -> _Template:
+
+    filters = {
+        name: function
+        for name, function in (filters or {}).items()
+        if name and _FILTER_NAME_PATTERN.match(name) and callable(function)
+    }
 
-    return Synthetic(plaintext, text, entities, spans)
+    # Cache key consists of: (data source, template, flat sequence of (key,
+    # value) from filters sorted by key). For callables, equality is by object
+    # identity – the same function object must be referenced.
+    signature = (
+        (datasource or "", template)
+        + tuple(entry for pairs in sorted(filters.items()) for entry in pairs)
+    )
+    return _TEMPLATES.get_template(signature, datasource, template, filters)
 
 
 def synthetics(
         datasource: str,
         template: str,
         data: dict[str, Any] = None,
-        filters: dict[str, Callable] = None
+        filters: dict[str, Callable] = None,
+        rng: random.Random = None,
+        markers: bool = True
 ) -> Synthetic:
     """
     Generates synthetic text using predefined YAML templates.
@@ -685,6 +1389,16 @@ def synthetics(
         filters (dict, optional): Additional custom filters for template
             rendering. Keys are filter names (str), and values are callable
             objects (callables) that implement the filter.
+        rng (random.Random, optional): Random number generator for the
+            selection of the template, the random filters and the object
+            random in conditions and templates. The recently used templates
+            are tracked per generator, so the results only depend on the
+            generator. Default is the random module.
+        markers (bool, optional): If False, the filter annotate records the
+            entities during rendering instead of marking them in the text, so
+            that the rendered text does not have to be parsed again. The
+            result is the same, but custom filters applied to annotated values
+            get sentinel characters instead of the markers. Default is True.
 
     Returns:
         Synthetic: A dataclass containing the generated synthetic text, its
@@ -708,26 +1422,193 @@ def synthetics(
             invalid.
     """
 
-    filters = {
-        name: function
-        for name, function in (filters or {}).items()
-        if name and _FILTER_NAME_PATTERN.match(name) and callable(function)
-    }
-
     if not template or not template.strip():
         return Synthetic("", "", [], [])
 
-    # Cache key consists of: (data source, template, flat sequence of (key,
-    # value) from filters sorted by key). For callables, equality is by object
-    # identity – the same function object must be referenced.
-    signature = (
-        (datasource or "", template)
-        + tuple(entry for pairs in sorted(filters.items()) for entry in pairs)
-    )
-    if signature not in _TEMPLATES:
-        _TEMPLATES[signature] = _Template(datasource, template, filters)
-    template = _TEMPLATES[signature]
-    result = template.generate(data)
+    result = _get_template(datasource, template, filters).generate(data, rng, markers)
     if not result:
         return Synthetic("", "", [], [])
     return _extract_entities(*result)
+
+
+def _generate_batch(
+        template: _Template,
+        records: Iterable[dict[str, Any]],
+        rng: Optional[random.Random],
+        markers: bool
+) -> Iterator[Synthetic]:
+    generate = template.generate
+    for data in records:
+        result = generate(data, rng, markers)
+        if not result:
+            yield Synthetic("", "", [], [])
+        else:
+            yield _extract_entities(*result)
+
+
+def synthetics_batch(
+        datasource: str,
+        template: str,
+        records: Iterable[dict[str, Any]],
+        filters: dict[str, Callable] = None,
+        rng: random.Random = None,
+        markers: bool = True
+) -> Iterator[Synthetic]:
+    """
+    Generates synthetic texts for a sequence of data records with the same
+    template, as with synthetics() for each record.
+
+    The template is looked up once for all records instead of once per
+    record. The results are generated lazily in the order of the records,
+    so that large or endless sequences of records can be processed as a stream.
+
+    Parameters:
+        datasource (str): Path to the directory containing template files.
+        template (str): Name of the template file.
+        records (Iterable[dict]): Contextual data per synthetic text, used to
+            evaluate conditions and render the template.
+        filters (dict, optional): Additional custom filters for template
+            rendering, as with synthetics().
+        rng (random.Random, optional): Random number generator for all
+            records, as with synthetics(). Default is the random module.
+        markers (bool, optional): If False, the entities are recorded during
+            rendering, as with synthetics(). Default is True.
+
+    Returns:
+        Iterator[Synthetic]: One Synthetic per record in the order of the
+            records.
+
+    Raises:
+        FileNotFoundError: If the YAML template file cannot be found at the
+            specified path, already when called.
+        TemplateException: If the template file cannot be loaded or parsed,
+            already when called.
+        TemplateConditionException: If a condition expression in the template
+            is invalid or unsafe to evaluate, when the record is processed.
+        TemplateExpressionException: If a span expression in the template is
+            invalid, already when called.
+    """
+
+    if not template or not template.strip():
+        return (Synthetic("", "", [], []) for _ in records)
+
+    return _generate_batch(_get_template(datasource, template, filters), records, rng, markers)
+
+
+_PARALLEL_CHUNK_SIZE = 256
+
+
+def _generate_chunk(
+        datasource: str,
+        template: str,
+        filters: Optional[dict[str, Callable]],
+        markers: bool,
+        seed: int,
+        start: int,
+        records: list[dict[str, Any]]
+) -> list[Synthetic]:
+
+    # Runs in the worker processes, the template is loaded once per process
+    # via the cache. Each chunk uses its own empty registry of the recently
+    # used variants and each record a random number generator derived
+    # from the seed and its index, so that the results do not depend on which
+    # process generates which chunk. String seeds are hashed with SHA-512 and
+    # are independent of the hash seed of the process.
+    template = _get_template(datasource, template, filters)
+    registry = deque(maxlen=len(template.variants))
+    results = []
+    for index, data in enumerate(records, start):
+        result = template.generate(data, random.Random(f"{seed}:{index}"), markers, registry)
+        if not result:
+            results.append(Synthetic("", "", [], []))
+        else:
+            results.append(_extract_entities(*result))
+    return results
+
+
+def _generate_parallel(
+        datasource: str,
+        template: str,
+        records: Iterable[dict[str, Any]],
+        seed: int,
+        filters: Optional[dict[str, Callable]],
+        markers: bool,
+        workers: int,
+        chunk_size: int
+) -> Iterator[Synthetic]:
+
+    records = iter(records)
+    chunks = (
+        (datasource, template, filters, markers, seed, start, chunk)
+        for start, chunk in zip(
+            itertools.count(0, chunk_size),
+            iter(lambda: list(itertools.islice(records, chunk_size)), [])
+        )
+    )
+
+    # The number of chunks in progress is limited, the results are returned in
+    # the order of the records.
+    for results in _map_bounded(_generate_chunk, chunks, workers):
+        yield from results
+
+
+def synthetics_parallel(
+        datasource: str,
+        template: str,
+        records: Iterable[dict[str, Any]],
+        seed: int = 0,
+        filters: dict[str, Callable] = None,
+        workers: int = None,
+        chunk_size: int = _PARALLEL_CHUNK_SIZE,
+        markers: bool = True
+) -> Iterator[Synthetic]:
+    """
+    Generates synthetic texts for a sequence of data records in parallel by a
+    pool of worker processes, reproducible for a given seed.
+
+    The records are processed in chunks, each worker process loads the
+    template once. The random state of each record is derived from the seed
+    and the index of the record, so that the results for a seed are identical
+    regardless of the number of workers. Results are returned lazily in the
+    order of the records, the number of chunks in progress is limited.
+
+    Parameters:
+        datasource (str): Path to the directory containing template files.
+        template (str): Name of the template file.
+        records (Iterable[dict]): Contextual data per synthetic text, used to
+            evaluate conditions and render the template.
+        seed (int, optional): Seed of the random states, default 0
+        filters (dict, optional): Additional custom filters for template
+            rendering, as with synthetics(). With more than one worker, the
+            filters must be picklable, e.g. functions at module level.
+        workers (int, optional): Number of worker processes, default is the
+            number of CPUs. With 1, the current process is used.
+        chunk_size (int, optional): Records per chunk, default 256. The
+            results also depend on the chunk size, because the selection
+            avoids recently used variants within a chunk.
+        markers (bool, optional): If False, the entities are recorded during
+            rendering, as with synthetics(). Default is True.
+
+    Returns:
+        Iterator[Synthetic]: One Synthetic per record in the order of the
+            records.
+
+    Raises:
+        FileNotFoundError: If the YAML template file cannot be found at the
+            specified path, already when called.
+        TemplateException: If the template file cannot be loaded or parsed,
+            already when called.
+        TemplateConditionException: If a condition expression in the template
+            is invalid or unsafe to evaluate, when the record is processed.
+        ValueError: If chunk_size is less than 1.
+    """
+
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    if not template or not template.strip():
+        return (Synthetic("", "", [], []) for _ in records)
+
+    _get_template(datasource, template, filters)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    return _generate_parallel(datasource, template, records, seed, filters, markers, workers, chunk_size)
@@ -0,0 +1,280 @@
+# seanox_ai_npl/synthetics/writers.py
+
+# DESIGN NOTE
+#
+# The writers are sinks for streams of Synthetic, e.g. from synthetics_batch()
+# or synthetics_parallel(), for datasets that are too large to be held in
+# lists, as training data for spaCy or as input for downstream jobs.
+#
+# - The samples are consumed lazily and written in chunks, the memory depends
+#   on the chunk size and, for DocBin, on the shard size, but not on the size of
+#   the dataset.
+# - With shard_size, the output is split into shards with an index in the file
+#   name, a new shard is started when the current one has reached the size. A
+#   shard is only created when a sample is written to it.
+# - pyarrow and spaCy are optional dependencies and are only imported when they
+#   are used, so that the synthetics module remains usable without them.
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional
+
+from seanox_ai_nlp.common import _import_pyarrow
+from seanox_ai_nlp.synthetics.synthetics import Synthetic
+
+import itertools
+import json
+import os
+
+_CHUNK_SIZE = 1024
+
+
+def _import_parquet() -> tuple[Any, Any]:
+    return _import_pyarrow("Parquet output")
+
+
+def _import_spacy() -> Any:
+    try:
+        import spacy.tokens
+    except ImportError as exception:
+        raise ImportError(
+            "DocBin output requires spaCy,"
+            " install it with: pip install seanox-ai-nlp[spacy]"
+        ) from exception
+    return spacy.tokens
+
+
+def _get_shard_path(target: str, index: int, sharded: bool) -> str:
+    if not sharded:
+        return str(target)
+    path = Path(target)
+    return str(path.with_name(f"{path.stem}-{index:05d}{path.suffix}"))
+
+
+def _get_chunks(samples: Iterable[Synthetic], chunk_size: int) -> Iterator[list[Synthetic]]:
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    samples = iter(samples)
+    return iter(lambda: list(itertools.islice(samples, chunk_size)), [])
+
+
+def _validate_shard_size(shard_size: Optional[int]) -> None:
+    if shard_size is not None and shard_size < 1:
+        raise ValueError("shard_size must be at least 1")
+
+
+def write_jsonl(
+        samples: Iterable[Synthetic],
+        target: str,
+        shard_size: int = None,
+        chunk_size: int = _CHUNK_SIZE
+) -> list[str]:
+    """
+    Writes a stream of Synthetic as JSON Lines, one object per line with the
+    fields text, annotation, entities and spans, the entities and spans as
+    lists of [start, end, label].
+
+    Args:
+        samples (Iterable[Synthetic]): Samples, consumed lazily
+        target (str): Target file, with shard_size the base name of the shards,
+            e.g. synthetics.jsonl for synthetics-00000.jsonl, ...
+        shard_size (int, optional): Maximum size of a shard in bytes, a shard
+            contains at least one sample. Default is one file without limit.
+        chunk_size (int, optional): Samples per write, default 1024
+
+    Returns:
+        list[str]: Written files in the order of the shards, empty if there
+            were no samples.
+
+    Raises:
+        ValueError: If shard_size or chunk_size is less than 1.
+    """
+
+    _validate_shard_size(shard_size)
+    files = []
+    file = None
+    size = 0
+    try:
+        for chunk in _get_chunks(samples, chunk_size):
+            lines = []
+            for sample in chunk:
+                line = json.dumps({
+                    "text": sample.text,
+                    "annotation": sample.annotation,
+                    "entities": sample.entities,
+                    "spans": sample.spans
+                }, ensure_ascii=False).encode("utf-8") + b"\n"
+                if file is None or (shard_size and size and size + len(line) > shard_size):
+                    if file is not None:
+                        file.write(b"".join(lines))
+                        file.close()
+                        lines.clear()
+                    files.append(_get_shard_path(target, len(files), shard_size is not None))
+                    file = open(files[-1], "wb")
+                    size = 0
+                lines.append(line)
+                size += len(line)
+            file.write(b"".join(lines))
+    finally:
+        if file is not None:
+            file.close()
+    return files
+
+
+def _create_parquet_schema(pyarrow: Any) -> Any:
+    span = pyarrow.struct([
+        ("start", pyarrow.int64()),
+        ("end", pyarrow.int64()),
+        ("label", pyarrow.string())
+    ])
+    return pyarrow.schema([
+        ("text", pyarrow.string()),
+        ("annotation", pyarrow.string()),
+        ("entities", pyarrow.list_(span)),
+        ("spans", pyarrow.list_(span))
+    ])
+
+
+def write_parquet(
+        samples: Iterable[Synthetic],
+        target: str,
+        shard_size: int = None,
+        chunk_size: int = _CHUNK_SIZE
+) -> list[str]:
+    """
+    Writes a stream of Synthetic as Parquet with the columns text, annotation,
+    entities and spans, the entities and spans as lists of structs (start,
+    end, label). Requires the optional dependency pyarrow.
+
+    Args:
+        samples (Iterable[Synthetic]): Samples, consumed lazily
+        target (str): Target file, with shard_size the base name of the shards,
+            e.g. synthetics.parquet for synthetics-00000.parquet, ...
+        shard_size (int, optional): Size of a shard in bytes after which a new
+            shard is started. Shards are rotated after a row group, so a shard
+            can exceed the size by up to one row group. Default is one file
+            without limit.
+        chunk_size (int, optional): Samples per row group, default 1024
+
+    Returns:
+        list[str]: Written files in the order of the shards, empty if there
+            were no samples.
+
+    Raises:
+        ImportError: If pyarrow is not installed.
+        ValueError: If shard_size or chunk_size is less than 1.
+    """
+
+    pyarrow, parquet = _import_parquet()
+    _validate_shard_size(shard_size)
+    schema = _create_parquet_schema(pyarrow)
+
+    def spans(items: list[tuple[int, int, str]]) -> list[dict[str, Any]]:
+        return [{"start": start, "end": end, "label": label} for start, end, label in items]
+
+    files = []
+    writer = None
+    try:
+        for chunk in _get_chunks(samples, chunk_size):
+            if writer is None:
+                files.append(_get_shard_path(target, len(files), shard_size is not None))
+                writer = parquet.ParquetWriter(files[-1], schema)
+            writer.write_table(pyarrow.Table.from_pydict({
+                "text": [sample.text for sample in chunk],
+                "annotation": [sample.annotation for sample in chunk],
+                "entities": [spans(sample.entities) for sample in chunk],
+                "spans": [spans(sample.spans) for sample in chunk]
+            }, schema=schema))
+            if shard_size and os.path.getsize(files[-1]) >= shard_size:
+                writer.close()
+                writer = None
+    finally:
+        if writer is not None:
+            writer.close()
+    return files
+
+
+def write_docbin(
+        samples: Iterable[Synthetic],
+        target: str,
+        nlp: Any,
+        spans_key: str = "sc",
+        alignment_mode: str = "strict",
+        shard_size: int = None
+) -> list[str]:
+    """
+    Writes a stream of Synthetic as spaCy DocBin (.spacy) for training, with
+    the entities as doc.ents and the spans as span group spans_key. Requires
+    the optional dependency spaCy.
+
+    The texts are tokenized with nlp.make_doc. Entities and spans whose
+    character offsets cannot be aligned to tokens with the alignment_mode are
+    skipped, as with Doc.char_span.
+
+    A DocBin is serialized as a whole, so each shard is held in memory until
+    it is written. The size of a shard is measured by the UTF-8 size of its
+    texts, the file is smaller because DocBin is compressed.
+
+    Args:
+        samples (Iterable[Synthetic]): Samples, consumed lazily
+        target (str): Target file, with shard_size the base name of the shards,
+            e.g. synthetics.spacy for synthetics-00000.spacy, ...
+        nlp (spacy.Language): Pipeline or blank model for the tokenization
+        spans_key (str, optional): Key of the span group, default 'sc' as used
+            by the spaCy SpanCategorizer
+        alignment_mode (str, optional): strict, contract or expand, default
+            strict
+        shard_size (int, optional): Maximum UTF-8 size of the texts of a shard
+            in bytes, a shard contains at least one sample. Default is one file
+            without limit.
+
+    Returns:
+        list[str]: Written files in the order of the shards, empty if there
+            were no samples.
+
+    Raises:
+        ImportError: If spaCy is not installed.
+        ValueError: If shard_size is less than 1.
+    """
+
+    tokens = _import_spacy()
+    _validate_shard_size(shard_size)
+
+    files = []
+    doc_bin = None
+    size = 0
+
+    def flush() -> None:
+        files.append(_get_shard_path(target, len(files), shard_size is not None))
+        doc_bin.to_disk(files[-1])
+
+    for sample in samples:
+        doc = nlp.make_doc(sample.text)
+        entities = []
+        for start, end, label in sample.entities:
+            span = doc.char_span(start, end, label=label, alignment_mode=alignment_mode)
+            if span is not None:
+                entities.append(span)
+        doc.ents = entities
+        if sample.spans:
+            doc.spans[spans_key] = [
+                span for span in (
+                    doc.char_span(start, end, label=label, alignment_mode=alignment_mode)
+                    for start, end, label in sample.spans
+                ) if span is not None
+            ]
+
+        length = len(sample.text.encode("utf-8"))
+        if doc_bin is not None and shard_size and size + length > shard_size:
+            flush()
+            doc_bin = None
+        if doc_bin is None:
+            doc_bin = tokens.DocBin()
+            size = 0
+        doc_bin.add(doc)
+        size += length
+
+    if doc_bin is not None:
+        flush()
+    return files
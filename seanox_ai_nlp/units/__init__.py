@@ -11,8 +11,45 @@ from .units import (
     NUMERIC_VALIDATION_PATTERN,
     NUMERIC_EXPRESSION_VALIDATION_PATTERN,
     units,
+    units_async,
+    units_incremental,
+    NumericLocale,
+    NumericPatterns,
+    numeric_patterns,
     SpacingMode,
-    spacing
+    spacing,
+    spacing_async,
+    NumericType,
+    Numeric,
+    decompose,
+    UnitFactor,
+    UnitExpression,
+    parse_unit
+)
+
+from .index import (
+    UnitIndex
+)
+
+from .buffers import (
+    units_bytes,
+    char_offsets,
+    numeric_bytes_patterns
+)
+
+from .batch import (
+    units_parquet
+)
+
+from .scanner import (
+    Scanner,
+    ScannerMatch
+)
+
+from .profiler import (
+    profile_units,
+    UnitsProfile,
+    PatternProfile
 )
 
 __all__ = [
@@ -26,6 +63,28 @@ __all__ = [
     "NUMERIC_VALIDATION_PATTERN",
     "NUMERIC_EXPRESSION_VALIDATION_PATTERN",
     "units",
+    "units_async",
+    "units_incremental",
+    "NumericLocale",
+    "NumericPatterns",
+    "numeric_patterns",
     "SpacingMode",
-    "spacing"
+    "spacing",
+    "spacing_async",
+    "NumericType",
+    "Numeric",
+    "decompose",
+    "UnitFactor",
+    "UnitExpression",
+    "parse_unit",
+    "UnitIndex",
+    "units_bytes",
+    "char_offsets",
+    "numeric_bytes_patterns",
+    "units_parquet",
+    "Scanner",
+    "ScannerMatch",
+    "profile_units",
+    "UnitsProfile",
+    "PatternProfile"
 ]
@@ -0,0 +1,7 @@
+# seanox_ai_nlp/units/__main__.py
+
+from .batch import main
+
+import sys
+
+sys.exit(main())
@@ -0,0 +1,272 @@
+# seanox_ai_npl/units/batch.py
+
+# DESIGN NOTE
+#
+# The batch extraction is intended for offline jobs over Parquet datasets with
+# a text column, e.g. python -m seanox_ai_nlp.units input/ output.parquet
+#
+# - pyarrow is an optional dependency and is only imported when it is used, so
+#   that the units module remains usable without it.
+# - A row group is the unit of work. The workers (processes, because the
+#   extraction is CPU bound) open the file themselves and read only their row
+#   group in record batches, so that only file names and results are
+#   transferred between the processes.
+# - The results of each record batch are converted into an Arrow table, so
+#   that Python objects are only kept for one record batch at a time. The
+#   tables of a row group are returned together, because results are
+#   transferred per task between the processes.
+# - The number of row groups in progress is limited to twice the number of
+#   workers, the results are written in the order of the input as soon as they
+#   are available. The memory therefore does not depend on the size of the
+#   dataset, only on the size of the row groups and the number of units found
+#   in them.
+
+from __future__ import annotations
+
+from functools import partial
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+from seanox_ai_nlp.common import _import_pyarrow, _map_bounded
+from seanox_ai_nlp.units.units import (
+    NumericLocale, units, _get_ambiguous_units_for, _UNIT_AMBIGUOUS_LANGUAGES
+)
+
+import argparse
+import os
+import sys
+
+_BATCH_SIZE = 1024
+
+_COLUMNS = ("label", "start", "end", "text", "unit", "value", "categories")
+
+
+def _import_parquet() -> tuple[Any, Any]:
+    return _import_pyarrow("Parquet batch extraction")
+
+
+def _get_sources(source: str) -> list[str]:
+    path = Path(source)
+    if path.is_dir():
+        return sorted(str(file) for file in path.rglob("*.parquet") if file.is_file())
+    if path.is_file():
+        return [str(path)]
+    raise FileNotFoundError(f"File or directory not found: {source}")
+
+
+def _create_schema(pyarrow: Any, id_type: Any = None) -> Any:
+    fields = [("source", pyarrow.string()), ("row", pyarrow.int64())]
+    if id_type is not None:
+        fields.append(("id", id_type))
+    fields += [
+        ("label", pyarrow.string()),
+        ("start", pyarrow.int64()),
+        ("end", pyarrow.int64()),
+        ("text", pyarrow.string()),
+        ("unit", pyarrow.string()),
+        ("value", pyarrow.string()),
+        ("categories", pyarrow.list_(pyarrow.string()))
+    ]
+    return pyarrow.schema(fields)
+
+
+def _extract_row_group(
+        source: str,
+        row_group: int,
+        row: int,
+        schema: Any,
+        column: str,
+        id_column: Optional[str],
+        locales: Optional[frozenset[NumericLocale]],
+        languages: Optional[frozenset[str]],
+        names: bool,
+        batch_size: int
+) -> list[Any]:
+
+    pyarrow, parquet = _import_parquet()
+
+    tables = []
+    columns = [column, id_column] if id_column else [column]
+    file = parquet.ParquetFile(source)
+    try:
+        for batch in file.iter_batches(batch_size=batch_size, row_groups=[row_group], columns=columns):
+            result = {"source": [], "row": []}
+            if id_column:
+                result["id"] = []
+            result.update((name, []) for name in _COLUMNS)
+            texts = batch.column(column).to_pylist()
+            ids = batch.column(id_column).to_pylist() if id_column else None
+            for index, text in enumerate(texts):
+                if not text:
+                    continue
+                for entity in units(text, locales, languages, names):
+                    result["source"].append(source)
+                    result["row"].append(row + index)
+                    if ids is not None:
+                        result["id"].append(ids[index])
+                    result["label"].append(entity.label)
+                    result["start"].append(entity.start)
+                    result["end"].append(entity.end)
+                    result["text"].append(entity.text)
+                    result["unit"].append(entity.unit)
+                    result["value"].append(entity.value)
+                    result["categories"].append(list(entity.categories))
+            if result["row"]:
+                tables.append(pyarrow.Table.from_pydict(result, schema=schema))
+            row += len(texts)
+    finally:
+        file.close()
+    return tables
+
+
+def units_parquet(
+        source: str,
+        target: str,
+        column: str = "text",
+        id_column: str = None,
+        locales: Iterable[NumericLocale] = None,
+        languages: Iterable[str] = None,
+        names: bool = False,
+        workers: int = None,
+        batch_size: int = _BATCH_SIZE
+) -> int:
+    """
+    Extracts the units and measures of a text column from a Parquet file or a
+    directory of Parquet files and writes them as rows to a Parquet file.
+    Requires the optional dependency pyarrow.
+
+    The row groups of the input are processed in parallel by a pool of worker
+    processes and read in record batches. Results are written in the order of
+    the input, the number of row groups in progress is limited.
+
+    Output columns: source, row, id (if id_column is used), label, start, end,
+    text, unit, value, categories
+
+    Args:
+        source (str): Parquet file or directory with Parquet files
+        target (str): Parquet file for the results
+        column (str, optional): Name of the text column, default 'text'
+        id_column (str, optional): Name of a column to be taken over as id
+        locales (Iterable[NumericLocale], optional): Restricts the numeric
+            formats to the given locales. Default is all locales.
+        languages (Iterable[str], optional): Suppresses units without value
+            that are ambiguous with common words in these languages.
+        names (bool, optional): Also extracts spelled-out names of units.
+        workers (int, optional): Number of worker processes, default is the
+            number of CPUs. With 1, the current process is used.
+        batch_size (int, optional): Rows per record batch, default 1024
+
+    Returns:
+        int: Number of rows written
+
+    Raises:
+        ImportError: If pyarrow is not installed.
+        FileNotFoundError: If the source does not exist.
+        ValueError: If a column does not exist in a source file or a
+            language is not supported.
+    """
+
+    pyarrow, parquet = _import_parquet()
+
+    if locales is not None:
+        locales = frozenset(locales)
+        if not locales:
+            raise ValueError("At least one locale is required")
+    if languages is not None:
+        languages = frozenset(languages)
+        _get_ambiguous_units_for(languages)
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    tasks = []
+    id_type = None
+    for file in _get_sources(source):
+        reader = parquet.ParquetFile(file)
+        try:
+            schema = reader.schema_arrow
+            for name in filter(None, (column, id_column)):
+                if name not in schema.names:
+                    raise ValueError(f"Column not found in {file}: {name}")
+            if id_column and id_type is None:
+                id_type = schema.field(id_column).type
+            row = 0
+            for row_group in range(reader.num_row_groups):
+                tasks.append((file, row_group, row))
+                row += reader.metadata.row_group(row_group).num_rows
+        finally:
+            reader.close()
+    if id_column and id_type is None:
+        id_type = pyarrow.string()
+
+    schema = _create_schema(pyarrow, id_type)
+    function = partial(
+        _extract_row_group,
+        schema=schema,
+        column=column,
+        id_column=id_column,
+        locales=locales,
+        languages=languages,
+        names=names,
+        batch_size=batch_size
+    )
+
+    count = 0
+    with parquet.ParquetWriter(target, schema) as writer:
+        for tables in _map_bounded(function, tasks, workers):
+            for table in tables:
+                writer.write_table(table)
+                count += table.num_rows
+    return count
+
+
+def main(arguments: list[str] = None) -> int:
+    """
+    Command line entry point for units_parquet().
+
+    Example:
+        python -m seanox_ai_nlp.units input/ output.parquet --column text --locale DE
+    """
+    parser = argparse.ArgumentParser(
+        prog="seanox-ai-nlp-units",
+        description="Extracts units and measures from a text column of Parquet files."
+    )
+    parser.add_argument("source", help="Parquet file or directory with Parquet files")
+    parser.add_argument("target", help="Parquet file for the results")
+    parser.add_argument("--column", default="text", help="name of the text column (default: text)")
+    parser.add_argument("--id", dest="id_column", help="name of a column to be taken over as id")
+    parser.add_argument(
+        "--locale",
+        dest="locales",
+        action="append",
+        choices=[locale.name for locale in NumericLocale],
+        help="restricts the numeric formats, can be used multiple times"
+    )
+    parser.add_argument(
+        "--language",
+        dest="languages",
+        action="append",
+        choices=sorted(_UNIT_AMBIGUOUS_LANGUAGES),
+        help="suppresses ambiguous units without value, can be used multiple times"
+    )
+    parser.add_argument("--names", action="store_true", help="also extracts spelled-out names of units")
+    parser.add_argument("--workers", type=int, help="number of worker processes (default: number of CPUs)")
+    parser.add_argument("--batch-size", type=int, default=_BATCH_SIZE, help="rows per record batch (default: 1024)")
+    arguments = parser.parse_args(arguments)
+
+    try:
+        count = units_parquet(
+            arguments.source,
+            arguments.target,
+            column=arguments.column,
+            id_column=arguments.id_column,
+            locales=[NumericLocale[locale] for locale in arguments.locales] if arguments.locales else None,
+            languages=arguments.languages,
+            names=arguments.names,
+            workers=arguments.workers,
+            batch_size=arguments.batch_size
+        )
+    except (ImportError, FileNotFoundError, ValueError) as exception:
+        print(f"{parser.prog}: error: {exception}", file=sys.stderr)
+        return 1
+    print(f"{count} units + measures written to {arguments.target}")
+    return 0
@@ -0,0 +1,484 @@
+# seanox_ai_npl/units/buffers.py
+
+# DESIGN NOTE
+#
+# The bytes variants are intended for UTF-8 buffers (bytes, bytearray,
+# memoryview) that are scanned without decoding the whole document to str.
+#
+# - The bytes patterns are derived from the str patterns, so there is only one
+#   definition of the patterns. Non-ASCII characters become UTF-8 byte
+#   sequences, character classes and categories (\d, \w, \s, ...) become
+#   alternatives of byte sequences for exactly the characters that the str
+#   variant matches. In bytes mode re only knows ASCII for \d, \w and \s.
+# - Exception: Digits of numeric values are ASCII digits. Each \d would
+#   otherwise become several hundred alternatives for other decimal digits
+#   (e.g. Arabic-Indic), which makes the patterns large and slow to compile.
+# - Classes are translated directly into ranges of code points. Only the
+#   categories \d, \w and \s are determined once with the str categories
+#   themselves over all code points, so that the semantics cannot drift apart.
+# - Look-behinds must have a fixed width in re, therefore they are split into
+#   one look-behind per length of the UTF-8 sequences.
+# - In bytes mode, case-insensitive groups only know the case of ASCII letters.
+#   Characters with other case variants (e.g. ä, ß, ſ for s) become
+#   alternatives, so that the names of units match as in the str variant.
+# - Only the matched fragments are decoded, offsets are byte offsets. The
+#   conversion into character offsets is optional and counts only the UTF-8
+#   continuation bytes up to the last entity.
+
+from array import array
+from functools import lru_cache
+from typing import Iterable, Optional, Union
+
+from seanox_ai_nlp.units.units import (
+    Unit, NumericLocale, NumericPatterns, numeric_patterns,
+    _get_categories_for_unit, _get_categories_for_context, _get_context_cues, _get_ambiguous_units_for,
+    _get_unit_for_name, _get_unit_pattern, _is_ambiguous_unit, _is_valid_unit, _UNIT_CONTEXT_WINDOW
+)
+
+import re
+import sys
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+_RE_CATEGORIES_SET = {"\\d", "\\D", "\\w", "\\W", "\\s", "\\S", "."}
+
+_UTF8_LENGTHS_MAXIMUM = ((1, 0x7F), (2, 0x7FF), (3, 0xFFFF), (4, 0x10FFFF))
+_UTF8_SURROGATES = (0xD800, 0xDFFF)
+
+_UTF8_CONTINUATION_PATTERN = re.compile(rb"[\x80-\xbf]+")
+
+_RE_GROUP_PREFIX_PATTERN = re.compile(r"\((?:\?(?:P<\w+>|i:|[:=!]))?")
+
+
+def _merge_ranges(ranges: Iterable[tuple[int, int]]) -> tuple[tuple[int, int], ...]:
+    # Sorts and merges overlapping and adjacent ranges, the surrogates are cut
+    # out because they cannot be encoded in UTF-8.
+    merged = []
+    for low, high in sorted(ranges):
+        if merged and low <= merged[-1][1] + 1:
+            merged[-1][1] = max(merged[-1][1], high)
+        else:
+            merged.append([low, high])
+    result = []
+    for low, high in merged:
+        if low < _UTF8_SURROGATES[0] and high >= _UTF8_SURROGATES[0]:
+            result.append((low, _UTF8_SURROGATES[0] - 1))
+            low = _UTF8_SURROGATES[0]
+        if _UTF8_SURROGATES[0] <= low <= _UTF8_SURROGATES[1]:
+            low = _UTF8_SURROGATES[1] + 1
+        if low <= high:
+            result.append((low, high))
+    return tuple(result)
+
+
+def _invert_ranges(ranges: tuple[tuple[int, int], ...]) -> tuple[tuple[int, int], ...]:
+    inverted = []
+    low = 0
+    for start, end in ranges:
+        if low < start:
+            inverted.append((low, start - 1))
+        low = end + 1
+    if low <= _UTF8_LENGTHS_MAXIMUM[-1][1]:
+        inverted.append((low, _UTF8_LENGTHS_MAXIMUM[-1][1]))
+    return _merge_ranges(inverted)
+
+
+def _get_code_points() -> list[tuple[int, str]]:
+    # All code points except the surrogates, which cannot be encoded in UTF-8,
+    # as strings with the first code point of each string. They are decoded
+    # from UTF-32, which is much faster than joining the characters.
+    encoding = "utf-32-le" if sys.byteorder == "little" else "utf-32-be"
+    return [
+        (low, array("I", range(low, high + 1)).tobytes().decode(encoding))
+        for low, high in ((0, _UTF8_SURROGATES[0] - 1), (_UTF8_SURROGATES[1] + 1, _UTF8_LENGTHS_MAXIMUM[-1][1]))
+    ]
+
+
+@lru_cache(maxsize=1)
+def _get_categories() -> dict[str, tuple[tuple[int, int], ...]]:
+    # The categories \d, \w and \s are determined once with the str
+    # categories themselves over all code points, so that the semantics cannot
+    # drift apart.
+    characters = _get_code_points()
+    categories = {}
+    for category in ("\\d", "\\w", "\\s"):
+        pattern = re.compile(f"{category}+")
+        categories[category] = _merge_ranges(
+            (offset + match.start(), offset + match.end() - 1)
+            for offset, text in characters
+            for match in pattern.finditer(text)
+        )
+        categories[category.upper()] = _invert_ranges(categories[category])
+    categories["."] = _invert_ranges(((0x0A, 0x0A),))
+    return categories
+
+
+@lru_cache(maxsize=8)
+def _get_case_variants(characters: frozenset[str]) -> dict[str, tuple[str, ...]]:
+    # Characters that a case-insensitive str pattern also matches for the
+    # given characters, e.g. the Kelvin sign for k, determined with re itself
+    # in one pass over all code points. In bytes mode re only knows the case
+    # of ASCII letters, so variants that it covers are omitted.
+    pattern = re.compile("(?i:[" + "".join(map(re.escape, sorted(characters))) + "])+")
+    matches = [
+        chr(code)
+        for offset, text in _get_code_points()
+        for match in pattern.finditer(text)
+        for code in range(offset + match.start(), offset + match.end())
+    ]
+    variants = {}
+    for character in characters:
+        expression = re.compile(f"(?i:{re.escape(character)})")
+        variants[character] = tuple(
+            match for match in matches
+            if match != character
+            and not (character.isascii() and match.isascii())
+            and expression.fullmatch(match)
+        )
+    return variants
+
+
+def _re_read_class_item(expression: str, index: int) -> tuple[Union[int, str], int]:
+    # Returns the code point or the category of an item of a class and the
+    # index of the next item.
+    if expression[index] != "\\":
+        return ord(expression[index]), index + 1
+    escape = expression[index + 1]
+    if escape == "u":
+        return int(expression[index + 2:index + 6], 16), index + 6
+    if "\\" + escape in _RE_CATEGORIES_SET:
+        return "\\" + escape, index + 2
+    if escape.isalnum():
+        raise ValueError(f"Unsupported escape in class at position {index}")
+    return ord(escape), index + 2
+
+
+@lru_cache(maxsize=None)
+def _get_ranges(atom: str) -> tuple[tuple[int, int], ...]:
+    # Code points of a class or category as ranges, classes are translated
+    # directly, only the categories are determined over all code points.
+    if atom in _RE_CATEGORIES_SET:
+        return _get_categories()[atom]
+    negative = atom.startswith("[^")
+    index = 2 if negative else 1
+    end = len(atom) - 1
+    ranges = []
+    while index < end:
+        item, index = _re_read_class_item(atom, index)
+        if isinstance(item, str):
+            ranges.extend(_get_categories()[item])
+        elif atom[index] == "-" and index + 1 < end:
+            high, index = _re_read_class_item(atom, index + 1)
+            if isinstance(high, str):
+                raise ValueError(f"Unsupported range in class at position {index}")
+            ranges.append((item, high))
+        else:
+            ranges.append((item, item))
+    ranges = _merge_ranges(ranges)
+    return _invert_ranges(ranges) if negative else ranges
+
+
+def _utf8_sequences(low: int, high: int) -> list[list[tuple[int, int]]]:
+    # Splits a range of code points into sequences of byte ranges, e.g.
+    # U+00C0-U+00FF becomes \xc3[\x80-\xbf]. Based on the well-known algorithm
+    # of RE2 and the Rust crate utf8-ranges.
+    for _, maximum in _UTF8_LENGTHS_MAXIMUM[:-1]:
+        if low <= maximum < high:
+            return _utf8_sequences(low, maximum) + _utf8_sequences(maximum + 1, high)
+    if high <= 0x7F:
+        return [[(low, high)]]
+    for length in range(1, 4):
+        mask = (1 << (6 * length)) - 1
+        if low & ~mask != high & ~mask:
+            if low & mask:
+                return _utf8_sequences(low, low | mask) + _utf8_sequences((low | mask) + 1, high)
+            if high & mask != mask:
+                return _utf8_sequences(low, (high & ~mask) - 1) + _utf8_sequences(high & ~mask, high)
+    return [list(zip(chr(low).encode("utf-8"), chr(high).encode("utf-8")))]
+
+
+def _re_byte(value: int) -> str:
+    return f"\\x{value:02x}"
+
+
+def _re_byte_range(low: int, high: int) -> str:
+    if low == high:
+        return _re_byte(low)
+    return f"{_re_byte(low)}-{_re_byte(high)}"
+
+
+def _re_byte_sequences(sequences: list[list[tuple[int, int]]]) -> str:
+    # Alternatives of byte sequences with the same length, common leading
+    # byte ranges are combined, e.g. \xc3(?:[\x80-\x96]|[\x98-\xb6]).
+    if len(sequences[0]) == 1:
+        ranges = [_re_byte_range(*sequence[0]) for sequence in sequences]
+        return f"[{''.join(ranges)}]"
+    groups: dict[tuple[int, int], list[list[tuple[int, int]]]] = {}
+    for sequence in sequences:
+        groups.setdefault(sequence[0], []).append(sequence[1:])
+    alternatives = []
+    for (low, high), rests in groups.items():
+        head = _re_byte(low) if low == high else f"[{_re_byte_range(low, high)}]"
+        alternatives.append(head + _re_byte_sequences(rests))
+    if len(alternatives) == 1:
+        return alternatives[0]
+    return f"(?:{'|'.join(alternatives)})"
+
+
+@lru_cache(maxsize=None)
+def _re_character_set(atom: str) -> tuple[str, list[str]]:
+    # Returns the ASCII class and the alternatives of multibyte sequences
+    # (one per length) of the characters matched by a class or category.
+    ascii_ranges = []
+    sequences: dict[int, list[list[tuple[int, int]]]] = {}
+    for low, high in _get_ranges(atom):
+        for sequence in _utf8_sequences(low, high):
+            if len(sequence) == 1:
+                ascii_ranges.append(_re_byte_range(*sequence[0]))
+            else:
+                sequences.setdefault(len(sequence), []).append(sequence)
+    ascii_class = f"[{''.join(ascii_ranges)}]" if ascii_ranges else ""
+    return ascii_class, [_re_byte_sequences(sequences[length]) for length in sorted(sequences)]
+
+
+def _re_atom(atom: str) -> str:
+    if atom == "\\d":
+        return "[0-9]"
+    if atom.startswith("[") or atom in _RE_CATEGORIES_SET:
+        ascii_class, multibyte = _re_character_set(atom)
+        alternatives = [ascii_class] if ascii_class else []
+        if multibyte:
+            alternatives.append(f"(?=[\\x80-\\xff])(?:{'|'.join(multibyte)})")
+        return f"(?:{'|'.join(alternatives)})" if alternatives else "(?!)"
+    if atom.startswith("\\u"):
+        atom = chr(int(atom[2:], 16))
+    if len(atom) == 1 and ord(atom) > 0x7F:
+        return f"(?:{''.join(map(_re_byte, atom.encode('utf-8')))})"
+    return atom
+
+
+def _re_look_behind(atom: str, negative: bool) -> str:
+    if not atom.startswith("[") and atom not in _RE_CATEGORIES_SET:
+        atom = f"[{atom}]"
+    ascii_class, multibyte = _re_character_set(atom)
+    if negative:
+        # Multibyte sequences end with a continuation byte, the expensive
+        # alternatives are only checked after a continuation byte.
+        expression = f"(?<!{ascii_class})" if ascii_class else ""
+        if multibyte:
+            expression += "(?:(?<![\\x80-\\xbf])|" + "".join(f"(?<!{sequence})" for sequence in multibyte) + ")"
+        return expression
+    alternatives = [f"(?<={ascii_class})"] if ascii_class else []
+    if multibyte:
+        alternatives.append("(?<=[\\x80-\\xbf])(?:" + "|".join(f"(?<={sequence})" for sequence in multibyte) + ")")
+    return f"(?:{'|'.join(alternatives)})" if alternatives else "(?!)"
+
+
+def _re_read_atom(expression: str, index: int) -> tuple[str, int]:
+    if expression[index] == "[":
+        end = index + 1
+        if end < len(expression) and expression[end] == "^":
+            end += 1
+        if end < len(expression) and expression[end] == "]":
+            end += 1
+        while expression[end] != "]":
+            end += 2 if expression[end] == "\\" else 1
+        return expression[index:end + 1], end + 1
+    if expression[index] == "\\":
+        if expression[index + 1] == "u":
+            return expression[index:index + 6], index + 6
+        return expression[index:index + 2], index + 2
+    return expression[index], index + 1
+
+
+def _re_encode(expression: str) -> bytes:
+    # Translates a str pattern into an equivalent bytes pattern for UTF-8.
+    # Supported are the constructs used by the patterns of the units module.
+    # In case-insensitive groups (?i:...), e.g. of the names of units, the
+    # characters with case variants outside of ASCII become alternatives.
+    variants = {}
+    if "(?i:" in expression:
+        variants = _get_case_variants(frozenset(character for character in expression if character.isalpha()))
+    groups = []
+    result = []
+    index = 0
+    while index < len(expression):
+        if expression.startswith(("(?<=", "(?<!"), index):
+            negative = expression[index + 3] == "!"
+            atom, index = _re_read_atom(expression, index + 4)
+            if expression[index] != ")":
+                raise ValueError(f"Unsupported look-behind at position {index}")
+            result.append(_re_look_behind(atom, negative))
+            index += 1
+            continue
+        if expression[index] == "(":
+            prefix = _RE_GROUP_PREFIX_PATTERN.match(expression, index).group()
+            groups.append(prefix == "(?i:" or bool(groups and groups[-1]))
+            result.append(prefix)
+            index += len(prefix)
+            continue
+        atom, index = _re_read_atom(expression, index)
+        if atom == ")" and groups:
+            groups.pop()
+        elif groups and groups[-1] and variants.get(atom):
+            result.append(f"(?:{'|'.join(map(_re_atom, (atom, *variants[atom])))})")
+            continue
+        result.append(_re_atom(atom))
+    return "".join(result).encode("ascii")
+
+
+@lru_cache(maxsize=64)
+def _get_numeric_bytes_patterns(locales: frozenset[NumericLocale] = None) -> NumericPatterns:
+    patterns = numeric_patterns(locales)
+    return NumericPatterns(*(re.compile(_re_encode(pattern.pattern)) for pattern in patterns))
+
+
+def numeric_bytes_patterns(locales: Iterable[NumericLocale] = None) -> NumericPatterns:
+    """
+    Returns the bytes variants of the numeric patterns and the unit pattern for
+    UTF-8 encoded buffers. They match the same as the str variants, but return
+    byte offsets. The variants are compiled on first use per set of locales
+    and cached.
+
+    Args:
+        locales (Iterable[NumericLocale], optional): Locales of the numeric
+            formats. Default is all locales.
+
+    Returns:
+        NumericPatterns: Compiled bytes pattern variants
+
+    Raises:
+        ValueError: If the set of locales is empty.
+    """
+    if locales is None:
+        return _get_numeric_bytes_patterns()
+    locales = frozenset(locales)
+    if not locales:
+        raise ValueError("At least one locale is required")
+    return _get_numeric_bytes_patterns(locales)
+
+
+@lru_cache(maxsize=64)
+def _get_unit_names_bytes_pattern(locales: Optional[frozenset[NumericLocale]]) -> re.Pattern:
+    return re.compile(_re_encode(_get_unit_pattern(locales, names=True).pattern))
+
+
+def _get_unit_bytes_pattern(locales: Optional[Iterable[NumericLocale]], names: bool) -> re.Pattern:
+    if not names:
+        return numeric_bytes_patterns(locales).unit
+    if locales is not None:
+        locales = frozenset(locales)
+        if not locales:
+            raise ValueError("At least one locale is required")
+    return _get_unit_names_bytes_pattern(locales)
+
+
+def _get_categories_in_buffer(unit: str, buffer: Buffer, start: int, end: int) -> tuple[str, ...]:
+
+    # The context is decoded with enough bytes for the same number of
+    # characters as in units(), incomplete characters at the cut are dropped.
+
+    if not _is_ambiguous_unit(unit):
+        return _get_categories_for_unit(unit)
+    window = (_UNIT_CONTEXT_WINDOW + 1) * 4
+    before = str(buffer[max(0, start - window):start], "utf-8", "ignore")[-_UNIT_CONTEXT_WINDOW:]
+    after = str(buffer[end:end + window], "utf-8", "ignore")[:_UNIT_CONTEXT_WINDOW]
+    return _get_categories_for_context(unit, _get_context_cues(before, after))
+
+
+def units_bytes(
+        buffer: Buffer,
+        locales: Iterable[NumericLocale] = None,
+        languages: Iterable[str] = None,
+        names: bool = False
+) -> list[Unit]:
+    """
+    Extracts valid unit expressions and associated numeric values from a UTF-8
+    encoded buffer, without decoding the buffer. The result corresponds to
+    units() on the decoded text, but start and end are byte offsets.
+
+    Args:
+        buffer (bytes | bytearray | memoryview): UTF-8 encoded input, also
+            slices of a memoryview.
+        locales (Iterable[NumericLocale], optional): Restricts the numeric
+            formats to the given locales. Default is all locales.
+        languages (Iterable[str], optional): Suppresses units without value
+            that are ambiguous with common words in these languages.
+        names (bool, optional): Also extracts spelled-out names of units, as
+            with units(). Default is False.
+
+    Returns:
+        list[Unit]: List of Unit objects with byte offsets, char_offsets()
+            converts them into character offsets if needed.
+    """
+
+    if not buffer:
+        return []
+
+    pattern = _get_unit_bytes_pattern(locales, names)
+    ambiguous = _get_ambiguous_units_for(languages)
+
+    entities = []
+    for match in pattern.finditer(buffer):
+        groups = match.groupdict()
+        numeric = groups["unit_value_numeric"]
+        name = groups.get("unit_value_name") or groups.get("unit_name")
+
+        if name:
+            unit = _get_unit_for_name(str(name, "utf-8"))
+        else:
+            unit = str(groups["unit_value_unit"] or groups["unit_unit"], "utf-8")
+            if not numeric and unit in ambiguous:
+                continue
+            if not _is_valid_unit(unit):
+                continue
+
+        entities.append(
+            Unit(
+                label="MEASURE" if numeric else "UNIT",
+                start=match.start(),
+                end=match.end(),
+                text=str(match.group(), "utf-8"),
+                unit=unit,
+                value=str(numeric, "utf-8") if numeric else None,
+                categories=_get_categories_in_buffer(unit, buffer, match.start(), match.end())
+            )
+        )
+
+    return entities
+
+
+def char_offsets(buffer: Buffer, entities: Iterable[Unit]) -> list[Unit]:
+    """
+    Converts the byte offsets of units_bytes() into character offsets of the
+    decoded text. The buffer is not decoded, only the UTF-8 continuation bytes
+    up to the last entity are counted.
+
+    Args:
+        buffer (bytes | bytearray | memoryview): Buffer of units_bytes()
+        entities (Iterable[Unit]): Result of units_bytes()
+
+    Returns:
+        list[Unit]: Unit objects with character offsets
+    """
+    entities = list(entities)
+    if not entities:
+        return []
+
+    offsets = sorted({offset for entity in entities for offset in (entity.start, entity.end)})
+    continuations = _UTF8_CONTINUATION_PATTERN.finditer(buffer, 0, offsets[-1])
+    continuation = next(continuations, None)
+    count = 0
+    mapping = {}
+    for offset in offsets:
+        # Offsets are always at character boundaries, so continuation bytes
+        # are either completely before or after an offset.
+        while continuation and continuation.end() <= offset:
+            count += continuation.end() - continuation.start()
+            continuation = next(continuations, None)
+        mapping[offset] = offset - count
+
+    return [
+        entity._replace(start=mapping[entity.start], end=mapping[entity.end])
+        for entity in entities
+    ]
@@ -0,0 +1,375 @@
+# seanox_ai_npl/units/index.py
+
+# DESIGN NOTE
+#
+# The index is intended for numeric range queries over measures extracted with
+# units(), e.g. all documents with a voltage between 200 and 240 V.
+#
+# - Measures are grouped into buckets by the base of their unit expression
+#   (unit without prefixes, e.g. V for kV and mV). Values are scaled to the base
+#   unit, so that 0.2 kV and 200 V are comparable.
+# - Each bucket stores its entries as three parallel arrays sorted by the lower
+#   bound: lows, highs and document numbers. Single values are intervals with
+#   identical bounds, ranges and tolerances are real intervals.
+# - Queries use binary search. The maximum interval width of a bucket limits
+#   how far before the lower query bound an overlapping interval can start.
+# - The file format consists of a small JSON directory followed by the raw
+#   arrays, so that a stored index can be used via mmap without copying or
+#   parsing the arrays.
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Any, Hashable, Iterable, Optional
+
+from seanox_ai_nlp.units.units import (
+    Unit, NumericLocale, NumericType, decompose, parse_unit,
+    _get_decimal_separator, _parse_numeric
+)
+
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+
+_INDEX_FILE_SIGNATURE = b"SXUI"
+_INDEX_FILE_VERSION = 1
+
+# signature, version, length of the directory
+_INDEX_FILE_HEADER = struct.Struct("<4sIQ")
+
+
+def _align(offset: int, alignment: int = 8) -> int:
+    return (offset + alignment - 1) // alignment * alignment
+
+
+def _intervals(unit: Unit, decimal: str = None) -> list[tuple[float, float]]:
+
+    numeric = decompose(unit)
+    if not numeric:
+        return []
+    values = [_parse_numeric(value, decimal) for value in numeric.values]
+    if None in values:
+        return []
+    if numeric.sign == "-":
+        values[0] = -values[0]
+
+    if numeric.type == NumericType.VALUE:
+        return [(values[0], values[0])]
+    if numeric.type == NumericType.RANGE:
+        return [(min(values), max(values))]
+    if numeric.type == NumericType.TOLERANCE:
+        if len(values) == 1:
+            return [(-values[0], values[0])]
+        return [(values[0] - abs(values[1]), values[0] + abs(values[1]))]
+    if numeric.type == NumericType.DIMENSIONS:
+        return [(value, value) for value in values]
+
+    # Operations, e.g. 1.2 × 10^3 or 3.5/2, are not evaluated.
+    return []
+
+
+class _Bucket:
+
+    __slots__ = ("lows", "highs", "documents", "width", "categories", "sorted")
+
+    def __init__(self) -> None:
+        self.lows = array("d")
+        self.highs = array("d")
+        self.documents = array("q")
+        self.width = 0.0
+        self.categories: set[str] = set()
+        self.sorted = True
+
+    def append(self, low: float, high: float, document: int) -> None:
+        if not isinstance(self.lows, array):
+            # Buckets loaded from a file are read-only views on the file and
+            # are only copied when they are changed.
+            self.lows = array("d", self.lows)
+            self.highs = array("d", self.highs)
+            self.documents = array("q", self.documents)
+        if self.lows and low < self.lows[-1]:
+            self.sorted = False
+        self.lows.append(low)
+        self.highs.append(high)
+        self.documents.append(document)
+        self.width = max(self.width, high - low)
+
+    def sort(self) -> None:
+        if self.sorted:
+            return
+        order = sorted(range(len(self.lows)), key=self.lows.__getitem__)
+        self.lows = array("d", (self.lows[index] for index in order))
+        self.highs = array("d", (self.highs[index] for index in order))
+        self.documents = array("q", (self.documents[index] for index in order))
+        self.sorted = True
+
+    def query(self, low: float, high: float) -> Iterable[int]:
+        self.sort()
+        start = bisect_left(self.lows, low - self.width)
+        end = bisect_right(self.lows, high)
+        highs = self.highs
+        documents = self.documents
+        for index in range(start, end):
+            if highs[index] >= low:
+                yield documents[index]
+
+
+class UnitIndex:
+    """
+    Index over measures extracted with units() for numeric range queries, e.g.
+    all documents with a voltage between 200 and 240 V.
+
+    Measures are grouped by the base of their unit (e.g. V for kV and mV) and
+    their values are scaled to the base unit. Ranges (220 - 240 V) and
+    tolerances (230 ± 10 V) are stored as intervals and are found if they
+    overlap the queried range. Each value of dimensions (10 × 20 × 30 cm) is
+    stored individually. Operations (1.2 × 10^3 W) are not indexed.
+
+    Document ids must be str or int if the index is to be saved.
+
+    Example:
+        index = UnitIndex()
+        index.add("doc-1", units("Input voltage 220 - 240 V, 50 Hz"))
+        index.query("V", 200, 240)
+        returns: ["doc-1"]
+    """
+
+    def __init__(self) -> None:
+        self._documents: list[Hashable] = []
+        self._documents_numbers: dict[Hashable, int] = {}
+        self._buckets: dict[str, _Bucket] = {}
+        self._mmap: Optional[mmap.mmap] = None
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def __enter__(self) -> UnitIndex:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def _get_document_number(self, document: Hashable) -> int:
+        number = self._documents_numbers.get(document)
+        if number is None:
+            number = len(self._documents)
+            self._documents.append(document)
+            self._documents_numbers[document] = number
+        return number
+
+    def add(
+            self,
+            document: Hashable,
+            entities: Iterable[Unit],
+            locales: Iterable[NumericLocale] = None
+    ) -> None:
+        """
+        Adds the measures of a document to the index. Units without value are
+        ignored.
+
+        Args:
+            document (Hashable): Document id
+            entities (Iterable[Unit]): Result of units() for the document
+            locales (Iterable[NumericLocale], optional): Locales of the
+                document, determine the decimal separator of the values if all
+                locales use the same, e.g. 1,500 is 1500 for EN.
+        """
+        decimal = _get_decimal_separator(locales)
+        number = None
+        for entity in entities:
+            if not entity.value:
+                continue
+            expression = parse_unit(entity.unit)
+            if not expression:
+                continue
+            intervals = _intervals(entity, decimal)
+            if not intervals:
+                continue
+            if number is None:
+                number = self._get_document_number(document)
+            key = str(expression.base)
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = _Bucket()
+            bucket.categories.update(entity.categories)
+            scale = expression.scale
+            for low, high in intervals:
+                bucket.append(low * scale, high * scale, number)
+
+    def units(self, category: str = None) -> list[str]:
+        """
+        Returns the (base) units contained in the index.
+
+        Args:
+            category (str, optional): Only units of this category.
+
+        Returns:
+            list[str]: Normalized base units, e.g. 'V' or 'm·s⁻¹'
+        """
+        return sorted(
+            key for key, bucket in self._buckets.items()
+            if category is None or category in bucket.categories
+        )
+
+    def query(
+            self,
+            unit: str = None,
+            low: float = None,
+            high: float = None,
+            category: str = None
+    ) -> list[Hashable]:
+        """
+        Returns the documents with measures in the given range.
+
+        Args:
+            unit (str, optional): Unit of the range, e.g. 'V', 'kV' or 'km/h'.
+                The bounds are scaled accordingly, 0.2 - 0.24 kV is equivalent
+                to 200 - 240 V.
+            low (float, optional): Lower bound (inclusive), default unlimited.
+            high (float, optional): Upper bound (inclusive), default unlimited.
+            category (str, optional): Searches all units of a category instead
+                of a single unit, e.g. 'electricity'. The bounds then refer to
+                the base units.
+
+        Returns:
+            list[Hashable]: Document ids in the order they were added.
+        """
+        low = float("-inf") if low is None else float(low)
+        high = float("inf") if high is None else float(high)
+        if unit is not None:
+            expression = parse_unit(unit)
+            if not expression:
+                return []
+            scale = expression.scale
+            low, high = low * scale, high * scale
+            buckets = [self._buckets.get(str(expression.base))]
+        else:
+            buckets = [
+                bucket for bucket in self._buckets.values()
+                if category is None or category in bucket.categories
+            ]
+        numbers = set()
+        for bucket in buckets:
+            if bucket is not None:
+                numbers.update(bucket.query(low, high))
+        return [self._documents[number] for number in sorted(numbers)]
+
+    def save(self, path: str) -> None:
+        """
+        Saves the index in a compact binary format that can be loaded with
+        UnitIndex.load() via mmap without copying the arrays.
+
+        Args:
+            path (str): Path of the index file
+        """
+        for bucket in self._buckets.values():
+            bucket.sort()
+        for document in self._documents:
+            if not isinstance(document, (str, int)):
+                raise TypeError(f"Document id must be str or int: {document!r}")
+
+        buckets = {}
+        offset = 0
+        for key, bucket in self._buckets.items():
+            count = len(bucket.lows)
+            buckets[key] = {
+                "offset": offset,
+                "count": count,
+                "width": bucket.width,
+                "categories": sorted(bucket.categories)
+            }
+            offset += count * 8 * 3
+        directory = json.dumps({
+            "byteorder": sys.byteorder,
+            "documents": self._documents,
+            "buckets": buckets
+        }, ensure_ascii=False).encode("utf-8")
+
+        # The arrays of a loaded index are views on its file, so the index is
+        # written to a temporary file which then replaces the target, also if
+        # the target is the file of the index.
+        start = _align(_INDEX_FILE_HEADER.size + len(directory))
+        temp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(temp, "wb") as file:
+                file.write(_INDEX_FILE_HEADER.pack(_INDEX_FILE_SIGNATURE, _INDEX_FILE_VERSION, len(directory)))
+                file.write(directory)
+                file.write(b"\0" * (start - file.tell()))
+                for bucket in self._buckets.values():
+                    for values in (bucket.lows, bucket.highs, bucket.documents):
+                        file.write(memoryview(values).cast("B"))
+            os.replace(temp, path)
+        finally:
+            if os.path.exists(temp):
+                os.remove(temp)
+
+    @classmethod
+    def load(cls, path: str) -> UnitIndex:
+        """
+        Loads an index saved with save(). The arrays are used directly from the
+        file via mmap, changes with add() only copy the affected buckets.
+
+        Args:
+            path (str): Path of the index file
+
+        Returns:
+            UnitIndex: Loaded index, close() releases the file.
+
+        Raises:
+            ValueError: If the file is not a valid index file.
+        """
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f"File not found: {path}")
+        with open(path, "rb") as file:
+            header = file.read(_INDEX_FILE_HEADER.size)
+            if len(header) < _INDEX_FILE_HEADER.size:
+                raise ValueError(f"Invalid index file: {path}")
+            signature, version, length = _INDEX_FILE_HEADER.unpack(header)
+            if signature != _INDEX_FILE_SIGNATURE or version != _INDEX_FILE_VERSION:
+                raise ValueError(f"Invalid index file: {path}")
+            directory = json.loads(file.read(length).decode("utf-8"))
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        index = cls()
+        index._mmap = data
+        for document in directory["documents"]:
+            index._get_document_number(document)
+
+        start = _align(_INDEX_FILE_HEADER.size + length)
+        swap = directory["byteorder"] != sys.byteorder
+        for key, entry in directory["buckets"].items():
+            bucket = _Bucket()
+            count = entry["count"]
+            offset = start + entry["offset"]
+            views = []
+            for typecode in ("d", "d", "q"):
+                view = memoryview(data)[offset:offset + count * 8].cast(typecode)
+                if swap:
+                    view = array(typecode, view)
+                    view.byteswap()
+                views.append(view)
+                offset += count * 8
+            bucket.lows, bucket.highs, bucket.documents = views
+            bucket.width = entry["width"]
+            bucket.categories = set(entry["categories"])
+            index._buckets[key] = bucket
+        return index
+
+    def close(self) -> None:
+        """
+        Releases the file of a loaded index. The index can no longer be used
+        afterwards.
+        """
+        if self._mmap is not None:
+            self._buckets.clear()
+            try:
+                self._mmap.close()
+            except BufferError:
+                # Views on the file are still referenced elsewhere, the file
+                # is released with the last reference.
+                pass
+            self._mmap = None
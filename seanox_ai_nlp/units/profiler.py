@@ -0,0 +1,193 @@
+# seanox_ai_npl/units/profiler.py
+
+# DESIGN NOTE
+#
+# The profiler is a diagnostic tool for corpora on which units() is slow. It
+# shows which part of the unit pattern causes the costs, e.g. the numeric
+# locales, the informal units, the IEC or the SI prefixes, to guide changes of
+# the tables and the patterns.
+#
+# - The top-level alternatives of _UNIT_RAW_PATTERN and _NUMERIC_PATTERN are
+#   compiled separately, each with the same look-ahead/look-behind as in the
+#   unit pattern, and timed over the corpus. The time of an alternative alone
+#   is not its exact share of the combined pattern, because the regex engine
+#   tries the alternatives one after the other and stops at the first match,
+#   but hot alternatives are also hot in the combination.
+# - The matches of the complete unit pattern are attributed to the
+#   alternatives: each value and each unit of a compound expression is assigned
+#   to the first alternative that matches it completely, as the alternation
+#   does.
+# - Times are the best of several passes, as with timeit, so that outliers
+#   caused by other processes are not included.
+
+from __future__ import annotations
+
+from time import perf_counter
+from typing import Iterable, NamedTuple
+
+from seanox_ai_nlp.units.units import (
+    NumericLocale, UNIT_OPERATORS_PATTERN, _re_compile, _decompose_numeric, _get_unit_pattern,
+    _NUMERIC_LOCALES, _NUMERIC_LOOK_AHEAD_PATTERN, _UNIT_LOOK_AHEAD_PATTERN, _UNIT_LOOK_BEHIND_PATTERN,
+    _UNIT_SI_RAW_PATTERN, _UNIT_INFORMAL_RAW_PATTERN, _UNIT_IEC_RAW_PATTERN, _UNIT_COMMON_RAW_PATTERN
+)
+
+import re
+
+# Top-level alternatives of _UNIT_RAW_PATTERN in the order of the alternation
+_PROFILER_UNIT_ALTERNATIVES = {
+    "unit.si": _UNIT_SI_RAW_PATTERN,
+    "unit.informal": _UNIT_INFORMAL_RAW_PATTERN,
+    "unit.iec": _UNIT_IEC_RAW_PATTERN,
+    "unit.common": _UNIT_COMMON_RAW_PATTERN
+}
+
+
+class PatternProfile(NamedTuple):
+    """
+    Represents the costs of a top-level alternative of the unit pattern.
+
+    Attributes:
+        name (str): Name of the alternative, e.g. unit.si or numeric.DE
+        pattern (str): Regular expression of the alternative
+        time (float): Time in seconds of a scan of the corpus with the
+            alternative alone.
+        share (float): Share of the time in the time of all alternatives
+        matches (int): Number of matches of the alternative alone
+        attributed (int): Number of values and units in the matches of the
+            unit pattern that are assigned to the alternative.
+    """
+    name: str
+    pattern: str
+    time: float
+    share: float
+    matches: int
+    attributed: int
+
+
+class UnitsProfile(NamedTuple):
+    """
+    Represents the result of profile_units().
+
+    Attributes:
+        time (float): Time in seconds of a scan of the corpus with the unit
+            pattern.
+        matches (int): Number of matches of the unit pattern, including units
+            that are rejected by the validation of units().
+        alternatives (tuple[PatternProfile, ...]): Alternatives sorted by time,
+            the most expensive first.
+    """
+    time: float
+    matches: int
+    alternatives: tuple[PatternProfile, ...]
+
+
+def _time_scan(pattern: re.Pattern, texts: list[str], repeat: int) -> tuple[float, int]:
+    best = None
+    for _ in range(repeat):
+        count = 0
+        start = perf_counter()
+        for text in texts:
+            for _ in pattern.finditer(text):
+                count += 1
+        time = perf_counter() - start
+        best = time if best is None else min(best, time)
+    return best, count
+
+
+def _create_attribution_pattern(alternatives: dict[str, str]) -> re.Pattern:
+    # Each alternative as a numbered named group, the last group of a complete
+    # match is the first alternative that matches, as in the alternation.
+    expressions = (f"(?P<_{index}>{expression})" for index, expression in enumerate(alternatives.values()))
+    return _re_compile("|".join(expressions))
+
+
+def _attribute(pattern: re.Pattern, string: str, names: list[str], counts: dict[str, int]) -> None:
+    match = pattern.fullmatch(string)
+    if match:
+        counts[names[int(match.lastgroup[1:])]] += 1
+
+
+def profile_units(
+        texts: Iterable[str],
+        locales: Iterable[NumericLocale] = None,
+        repeat: int = 3
+) -> UnitsProfile:
+    """
+    Measures the costs of the top-level alternatives of the unit pattern (SI,
+    informal, IEC and common units) and of the numeric pattern (one per
+    locale) over a sample corpus, to find out which of them make units() slow.
+
+    Args:
+        texts (Iterable[str]): Sample corpus
+        locales (Iterable[NumericLocale], optional): Restricts the numeric
+            formats to the given locales as with units().
+        repeat (int, optional): Number of passes, the best time is used.
+            Default is 3.
+
+    Returns:
+        UnitsProfile: Time and matches of the unit pattern and the profiles of
+            the alternatives, the most expensive first.
+
+    Raises:
+        ValueError: If locales is empty or repeat is less than 1.
+    """
+    if repeat < 1:
+        raise ValueError("repeat must be at least 1")
+    texts = [text for text in texts if text]
+    locales = None if locales is None else frozenset(locales)
+    pattern = _get_unit_pattern(locales)
+    locales = _NUMERIC_LOCALES if locales is None else locales
+
+    numeric_alternatives = {
+        f"numeric.{locale.name}": locale.value for locale in NumericLocale if locale in locales
+    }
+    alternatives = {
+        **{
+            name: rf"{_UNIT_LOOK_AHEAD_PATTERN}{expression}{_UNIT_LOOK_BEHIND_PATTERN}"
+            for name, expression in _PROFILER_UNIT_ALTERNATIVES.items()
+        },
+        **{
+            name: rf"{_NUMERIC_LOOK_AHEAD_PATTERN}{expression}"
+            for name, expression in numeric_alternatives.items()
+        }
+    }
+
+    time, matches = _time_scan(pattern, texts, repeat)
+
+    unit_names = list(_PROFILER_UNIT_ALTERNATIVES)
+    unit_pattern = _create_attribution_pattern(_PROFILER_UNIT_ALTERNATIVES)
+    numeric_names = list(numeric_alternatives)
+    numeric_pattern = _create_attribution_pattern(numeric_alternatives)
+    attributed = dict.fromkeys(alternatives, 0)
+    for text in texts:
+        for match in pattern.finditer(text):
+            value = match.group("unit_value_numeric")
+            if value:
+                for numeric in _decompose_numeric(value).values:
+                    _attribute(numeric_pattern, numeric, numeric_names, attributed)
+            unit = match.group("unit_value_unit") or match.group("unit_unit")
+            for factor in UNIT_OPERATORS_PATTERN.split(unit):
+                _attribute(unit_pattern, factor, unit_names, attributed)
+
+    profiles = []
+    for name, expression in alternatives.items():
+        expression = _re_compile(expression, debug=True)
+        profiles.append((name, expression, *_time_scan(re.compile(expression), texts, repeat)))
+    total = sum(profile[2] for profile in profiles) or 1.0
+
+    return UnitsProfile(
+        time=time,
+        matches=matches,
+        alternatives=tuple(
+            PatternProfile(
+                name=name,
+                pattern=expression,
+                time=alternative_time,
+                share=alternative_time / total,
+                matches=alternative_matches,
+                attributed=attributed[name]
+            )
+            for name, expression, alternative_time, alternative_matches
+            in sorted(profiles, key=lambda profile: profile[2], reverse=True)
+        )
+    )
@@ -0,0 +1,266 @@
+# seanox_ai_npl/units/scanner.py
+
+# DESIGN NOTE
+#
+# The scanner is intended for texts that are searched with units() and further
+# domain-specific patterns, e.g. part numbers, norms (DIN EN 60529) or IP
+# ratings (IP67), which would otherwise each require a separate scan.
+#
+# - All patterns are combined into one alternation of named groups, one group
+#   per pattern, and the units pattern as the last alternative. The text is
+#   scanned once, the name of the outer group (Match.lastgroup) determines the
+#   pattern of a match without further searching.
+# - As with a single pattern, matches do not overlap. At a position, the
+#   patterns are tried in the order of registration and the units last, so that
+#   more specific domain patterns take precedence over units.
+# - Numbered groups and backreferences of the patterns are shifted by the
+#   combination, only named groups can be used within the patterns. Patterns
+#   with numbered groups or numbered backreferences are rejected.
+
+from __future__ import annotations
+
+from typing import Any, Callable, Iterable, NamedTuple, Optional, Union
+
+from seanox_ai_nlp.units.units import (
+    Unit, NumericLocale, _create_unit, _get_ambiguous_units_for, _get_unit_pattern
+)
+
+import re
+import threading
+
+# Name of the group of the units pattern in the combined pattern
+_SCANNER_UNITS_GROUP = "_units"
+
+_SCANNER_FLAGS = {
+    re.ASCII: "a",
+    re.IGNORECASE: "i",
+    re.MULTILINE: "m",
+    re.DOTALL: "s",
+    re.VERBOSE: "x"
+}
+
+
+_OCTAL_DIGITS = "01234567"
+
+
+def _re_numbered_references(expression: str) -> bool:
+
+    # Numbered backreferences (\1) and conditions ((?(1)...)) outside of
+    # character classes. In character classes, \1 is an octal escape, as are
+    # \0 and escapes with three octal digits (\101) outside of them.
+
+    index = 0
+    brackets = False
+    while index < len(expression):
+        char = expression[index]
+        if char == "\\":
+            escape = expression[index + 1:index + 4]
+            if (not brackets and escape[:1] in "123456789" and escape[:1]
+                    and not (len(escape) == 3 and all(digit in _OCTAL_DIGITS for digit in escape))):
+                return True
+            index += 2
+            continue
+        if brackets:
+            brackets = char != "]"
+        elif char == "[":
+            brackets = True
+            # A ] directly after [ or [^ is a literal
+            if expression.startswith("^", index + 1):
+                index += 1
+            if expression.startswith("]", index + 1):
+                index += 1
+        elif expression.startswith("(?(", index) and expression[index + 3:index + 4].isdigit():
+            return True
+        index += 1
+    return False
+
+
+class ScannerMatch(NamedTuple):
+    """
+    Represents a match of a pattern registered with Scanner.register().
+
+    Attributes:
+        label (str): Name of the pattern
+        start (int): Start index of the match in the text.
+        end (int): End index of the match in the text.
+        text (str): Text of the match
+        groups (dict[str, Optional[str]]): Named groups of the pattern
+    """
+    label: str
+    start: int
+    end: int
+    text: str
+    groups: dict[str, Optional[str]]
+
+
+def _re_scoped(pattern: Union[str, re.Pattern]) -> str:
+    if isinstance(pattern, str):
+        return pattern
+    if not isinstance(pattern.pattern, str):
+        raise ValueError("Only patterns for str are supported")
+    flags = "".join(letter for flag, letter in _SCANNER_FLAGS.items() if pattern.flags & flag)
+    if pattern.flags & re.LOCALE:
+        raise ValueError("Flag LOCALE is not supported")
+    if not flags:
+        return pattern.pattern
+    # With VERBOSE, a comment at the end must not include the closing bracket.
+    return f"(?{flags}:{pattern.pattern}\n)" if "x" in flags else f"(?{flags}:{pattern.pattern})"
+
+
+class Scanner:
+    """
+    Extracts units and matches of further named patterns in one scan of the
+    text, instead of one scan per pattern.
+
+    The patterns are combined into a single compiled pattern. At a position,
+    the patterns are tried in the order of registration and the units last,
+    matches do not overlap. Patterns can only use named groups, because
+    numbered groups are shifted by the combination, patterns with numbered
+    groups or backreferences are rejected.
+
+    Registration is not intended during scans in other threads, scans with a
+    registered set of patterns are thread-safe.
+
+    Example:
+        scanner = Scanner()
+        scanner.register("NORM", r"\\b(?:DIN|EN|ISO)(?:\\s(?:EN|ISO))*\\s\\d+\\b")
+        scanner.register("IP", r"\\bIP(?P<code>\\d[\\dX])\\b")
+        scanner.scan("Protection IP67 according to DIN EN 60529, 12 V")
+        returns: [ScannerMatch(label='IP', ...), ScannerMatch(label='NORM', ...), Unit(label='MEASURE', ...)]
+    """
+
+    def __init__(
+            self,
+            locales: Iterable[NumericLocale] = None,
+            languages: Iterable[str] = None,
+            units: bool = True,
+            names: bool = False
+    ) -> None:
+        """
+        Args:
+            locales (Iterable[NumericLocale], optional): Restricts the numeric
+                formats of the units to the given locales.
+            languages (Iterable[str], optional): Suppresses units without value
+                that are ambiguous with common words in these languages.
+            units (bool, optional): Extracts units as with units(), default
+                True. With False, only the registered patterns are used.
+            names (bool, optional): Also extracts spelled-out names of units
+                as with units().
+        """
+        self._units_pattern = _get_unit_pattern(locales, names)
+        self._units_ambiguous = _get_ambiguous_units_for(languages)
+        self._units = units
+        # Combined pattern and registered patterns are replaced together, so
+        # that running scans keep a consistent state during a registration.
+        self._state: tuple[Optional[re.Pattern], dict[str, tuple]] = (self._compile({}), {})
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._state[1])
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._state[1]
+
+    def register(
+            self,
+            name: str,
+            pattern: Union[str, re.Pattern],
+            function: Callable[[re.Match], Any] = None
+    ) -> Scanner:
+        """
+        Registers a named pattern. The name is the label of the matches and
+        must be a valid identifier that is not used by any group of the other
+        patterns.
+
+        Args:
+            name (str): Name of the pattern
+            pattern (str | re.Pattern): Regular expression, flags of compiled
+                patterns (IGNORECASE, MULTILINE, DOTALL, VERBOSE, ASCII) are
+                only applied to this pattern.
+            function (Callable[[re.Match], Any], optional): Creates the result
+                for a match, None skips the match. The match is a match of the
+                combined pattern, named groups of the pattern are available.
+                Default is ScannerMatch.
+
+        Returns:
+            Scanner: The scanner itself for chaining
+
+        Raises:
+            ValueError: If the name is invalid or already registered, or the
+                pattern is invalid, uses numbered groups or backreferences or
+                cannot be combined.
+        """
+        if not isinstance(name, str) or not name.isidentifier() or name.startswith("_"):
+            raise ValueError(f"Invalid name: {name}")
+        if name in self._state[1]:
+            raise ValueError(f"Name already registered: {name}")
+        expression = _re_scoped(pattern)
+        try:
+            compiled = re.compile(expression)
+        except re.error as exception:
+            raise ValueError(f"Invalid pattern for {name}: {exception}") from exception
+        # Numbered groups and backreferences would be shifted by the outer
+        # groups of the combined pattern.
+        if compiled.groups != len(compiled.groupindex):
+            raise ValueError(f"Numbered groups are not supported for {name}, use named groups")
+        if _re_numbered_references(expression):
+            raise ValueError(f"Numbered backreferences are not supported for {name}, use (?P=name)")
+        groups = tuple(compiled.groupindex)
+        with self._lock:
+            patterns = dict(self._state[1])
+            if name in patterns:
+                raise ValueError(f"Name already registered: {name}")
+            patterns[name] = (expression, groups, function)
+            self._state = (self._compile(patterns), patterns)
+        return self
+
+    def _compile(self, patterns: dict) -> Optional[re.Pattern]:
+        expressions = [f"(?P<{name}>{expression})" for name, (expression, _, _) in patterns.items()]
+        if self._units:
+            expressions.append(f"(?P<{_SCANNER_UNITS_GROUP}>{self._units_pattern.pattern})")
+        if not expressions:
+            return None
+        try:
+            return re.compile("|".join(expressions))
+        except re.error as exception:
+            raise ValueError(f"Patterns cannot be combined: {exception}") from exception
+
+    def scan(self, text: str) -> list[Union[Unit, ScannerMatch, Any]]:
+        """
+        Scans the text once for units and all registered patterns.
+
+        Args:
+            text (str): Input string to analyze.
+
+        Returns:
+            list[Unit | ScannerMatch | Any]: Units as with units(), matches of
+                the registered patterns as ScannerMatch or the result of their
+                function, in the order of the text.
+        """
+        pattern, patterns = self._state
+        if not text or pattern is None:
+            return []
+
+        ambiguous = self._units_ambiguous
+
+        entities = []
+        for match in pattern.finditer(text):
+            name = match.lastgroup
+            if name == _SCANNER_UNITS_GROUP:
+                entity = _create_unit(match, ambiguous)
+            else:
+                _, groups, function = patterns[name]
+                if function is not None:
+                    entity = function(match)
+                else:
+                    entity = ScannerMatch(
+                        label=name,
+                        start=match.start(),
+                        end=match.end(),
+                        text=match.group(),
+                        groups={group: match.group(group) for group in groups}
+                    )
+            if entity is not None:
+                entities.append(entity)
+
+        return entities
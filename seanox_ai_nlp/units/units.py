@@ -21,16 +21,35 @@
 # - However, this approach ensures high-speed recognition and classification of
 #   units in NLP pipelines, especially when processing large volumes of text.
 #
+# Concurrency:
+# - Patterns, tables and sets are created at import and only read afterwards,
+#   compiled patterns can be used by several threads at the same time.
+# - Caches that are used for each match (symbols, categories, context scores)
+#   are lock-free dicts (_Memo) instead of lru_cache, so that threads do not
+#   compete for the lock of the cache, which matters without GIL (Python 3.13
+#   free-threaded). Caches that are used once per call (locales, languages)
+#   and outside of units() remain lru_cache, which is also thread-safe.
+# - The few mutable structures (interned unit expressions, shared executor)
+#   are changed under a lock.
+# - With GIL, regular expressions do not run in parallel, threads only help
+#   with I/O. For CPU-bound extraction use processes (units_parquet) or a
+#   free-threaded build.
+#
 # Summary:
 # This module prioritizes performance and reliability over dynamic flexibility.
 # It is designed for production-grade NLP tasks where speed and consistency are
 # critical.
 
-from typing import Optional, NamedTuple
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Optional, NamedTuple, Callable, Any, Iterable
 from enum import Enum
-from functools import lru_cache
+from functools import lru_cache, partial
+from weakref import WeakKeyDictionary
 
+import asyncio
+import os
 import re
+import threading
 
 
 def _re_compile(expression: str, debug: bool = False) -> re.Pattern:
@@ -46,6 +65,18 @@ def _re_reverse_units(expression: str) -> str:
     return f"(?:{'|'.join(units)})"
 
 
+def _unescape_unicode(string: str) -> str:
+    return re.sub(r"\\u([0-9A-Fa-f]{4})", lambda match: chr(int(match.group(1), 16)), string)
+
+
+def _re_unescape_units(expression: str) -> set[str]:
+    units = set()
+    for unit in expression[3:-1].split("|"):
+        unit = _unescape_unicode(unit)
+        units.add(re.sub(r"\\(.)", r"\1", unit))
+    return units
+
+
 # Patterns generated from the Excel file
 _UNIT_SYMBOLS_PATTERN = r"(?:\'|\"|%|\u2032|\u2033|A|A|a|AE|Ah|atm|At\u00FC|AU|b|B|B|bar|baud|bbl|Bit|bps|Bq|Byte|C|cd|cd|ct|d|Da|dam|dB|db\(A\)|db\(C\)|db\(G\)|db\(Z\)|dpi|DPI|dpt|dz|dz|eV|F|FLOPS|fps|ft|g|g|gal|Gy|H|h|ha|hL|hl|hp|Hz|in|J|K|K|kat|kn|kt|kt|l|L|lb|lj|lm|ls|lx|m|m|mel|mi|mile|min|MIPS|mol|mol|mph|N|Np|\u00BA|\u00BAC|oz|oz.|oz\. tr\.|p|Pa|pc|PPI|ppi|PS|pt|px|rad|rm|RPM|s|s|S|sone|sr|St|Sv|t|T|tex|u|V|VA|Var|vCore|W|Wb|Wh|yd|Z|\u03C9|\u03A9)"
 _UNIT_SI_SYMBOLS_BASE_PATTERN = r"(?:A|cd|g|K|m|mol|s)"
@@ -105,29 +136,69 @@ _NUMERIC_ISO_PATTERN = r"(?:(?:(?:\d{1,3}(?:[\u00A0\u202F]\d{3})*)|\d+)(?:\.\d+)
 
 _NUMERIC_DIMENSIONAL_SEPARATORS_PATTERN = r"(?:[*+\-/:\^x\u00B1\u00D7\u00B7\u00F7\u2012\u2013\u2014\u2212])"
 
-_NUMERIC_PATTERN = rf"""
-    (?:
-      {_NUMERIC_DE_PATTERN}
-      |{_NUMERIC_EN_PATTERN}
-      |{_NUMERIC_CH_PATTERN}
-      |{_NUMERIC_FR_PATTERN}
-      |{_NUMERIC_IN_PATTERN}
-      |{_NUMERIC_ISO_PATTERN}
-    )
-"""
 
-_NUMERIC_EXPRESSION_PATTERN = rf"""
-    (?:
-      {_NUMERIC_SIGN_PATTERN}?
-      {_NUMERIC_PATTERN}
-      (?:
-        \s*
-        {_NUMERIC_DIMENSIONAL_SEPARATORS_PATTERN}
-        \s*
-        {_NUMERIC_PATTERN}
-      )*
-    )
-"""
+class NumericLocale(Enum):
+    """
+    Specifies the locale-specific formats of numeric values. By default, all
+    formats are recognized, restricting them to the locales of a corpus reduces
+    the effort and ambiguity of the numeric patterns.
+
+    Locales:
+    - DE: 1.000.000,00
+    - EN: 1,000,000.00
+    - CH: 1’000’000,00
+    - FR: 1 000 000,00
+    - IN: 1,00,000.00
+    - ISO: 1 000 000.00 (with narrow or non-breaking space)
+
+    Plain numbers such as 1000000,00 and 1000000.00 are covered by the locales
+    with the corresponding decimal separator.
+    """
+    DE = _NUMERIC_DE_PATTERN
+    EN = _NUMERIC_EN_PATTERN
+    CH = _NUMERIC_CH_PATTERN
+    FR = _NUMERIC_FR_PATTERN
+    IN = _NUMERIC_IN_PATTERN
+    ISO = _NUMERIC_ISO_PATTERN
+
+
+_NUMERIC_LOCALE_DECIMAL_SEPARATORS = {
+    NumericLocale.DE: ",",
+    NumericLocale.EN: ".",
+    NumericLocale.CH: ",",
+    NumericLocale.FR: ",",
+    NumericLocale.IN: ".",
+    NumericLocale.ISO: "."
+}
+
+
+def _create_numeric_pattern(locales: frozenset[NumericLocale]) -> str:
+    # The order of the alternatives is always the same as in NumericLocale.
+    return rf"""
+        (?:
+          {"|".join(locale.value for locale in NumericLocale if locale in locales)}
+        )
+    """
+
+
+def _create_numeric_expression_pattern(numeric_pattern: str) -> str:
+    return rf"""
+        (?:
+          {_NUMERIC_SIGN_PATTERN}?
+          {numeric_pattern}
+          (?:
+            \s*
+            {_NUMERIC_DIMENSIONAL_SEPARATORS_PATTERN}
+            \s*
+            {numeric_pattern}
+          )*
+        )
+    """
+
+
+_NUMERIC_LOCALES = frozenset(NumericLocale)
+_NUMERIC_PATTERN = _create_numeric_pattern(_NUMERIC_LOCALES)
+_NUMERIC_EXPRESSION_PATTERN = _create_numeric_expression_pattern(_NUMERIC_PATTERN)
 
 # RegEx for numerical values in various formats.
 NUMERIC_PATTERN = _re_compile(_NUMERIC_EXPRESSION_PATTERN)
@@ -216,25 +287,109 @@ _UNIT_EXPRESSION_RAW_PATTERN = rf"""
     )
 """
 
-_UNIT_VALUE_PATTERN = rf"""
-    {_NUMERIC_LOOK_AHEAD_PATTERN}
-    (?P<unit_value_numeric>{_NUMERIC_EXPRESSION_PATTERN})
-    \s*
-    (?P<unit_value_unit>{_UNIT_EXPRESSION_RAW_PATTERN})
-    {_UNIT_LOOK_BEHIND_PATTERN}
-"""
 
-_UNIT_PATTERN = rf"""
-    {_UNIT_LOOK_AHEAD_PATTERN}
-    (?P<unit_unit>{_UNIT_EXPRESSION_RAW_PATTERN})
-    {_UNIT_LOOK_BEHIND_PATTERN}
-"""
+def _create_unit_pattern(numeric_expression_pattern: str, names: bool = False) -> str:
+    if not names:
+        return rf"""
+            {_NUMERIC_LOOK_AHEAD_PATTERN}
+            (?P<unit_value_numeric>{numeric_expression_pattern})
+            \s*
+            (?P<unit_value_unit>{_UNIT_EXPRESSION_RAW_PATTERN})
+            {_UNIT_LOOK_BEHIND_PATTERN}
+            |{_UNIT_LOOK_AHEAD_PATTERN}
+            (?P<unit_unit>{_UNIT_EXPRESSION_RAW_PATTERN})
+            {_UNIT_LOOK_BEHIND_PATTERN}
+        """
+
+    # Variant with spelled-out names of units as further alternatives. Names
+    # take precedence over symbols that are only a part of the word (Grad as
+    # G + rad), but like symbols, they must not be followed by an operator, so
+    # that compound symbols (5 Bit/s) remain complete.
+    names_pattern, names_unambiguous_pattern = _get_unit_names_patterns()
+    return rf"""
+        {_NUMERIC_LOOK_AHEAD_PATTERN}
+        (?P<unit_value_numeric>{numeric_expression_pattern})
+        \s*
+        (?:
+          (?P<unit_value_name>{names_pattern})
+          {_UNIT_LOOK_BEHIND_PATTERN}
+          |(?P<unit_value_unit>{_UNIT_EXPRESSION_RAW_PATTERN})
+          {_UNIT_LOOK_BEHIND_PATTERN}
+        )
+        |{_UNIT_NAMES_LOOK_AHEAD_PATTERN}
+        (?P<unit_name>{names_unambiguous_pattern})
+        {_UNIT_LOOK_BEHIND_PATTERN}
+        |{_UNIT_LOOK_AHEAD_PATTERN}
+        (?P<unit_unit>{_UNIT_EXPRESSION_RAW_PATTERN})
+        {_UNIT_LOOK_BEHIND_PATTERN}
+    """
+
 
 # RegEx for detecting measured values and units
-UNIT_PATTERN = _re_compile(rf"""
-    {_UNIT_VALUE_PATTERN}
-    |{_UNIT_PATTERN}
-""")
+UNIT_PATTERN = _re_compile(_create_unit_pattern(_NUMERIC_EXPRESSION_PATTERN))
+
+
+class NumericPatterns(NamedTuple):
+    """
+    Variants of the numeric patterns restricted to a set of locales.
+
+    Attributes:
+        numeric (re.Pattern): Variant of NUMERIC_PATTERN
+        numeric_validation (re.Pattern): Variant of NUMERIC_VALIDATION_PATTERN
+        numeric_expression_validation (re.Pattern): Variant of
+            NUMERIC_EXPRESSION_VALIDATION_PATTERN
+        unit (re.Pattern): Variant of UNIT_PATTERN
+    """
+    numeric: re.Pattern
+    numeric_validation: re.Pattern
+    numeric_expression_validation: re.Pattern
+    unit: re.Pattern
+
+
+_NUMERIC_PATTERNS = NumericPatterns(
+    numeric=NUMERIC_PATTERN,
+    numeric_validation=NUMERIC_VALIDATION_PATTERN,
+    numeric_expression_validation=NUMERIC_EXPRESSION_VALIDATION_PATTERN,
+    unit=UNIT_PATTERN
+)
+
+
+@lru_cache(maxsize=64)
+def _get_numeric_patterns(locales: frozenset[NumericLocale]) -> NumericPatterns:
+    if locales == _NUMERIC_LOCALES:
+        return _NUMERIC_PATTERNS
+    numeric_pattern = _create_numeric_pattern(locales)
+    numeric_expression_pattern = _create_numeric_expression_pattern(numeric_pattern)
+    return NumericPatterns(
+        numeric=_re_compile(numeric_expression_pattern),
+        numeric_validation=_re_compile(rf"^{numeric_pattern}$"),
+        numeric_expression_validation=_re_compile(rf"^{numeric_expression_pattern}$"),
+        unit=_re_compile(_create_unit_pattern(numeric_expression_pattern))
+    )
+
+
+def numeric_patterns(locales: Iterable[NumericLocale] = None) -> NumericPatterns:
+    """
+    Returns the numeric patterns and the unit pattern restricted to the given
+    locales. The variants are compiled once per set of locales and cached.
+
+    Args:
+        locales (Iterable[NumericLocale], optional): Locales of the numeric
+            formats. Default is all locales.
+
+    Returns:
+        NumericPatterns: Compiled pattern variants
+
+    Raises:
+        ValueError: If the set of locales is empty.
+    """
+    if locales is None:
+        return _NUMERIC_PATTERNS
+    locales = frozenset(locales)
+    if not locales:
+        raise ValueError("At least one locale is required")
+    return _get_numeric_patterns(locales)
+
 
 _UNIT_WITH_INVALID_SPACES_NUMERIC_PATTERN = _re_compile(rf"""
     (?<=\d)(\s{{2,}})?
@@ -378,22 +533,36 @@ _UNIT_IEC_CLASSIFICATION_PATTERN = rf"""
 # RegEx for classification with OR linked named groups.
 UNIT_CLASSIFICATION_PATTERN = UNIT_SYMBOLS_PATTERN
 
-def _dict_from_comma_separated_pairs(data: str) -> dict[str, list[str]]:
-    result = {}
+def _pairs_from_comma_separated_pairs(data: str) -> list[tuple[str, list[str]]]:
+    result = []
     data = re.sub(r"\s*\|\s*[\r\n]\s*", "", data.strip())
     items = re.split(r"\s*\|\s*", data)
     for item in range(1, len(items) - 1, 2):
-        key = items[item].strip()
+        key = _unescape_unicode(items[item].strip())
         value = items[item + 1].strip()
         if key and value:
-            result.setdefault(key, []).extend(value.split())
+            result.append((key, value.split()))
     return result
 
 
+def _dict_from_comma_separated_pairs(data: str) -> dict[str, list[str]]:
+    result = {}
+    for key, values in _pairs_from_comma_separated_pairs(data):
+        result.setdefault(key, []).extend(values)
+    return result
+
+
+def _meanings_from_comma_separated_pairs(data: str) -> dict[str, tuple[tuple[str, ...], ...]]:
+    result = {}
+    for key, values in _pairs_from_comma_separated_pairs(data):
+        result.setdefault(key, []).append(tuple(values))
+    return {key: tuple(meanings) for key, meanings in result.items() if len(meanings) > 1}
+
+
 # For better maintainability and error analysis, a proprietary inline format
 # that is not CSV is deliberately used, as it is only used internally and the
 # format is fully controlled.
-_UNIT_CLASSIFICATION_DICT = _dict_from_comma_separated_pairs(r"""
+_UNIT_CLASSIFICATION_DATA = r"""
 | '         | length                        | d         | time                          | hl        | volume                        | N         | force                         | T         | magnetic field                |
 | "         | length                        | Da        | mass atomic                   | hp        | power                         | Np        | acoustics                     | tex       | mass                          |
 | %         | ratio                         | dam       | length                        | Hz        | frequency                     | \u00BA    | angle                         | u         | mass atomic                   |
@@ -419,8 +588,89 @@ _UNIT_CLASSIFICATION_DICT = _dict_from_comma_separated_pairs(r"""
 | C         | electricity                   | h         | time                          | MIPS      | it processing time            | St        | volume                        |           |                               |
 | cd        | light                         | ha        | area                          | mol       | amount                        | Sv        | radiation                     |           |                               |
 | ct        | mass                          | hL        | volume                        | mph       | length time                   | t         | mass                          |           |                               |
+"""
+
+_UNIT_CLASSIFICATION_DICT = _dict_from_comma_separated_pairs(_UNIT_CLASSIFICATION_DATA)
+
+# Meanings of symbols that are not part of the classification and are only
+# assigned by cues in the context, e.g. dz as Double Hundredweight (mass), which
+# the classification only knows as quantity.
+_UNIT_CONTEXT_MEANINGS_DATA = r"""
+| dz        | mass                          |
+"""
+
+# Symbols with several meanings (e.g. B for Bel and Byte, kt for Karat and Knot)
+# and the categories of each meaning.
+_UNIT_CLASSIFICATION_MEANINGS_DICT = _meanings_from_comma_separated_pairs(
+    _UNIT_CLASSIFICATION_DATA + _UNIT_CONTEXT_MEANINGS_DATA
+)
+
+# Words in the context of a unit (lower case) that indicate the meaning of
+# ambiguous symbols, the categories are compared with those of the meanings.
+_UNIT_CONTEXT_CUES_DICT = _dict_from_comma_separated_pairs(r"""
+| acoustic        | acoustics   | dutzend         | quantity    | hdd             | it storage  | ship            | speed       |
+| aircraft        | speed       | dämpfung        | acoustics   | kartoffeln      | mass        | sound           | acoustics   |
+| akustik         | acoustics   | eggs            | quantity    | lautstärke      | acoustics   | speed           | speed       |
+| amplifier       | acoustics   | eier            | quantity    | loud            | acoustics   | speicher        | it storage  |
+| arbeitsspeicher | it storage  | emissionen      | mass        | loudness        | acoustics   | sprengkraft     | mass        |
+| attenuation     | acoustics   | emissions       | mass        | lärm            | acoustics   | ssd             | it storage  |
+| boat            | speed       | ernte           | mass        | memory          | it storage  | storage         | it storage  |
+| bomb            | mass        | explosive       | mass        | noise           | acoustics   | stück           | quantity    |
+| bombe           | mass        | festplatte      | it storage  | nuclear         | mass        | tnt             | mass        |
+| boot            | speed       | file            | it storage  | pegel           | acoustics   | upload          | it storage  |
+| böen            | speed       | files           | it storage  | pieces          | quantity    | verstärker      | acoustics   |
+| cache           | it storage  | flugzeug        | speed       | ram             | it storage  | vessel          | speed       |
+| datei           | it storage  | geräusch        | acoustics   | rosen           | quantity    | weizen          | mass        |
+| dateien         | it storage  | geschwindigkeit | speed       | roses           | quantity    | wheat           | mass        |
+| disk            | it storage  | getreide        | mass        | schall          | acoustics   | wind            | speed       |
+| download        | it storage  | grain           | mass        | schalldruck     | acoustics   | winds           | speed       |
+| dozen           | quantity    | gusts           | speed       | schiff          | speed       | yield           | mass        |
+| drive           | it storage  | harvest         | mass        | segeln          | speed       |                 |             |
+""")
+
+# Characters before and after a unit in which the context cues are searched.
+_UNIT_CONTEXT_WINDOW = 48
+
+_UNIT_CONTEXT_PATTERN = re.compile(r"[^\W\d_]+")
+
+# Bare units (without value) that are also common words or word fragments
+# (contractions and elisions such as I'm, don't, l'eau) in the languages. They
+# are derived from the stop word lists of the languages and the fragments that
+# UNIT_PATTERN finds in ordinary text.
+_UNIT_AMBIGUOUS_DICT = _dict_from_comma_separated_pairs(r"""
+| '         | de en es fr it nl pt          | As        | en                            | m         | en fr                         |
+| "         | de en es fr it nl pt          | d         | en fr it                      | mi        | es it                         |
+| a         | de en es fr it pt             | ha        | es fr it                      | min       | nl                            |
+| A         | en                            | in        | de en it nl                   | s         | en fr                         |
+| ab        | de                            | In        | de en it nl                   | t         | en fr                         |
+| Ab        | de                            | l         | fr it                         | u         | es nl                         |
+| al        | es it nl                      | L         | fr it                         |           |                               |
+| am        | de en                         |           |                               |           |                               |
+| Am        | de                            |           |                               |           |                               |
+| as        | en fr pt                      |           |                               |           |                               |
 """)
 
+_UNIT_AMBIGUOUS_LANGUAGES = frozenset(
+    language for languages in _UNIT_AMBIGUOUS_DICT.values() for language in languages
+)
+
+
+@lru_cache(maxsize=64)
+def _get_ambiguous_units(languages: frozenset[str]) -> frozenset[str]:
+    unknown = languages - _UNIT_AMBIGUOUS_LANGUAGES
+    if unknown:
+        raise ValueError(f"Unsupported languages: {', '.join(sorted(unknown))}")
+    return frozenset(
+        unit for unit, unit_languages in _UNIT_AMBIGUOUS_DICT.items()
+        if not languages.isdisjoint(unit_languages)
+    )
+
+
+def _get_ambiguous_units_for(languages: Optional[Iterable[str]]) -> frozenset[str]:
+    if languages is None:
+        return frozenset()
+    return _get_ambiguous_units(frozenset(languages))
+
 
 class SpacingMode(Enum):
     """
@@ -478,22 +728,450 @@ class Unit(NamedTuple):
     value: Optional[str] = None
 
 
-@lru_cache(maxsize=256)
+class _Memo(dict):
+
+    # Memoization of a pure function with one (hashable) argument as a dict
+    # whose misses are computed by __missing__. Hits are a plain dict lookup
+    # without locks and list maintenance as with lru_cache, which scales with
+    # threads also without GIL. Concurrent misses of the same key compute the
+    # same value, so a race only costs time. There is no eviction, when the
+    # maximum size is reached, new values are computed but no longer stored.
+
+    __slots__ = ("_function", "_maxsize")
+
+    def __init__(self, function: Callable[[Any], Any], maxsize: int) -> None:
+        super().__init__()
+        self._function = function
+        self._maxsize = maxsize
+
+    def __missing__(self, key: Any) -> Any:
+        value = self._function(key)
+        if len(self) < self._maxsize:
+            self[key] = value
+        return value
+
+
+def _memoize(maxsize: int) -> Callable[[Callable[[Any], Any]], Callable[[Any], Any]]:
+    # The lookup is the bound __getitem__ of the dict, the memo is available
+    # via __self__, e.g. for clear() and len().
+    return lambda function: _Memo(function, maxsize).__getitem__
+
+
+@_memoize(maxsize=4096)
+def _get_symbols_for_unit(unit: str) -> tuple[str, ...]:
+    unit = UNIT_SYMBOLS_PATTERN.sub(r" \1 ", unit).strip()
+    return tuple(
+        UNIT_CLASSIFICATION_PATTERN.search(unitEntry).group(0)
+        for unitEntry in UNIT_OPERATORS_PATTERN.split(unit)
+    )
+
+
+@_memoize(maxsize=4096)
 def _get_categories_for_unit(unit: str) -> tuple[str, ...]:
     categories = set()
-    unit = UNIT_SYMBOLS_PATTERN.sub(r" \1 ", unit).strip()
-    for unitEntry in UNIT_OPERATORS_PATTERN.split(unit):
-        match = UNIT_CLASSIFICATION_PATTERN.search(unitEntry)
-        categories.update(_UNIT_CLASSIFICATION_DICT.get(match.group(0), []))
+    for symbol in _get_symbols_for_unit(unit):
+        categories.update(_UNIT_CLASSIFICATION_DICT.get(symbol, []))
+    return tuple(sorted(categories))
+
+
+@_memoize(maxsize=4096)
+def _is_ambiguous_unit(unit: str) -> bool:
+    return any(symbol in _UNIT_CLASSIFICATION_MEANINGS_DICT for symbol in _get_symbols_for_unit(unit))
+
+
+@_memoize(maxsize=4096)
+def _get_context_scores(key: tuple[str, str]) -> tuple[int, ...]:
+    symbol, cue = key
+    categories = _UNIT_CONTEXT_CUES_DICT[cue]
+    return tuple(
+        0 if meaning.isdisjoint(categories) else 1
+        for meaning in map(set, _UNIT_CLASSIFICATION_MEANINGS_DICT[symbol])
+    )
+
+
+def _get_context_cues(before: str, after: str) -> set[str]:
+    return {
+        word for word in map(str.lower, _UNIT_CONTEXT_PATTERN.findall(before + " " + after))
+        if word in _UNIT_CONTEXT_CUES_DICT
+    }
+
+
+def _get_categories_for_context(unit: str, cues: set[str]) -> tuple[str, ...]:
+
+    # Ambiguous symbols are reduced to the meanings with the most cues in the
+    # context. Without cues or with a tie, all meanings remain, as before.
+    # Without matching cues, only the classification applies, so that meanings
+    # which are only assigned by context are not added.
+
+    if not cues:
+        return _get_categories_for_unit(unit)
+
+    categories = set()
+    for symbol in _get_symbols_for_unit(unit):
+        meanings = _UNIT_CLASSIFICATION_MEANINGS_DICT.get(symbol)
+        if not meanings:
+            categories.update(_UNIT_CLASSIFICATION_DICT.get(symbol, []))
+            continue
+        scores = [0] * len(meanings)
+        for cue in cues:
+            for index, score in enumerate(_get_context_scores((symbol, cue))):
+                scores[index] += score
+        best = max(scores)
+        if not best:
+            categories.update(_UNIT_CLASSIFICATION_DICT.get(symbol, []))
+            continue
+        for meaning, score in zip(meanings, scores):
+            if score == best:
+                categories.update(meaning)
     return tuple(sorted(categories))
 
 
-def units(text: str) -> list[Unit]:
+def _get_categories_in_text(unit: str, text: str, start: int, end: int) -> tuple[str, ...]:
+    if not _is_ambiguous_unit(unit):
+        return _get_categories_for_unit(unit)
+    cues = _get_context_cues(text[max(0, start - _UNIT_CONTEXT_WINDOW):start], text[end:end + _UNIT_CONTEXT_WINDOW])
+    return _get_categories_for_context(unit, cues)
+
+
+def _create_unit_tokens() -> frozenset[str]:
+
+    # All valid single units as combinations of prefix, symbol and suffix,
+    # corresponding to the alternatives of _UNIT_VALIDATION_PATTERN.
+
+    si_prefixes_m = _re_unescape_units(_UNIT_SI_PREFIX_M_PATTERN)
+    si_prefixes_s = _re_unescape_units(_UNIT_SI_PREFIX_S_PATTERN)
+    si_suffixes = {minus + digit for minus in ("", "\u207B") for digit in "\u00B9\u00B2\u00B3"}
+    informal_prefixes = {"", "c", "q", "sq.", "sq. "}
+    informal_suffixes = {"", "2", "3"}
+    iec_prefixes = _re_unescape_units(_UNIT_IEC_PREFIX_PATTERN) | {""}
+
+    tokens = set()
+    tokens.update(
+        prefix + symbol + suffix
+        for prefix in si_prefixes_m | si_prefixes_s
+        for symbol in _re_unescape_units(_UNIT_SI_SYMBOLS_PREFIX_SUFFIX_PATTERN)
+        for suffix in si_suffixes
+    )
+    tokens.update(
+        prefix + symbol
+        for prefix in si_prefixes_m
+        for symbol in _re_unescape_units(_UNIT_SI_SYMBOLS_M_PREFIX_PATTERN)
+    )
+    tokens.update(
+        prefix + symbol
+        for prefix in si_prefixes_s
+        for symbol in _re_unescape_units(_UNIT_SI_SYMBOLS_S_PREFIX_PATTERN)
+    )
+    tokens.update(
+        symbol + suffix
+        for symbol in _re_unescape_units(_UNIT_SI_SYMBOLS_SUFFIX_PATTERN)
+        for suffix in si_suffixes
+    )
+    tokens.update(_re_unescape_units(_UNIT_SI_SYMBOLS_RELEVANT_PATTERN))
+    tokens.update(
+        prefix + symbol + suffix
+        for prefix in informal_prefixes
+        for symbol in _re_unescape_units(_UNIT_INFORMAL_SYMBOLS_PATTERN)
+        for suffix in informal_suffixes
+    )
+    tokens.update(prefix + symbol for prefix in iec_prefixes for symbol in _re_unescape_units(_UNIT_IEC_SYMBOLS_PATTERN))
+    tokens.update(_re_unescape_units(_UNIT_COMMON_SYMBOLS_PATTERN))
+
+    # Only tokens confirmed by the pattern, the set is just a shortcut.
+    return frozenset(token for token in tokens if UNIT_EXPRESSION_VALIDATION_PATTERN.match(token))
+
+
+# Valid single units for the validation without regular expression, compound
+# unit expressions (e.g. km/h) are validated with the pattern.
+_UNIT_TOKENS_SET = _create_unit_tokens()
+
+
+def _is_valid_unit(unit: str) -> bool:
+    return unit in _UNIT_TOKENS_SET or UNIT_EXPRESSION_VALIDATION_PATTERN.match(unit) is not None
+
+
+# Spelled-out names of units (lower case, _ for spaces) per language. Names of
+# SI units are combined with the names of the prefixes (kilo + meters), rates
+# (kilometers per hour) and powers (square meters) are generated.
+_UNIT_NAMES_SI_DICT = {
+    "en": _dict_from_comma_separated_pairs(r"""
+| A         | ampere amperes amp amps       | g         | gram grams gramme grammes     | N         | newton newtons                |
+| B         | byte bytes                    | Hz        | hertz                         | Pa        | pascal pascals                |
+| Bit       | bit bits                      | J         | joule joules                  | s         | second seconds                |
+| Bq        | becquerel becquerels          | l         | liter liters litre litres     | Sv        | sievert sieverts              |
+| C         | coulomb coulombs              | lm        | lumen lumens                  | T         | tesla teslas                  |
+| cd        | candela candelas              | lx        | lux                           | V         | volt volts                    |
+| eV        | electronvolt electronvolts    | m         | meter meters metre metres     | W         | watt watts                    |
+| F         | farad farads                  | mol       | mole moles                    | Wh        | watt_hour watt_hours          |
+| Ω         | ohm ohms                      |           |                               | Wh        | watt-hour watt-hours          |
+"""),
+    "de": _dict_from_comma_separated_pairs(r"""
+| A         | ampere                        | g         | gramm                         | N         | newton                        |
+| B         | byte bytes                    | Hz        | hertz                         | Pa        | pascal                        |
+| Bit       | bit bits                      | J         | joule                         | s         | sekunde sekunden              |
+| Bq        | becquerel                     | l         | liter litern                  | Sv        | sievert                       |
+| C         | coulomb                       | lm        | lumen                         | T         | tesla                         |
+| cd        | candela                       | lx        | lux                           | V         | volt                          |
+| eV        | elektronenvolt                | m         | meter metern                  | W         | watt                          |
+| F         | farad                         | mol       | mol                           | Wh        | wattstunde wattstunden        |
+| Ω         | ohm                           |           |                               |           |                               |
+""")
+}
+
+_UNIT_NAMES_COMMON_DICT = {
+    "en": _dict_from_comma_separated_pairs(r"""
+| %         | percent per_cent              | ft        | foot feet                     | lb        | pound pounds                  |
+| ºC        | degree_celsius                | gal       | gallon gallons                | mi        | mile miles                    |
+| ºC        | degrees_celsius               | h         | hour hours                    | min       | minute minutes                |
+| atm       | atmosphere atmospheres        | ha        | hectare hectares              | oz        | ounce ounces                  |
+| bar       | bar                           | in        | inch inches                   | t         | ton tons tonne tonnes         |
+| d         | day days                      | K         | kelvin                        | yd        | yard yards                    |
+| dB        | decibel decibels              | kn        | knot knots                    |           |                               |
+"""),
+    "de": _dict_from_comma_separated_pairs(r"""
+| %         | prozent                       | ft        | fuß fuss                      | lb        | pfund                         |
+| ºC        | grad_celsius                  | gal       | gallone gallonen              | mi        | meile meilen                  |
+| atm       | atmosphäre atmosphären        | h         | stunde stunden                | min       | minute minuten                |
+| bar       | bar                           | ha        | hektar                        | oz        | unze unzen                    |
+| d         | tage                          | in        | zoll                          | t         | tonne tonnen                  |
+| dB        | dezibel                       | K         | kelvin                        | km/h      | stundenkilometer              |
+|           |                               | kn        | knoten                        |           |                               |
+""")
+}
+
+_UNIT_NAMES_PREFIXES_DICT = {
+    "en": _dict_from_comma_separated_pairs(r"""
+| P         | peta                          | h         | hecto                         | m         | milli                         |
+| T         | tera                          | da        | deca deka                     | µ         | micro                         |
+| G         | giga                          | d         | deci                          | n         | nano                          |
+| M         | mega                          | c         | centi                         |           |                               |
+| k         | kilo                          |           |                               |           |                               |
+"""),
+    "de": _dict_from_comma_separated_pairs(r"""
+| P         | peta                          | h         | hekto                         | m         | milli                         |
+| T         | tera                          | da        | deka                          | µ         | mikro                         |
+| G         | giga                          | d         | dezi                          | n         | nano                          |
+| M         | mega                          | c         | zenti                         |           |                               |
+| k         | kilo                          |           |                               |           |                               |
+""")
+}
+
+_UNIT_NAMES_IEC_PREFIXES_DICT = _dict_from_comma_separated_pairs(r"""
+| Ki        | kibi                          | Gi        | gibi                          |           |                               |
+| Mi        | mebi                          | Ti        | tebi                          |           |                               |
+""")
+
+# Denominators of rates and the word that connects them with the numerator
+_UNIT_NAMES_RATES_DICT = {
+    "en": ("per", _dict_from_comma_separated_pairs(r"""
+| s         | second                        | h         | hour                          | d         | day                           |
+| min       | minute                        |           |                               |           |                               |
+""")),
+    "de": ("pro", _dict_from_comma_separated_pairs(r"""
+| s         | sekunde                       | h         | stunde                        | d         | tag                           |
+| min       | minute                        |           |                               |           |                               |
+"""))
+}
+
+# Words for square and cubic units of length (_ for a separate word)
+_UNIT_NAMES_POWERS_DICT = {
+    "en": ("square_", "cubic_"),
+    "de": ("quadrat", "kubik")
+}
+
+_UNIT_NAMES_LENGTH_SYMBOLS_SET = {"m", "mi", "ft", "yd", "in"}
+_UNIT_NAMES_RATE_SYMBOLS_SET = {"m", "l", "g", "t", "B", "Bit", "mi", "ft", "yd", "gal"}
+
+# Units of information only use multiples, because e.g. deci + byte would be
+# the symbol of decibel (dB).
+_UNIT_NAMES_IT_SYMBOLS_SET = {"B", "Bit"}
+_UNIT_NAMES_IT_PREFIXES_SET = {"k", "M", "G", "T", "P"}
+
+# Names that are also common words (a second time, a bit, a foot), they are
+# only used with a numeric value.
+_UNIT_NAMES_AMBIGUOUS_SET = {
+    "amp", "amps", "bar", "bit", "bits", "day", "days", "foot", "knot", "knots", "knoten",
+    "minute", "mole", "moles", "pfund", "pound", "pounds", "second", "ton", "tons", "yard", "zoll"
+}
+
+
+def _create_unit_names() -> dict[str, str]:
+
+    # All names with prefixes, powers and rates, mapped to the symbol, only
+    # valid units are used. If a name occurs more than once, the first wins.
+
+    names = {}
+
+    def add(name: str, symbol: str) -> None:
+        name = name.replace("_", " ")
+        if name not in names and _is_valid_unit(symbol):
+            names[name] = symbol
+
+    for language, table in _UNIT_NAMES_SI_DICT.items():
+
+        units = []
+        for symbol, symbol_names in table.items():
+            prefixes = _UNIT_NAMES_PREFIXES_DICT[language]
+            if symbol in _UNIT_NAMES_IT_SYMBOLS_SET:
+                prefixes = {prefix: prefixes[prefix] for prefix in _UNIT_NAMES_IT_PREFIXES_SET}
+                prefixes.update(_UNIT_NAMES_IEC_PREFIXES_DICT)
+            prefixes = {"": [""], **prefixes}
+            units.extend(
+                (prefix_name + name, prefix, symbol)
+                for prefix, prefix_names in prefixes.items()
+                for prefix_name in prefix_names
+                for name in symbol_names
+            )
+        for symbol, symbol_names in _UNIT_NAMES_COMMON_DICT[language].items():
+            units.extend((name, "", symbol) for name in symbol_names)
+
+        square, cubic = _UNIT_NAMES_POWERS_DICT[language]
+        connector, denominators = _UNIT_NAMES_RATES_DICT[language]
+        for name, prefix, symbol in units:
+            add(name, prefix + symbol)
+            if symbol in _UNIT_NAMES_LENGTH_SYMBOLS_SET:
+                for power, suffixes in ((square, ("²", "2")), (cubic, ("³", "3"))):
+                    for suffix in suffixes:
+                        add(power + name, prefix + symbol + suffix)
+            if symbol in _UNIT_NAMES_RATE_SYMBOLS_SET:
+                for denominator, denominator_names in denominators.items():
+                    for denominator_name in denominator_names:
+                        add(f"{name}_{connector}_{denominator_name}", f"{prefix}{symbol}/{denominator}")
+
+    return names
+
+
+def _re_trie(words: Iterable[str]) -> str:
+
+    # Alternation of words as a trie, so that common prefixes are only matched
+    # once and the pattern does not try each word separately. Spaces in words
+    # match any whitespace.
+
+    trie = {}
+    for word in words:
+        node = trie
+        for character in word:
+            node = node.setdefault(character, {})
+        node[""] = {}
+
+    def create(node: dict) -> str:
+        alternatives = [
+            (r"\s+" if character == " " else re.escape(character)) + create(child)
+            for character, child in sorted(node.items()) if character
+        ]
+        if not alternatives:
+            return ""
+        if "" not in node and len(alternatives) == 1:
+            return alternatives[0]
+        return f"(?:{'|'.join(alternatives)}){'?' if '' in node else ''}"
+
+    return create(trie)
+
+
+# Names of units and their symbols
+_UNIT_NAMES_DICT = _create_unit_names()
+
+_UNIT_NAMES_LOOK_AHEAD_PATTERN = r"(?<!\w)"
+
+
+@lru_cache(maxsize=1)
+def _get_unit_names_patterns() -> tuple[str, str]:
+    # Created on first use, the names are optional. The second pattern is for
+    # names without numeric value and omits the ambiguous names.
+    return (
+        rf"(?i:{_re_trie(_UNIT_NAMES_DICT)})",
+        rf"(?i:{_re_trie(set(_UNIT_NAMES_DICT) - _UNIT_NAMES_AMBIGUOUS_SET)})"
+    )
+
+
+@lru_cache(maxsize=64)
+def _get_unit_names_pattern(locales: frozenset[NumericLocale]) -> re.Pattern:
+    numeric_expression_pattern = _create_numeric_expression_pattern(_create_numeric_pattern(locales))
+    return _re_compile(_create_unit_pattern(numeric_expression_pattern, names=True))
+
+
+def _get_unit_pattern(locales: Optional[Iterable[NumericLocale]], names: bool = False) -> re.Pattern:
+    if not names:
+        return numeric_patterns(locales).unit if locales is not None else UNIT_PATTERN
+    if locales is None:
+        return _get_unit_names_pattern(_NUMERIC_LOCALES)
+    locales = frozenset(locales)
+    if not locales:
+        raise ValueError("At least one locale is required")
+    return _get_unit_names_pattern(locales)
+
+
+def _get_unit_for_name(name: str) -> str:
+    name = " ".join(name.split())
+    unit = _UNIT_NAMES_DICT.get(name.lower())
+    if unit is not None:
+        return unit
+    # The names are matched case-insensitively, re also knows case variants
+    # that lower() does not map, e.g. ſ for s or İ for i.
+    for key, unit in _UNIT_NAMES_DICT.items():
+        if len(key) == len(name) and re.fullmatch(re.escape(key), name, re.IGNORECASE):
+            return unit
+    raise KeyError(name)
+
+
+def _create_unit(match: re.Match, ambiguous: frozenset[str] = frozenset()) -> Optional[Unit]:
+
+    groups = match.groupdict()
+    numeric = groups.get("unit_value_numeric")
+    name = groups.get("unit_value_name") or groups.get("unit_name")
+
+    if name:
+        # Names are mapped to valid symbols, ambiguous names are only
+        # matched with a numeric value.
+        unit = _get_unit_for_name(name)
+    else:
+        unit = groups.get("unit_value_unit") or groups.get("unit_unit")
+        if not numeric and unit in ambiguous:
+            return None
+        if not _is_valid_unit(unit):
+            return None
+
+    categories = _get_categories_in_text(unit, match.string, match.start(), match.end())
+    if numeric:
+        return Unit(
+            label="MEASURE",
+            start=match.start(),
+            end=match.end(),
+            text=match.group(),
+            unit=unit,
+            value=numeric,
+            categories=categories
+        )
+    return Unit(
+        label="UNIT",
+        start=match.start(),
+        end=match.end(),
+        text=match.group(),
+        unit=unit,
+        categories=categories
+    )
+
+
+def units(
+        text: str,
+        locales: Iterable[NumericLocale] = None,
+        languages: Iterable[str] = None,
+        names: bool = False
+) -> list[Unit]:
     """
     Extracts valid unit expressions and associated numeric values from a given text.
 
     Args:
         text (str): Input string to analyze.
+        locales (Iterable[NumericLocale], optional): Restricts the numeric
+            formats to the given locales. Default is all locales.
+        languages (Iterable[str], optional): Languages of the text (de, en,
+            es, fr, it, nl, pt). Units without value that are ambiguous with
+            common words in these languages, e.g. 'in' and 'a' in English, are
+            suppressed. Default is no filter.
+        names (bool, optional): Also extracts spelled-out names of units in
+            English and German, e.g. 'kilometers per hour' with the unit
+            'km/h'. Default is False.
 
     Returns:
         list[Unit]: List of Unit objects representing detected unit entities.
@@ -507,37 +1185,619 @@ def units(text: str) -> list[Unit]:
     if not text:
         return []
 
+    pattern = _get_unit_pattern(locales, names)
+    ambiguous = _get_ambiguous_units_for(languages)
+
     entities = []
-    for match in UNIT_PATTERN.finditer(text):
-        groups = match.groupdict()
-        numeric = groups.get("unit_value_numeric")
-        unit = groups.get("unit_value_unit") or groups.get("unit_unit")
+    for match in pattern.finditer(text):
+        entity = _create_unit(match, ambiguous)
+        if entity:
+            entities.append(entity)
+
+    return entities
+
+
+# Characters before an edit within which entities are re-scanned, longer than
+# the usual matches, so that matches affected by the edit are covered.
+_INCREMENTAL_MARGIN = 64
+
+
+def units_incremental(
+        text: str,
+        entities: list[Unit],
+        offset: int,
+        deleted: int,
+        inserted: str,
+        locales: Iterable[NumericLocale] = None,
+        margin: int = _INCREMENTAL_MARGIN,
+        *,
+        languages: Iterable[str] = None,
+        names: bool = False
+) -> list[Unit]:
+    """
+    Updates the result of units() after an edit of the text. Only the edited
+    region plus a safety margin is re-scanned, the other entities are taken
+    over and shifted.
 
-        if not (UNIT_EXPRESSION_VALIDATION_PATTERN.match(unit)):
+    The scan starts at the end of the last entity before the margin and ends
+    at the first entity behind the edit (and the context window used for the
+    categories of ambiguous units) that was already found before, because
+    from such a position the scan continues exactly as before the edit.
+
+    Args:
+        text (str): Text before the edit
+        entities (list[Unit]): Result of units() for the text before the edit
+        offset (int): Start of the edit in the text before the edit
+        deleted (int): Number of deleted characters at offset
+        inserted (str): Text inserted at offset
+        locales (Iterable[NumericLocale], optional): Restricts the numeric
+            formats to the given locales, must be the same as for entities.
+        margin (int, optional): Characters before the edit within which
+            entities are re-scanned, default 64, at least the context window.
+        languages (Iterable[str], optional): Suppresses ambiguous units
+            without value, must be the same as for entities.
+        names (bool, optional): Also extracts spelled-out names of units,
+            must be the same as for entities.
+
+    Returns:
+        list[Unit]: Result of units() for the text after the edit
+
+    Raises:
+        ValueError: If the edit is outside the text.
+
+    Example:
+        units_incremental("Die Länge beträgt 5 km.", entities, 18, 1, "15")
+        returns the result of units("Die Länge beträgt 15 km.")
+    """
+
+    if offset < 0 or deleted < 0 or offset + deleted > len(text):
+        raise ValueError("Edit is outside the text")
+
+    text = text[:offset] + inserted + text[offset + deleted:]
+    if not text:
+        return []
+
+    shift = len(inserted) - deleted
+    end = offset + len(inserted)
+
+    # The categories of ambiguous units depend on the context, so entities
+    # whose context window overlaps the edit are re-scanned as well.
+    margin = max(margin, _UNIT_CONTEXT_WINDOW)
+
+    head = []
+    tail = []
+    for entity in entities:
+        if entity.end <= offset - margin:
+            head.append(entity)
+        elif entity.start >= offset + deleted:
+            tail.append(entity._replace(start=entity.start + shift, end=entity.end + shift))
+    tail_entities = {entity.start: entity for entity in tail}
+
+    pattern = _get_unit_pattern(locales, names)
+    ambiguous = _get_ambiguous_units_for(languages)
+
+    middle = []
+    boundary = len(text)
+    for match in pattern.finditer(text, head[-1].end if head else 0):
+        entity = _create_unit(match, ambiguous)
+        if not entity:
             continue
+        if entity.start >= end + _UNIT_CONTEXT_WINDOW and tail_entities.get(entity.start) == entity:
+            boundary = entity.start
+            break
+        middle.append(entity)
 
-        if numeric:
-            entities.append(
-                Unit(
-                    label="MEASURE",
-                    start=match.start(),
-                    end=match.end(),
-                    text=match.group(),
-                    unit=unit,
-                    value=numeric,
-                    categories=_get_categories_for_unit(unit)
-                )
-            )
+    return head + middle + [entity for entity in tail if entity.start >= boundary]
+
+
+class NumericType(Enum):
+    """
+    Specifies the structure of the numeric expression of a measure.
+
+    Types:
+    - VALUE: Single value, e.g. 5, -11, ~2.3
+    - RANGE: Two values linked with a dash, e.g. 900 - 950, 12–14
+    - TOLERANCE: Value with deviation, e.g. 5 ± 0.1, ±5
+    - DIMENSIONS: Values linked with multiplication signs, e.g. 10 × 20 × 30
+    - OPERATION: Any other combination, e.g. 1.2 × 10^3, 3.5/2
+    """
+    VALUE = "VALUE"
+    RANGE = "RANGE"
+    TOLERANCE = "TOLERANCE"
+    DIMENSIONS = "DIMENSIONS"
+    OPERATION = "OPERATION"
+
+
+class Numeric(NamedTuple):
+    """
+    Represents the structured decomposition of the numeric expression of a
+    measure.
+
+    Attributes:
+        type (NumericType): Structure of the numeric expression.
+        values (tuple[str, ...]): Numeric values without sign in the order of
+            their appearance.
+        operators (tuple[str, ...]): Separators between the values, one less
+            than values.
+        spans (tuple[tuple[int, int], ...]): Start and end index of each value
+            in the original text.
+        sign (Optional[str]): Sign of the first value, if present.
+    """
+    type: NumericType
+    values: tuple[str, ...]
+    operators: tuple[str, ...]
+    spans: tuple[tuple[int, int], ...]
+    sign: Optional[str] = None
+
+
+_NUMERIC_SIGNS_SET = {"\u00B1", "+", "-", "~"}
+_NUMERIC_RANGE_OPERATORS_SET = {"-", "\u2012", "\u2013", "\u2014", "\u2212"}
+_NUMERIC_DIMENSIONS_OPERATORS_SET = {"*", "x", "\u00D7"}
+
+
+@lru_cache(maxsize=1024)
+def _decompose_numeric(value: str) -> Numeric:
+
+    # The numeric expression is already validated by the scan of UNIT_PATTERN,
+    # only the separators need to be located. The scan cannot provide their
+    # positions, because re keeps only the last capture of a repeated group.
+    # Therefore, they are located in the value (not in the text) with the
+    # single character class of the separators, once per distinct value. The
+    # first character can be a sign and is therefore skipped.
+    sign = value[0] if value[0] in _NUMERIC_SIGNS_SET else None
+    values = []
+    operators = []
+    spans = []
+    cursor = 1 if sign else 0
+    for match in NUMERIC_DIMENSIONAL_SEPARATORS_PATTERN.finditer(value, cursor):
+        operators.append(match.group())
+        spans.append((cursor, match.start()))
+        cursor = match.end()
+    spans.append((cursor, len(value)))
+
+    for index, (start, end) in enumerate(spans):
+        fragment = value[start:end]
+        start += len(fragment) - len(fragment.lstrip())
+        end -= len(fragment) - len(fragment.rstrip())
+        spans[index] = (start, end)
+        values.append(value[start:end])
+
+    if not operators:
+        numeric_type = NumericType.TOLERANCE if sign == "\u00B1" else NumericType.VALUE
+    elif len(operators) == 1 and operators[0] == "\u00B1":
+        numeric_type = NumericType.TOLERANCE
+    elif len(operators) == 1 and operators[0] in _NUMERIC_RANGE_OPERATORS_SET:
+        numeric_type = NumericType.RANGE
+    elif all(operator in _NUMERIC_DIMENSIONS_OPERATORS_SET for operator in operators):
+        numeric_type = NumericType.DIMENSIONS
+    else:
+        numeric_type = NumericType.OPERATION
+
+    return Numeric(
+        type=numeric_type,
+        values=tuple(values),
+        operators=tuple(operators),
+        spans=tuple(spans),
+        sign=sign
+    )
+
+
+_NUMERIC_GROUPING_PATTERN = re.compile(r"[\s\u2019]")
+
+
+def _get_decimal_separator(locales: Iterable[NumericLocale] = None) -> Optional[str]:
+    # The decimal separator is only unambiguous if all locales use the same.
+    if locales is None:
+        return None
+    separators = {_NUMERIC_LOCALE_DECIMAL_SEPARATORS[locale] for locale in locales}
+    return separators.pop() if len(separators) == 1 else None
+
+
+@lru_cache(maxsize=1024)
+def _parse_numeric(value: str, decimal: str = None) -> Optional[float]:
+
+    # Converts a single numeric value (without sign) into a float. Spaces and
+    # apostrophes are always grouping characters. If the decimal separator is
+    # known from the locales, the other one is a grouping character. Otherwise,
+    # the last of comma and dot is the decimal separator, unless it occurs
+    # several times (grouping), e.g. 1.000.000,99 / 1,000,000.99 / 1,00,000.00.
+    # A single separator is interpreted as decimal separator, e.g. 1,5 and 1.5.
+    value = _NUMERIC_GROUPING_PATTERN.sub("", value)
+    comma, dot = value.count(","), value.count(".")
+    if decimal:
+        value = value.replace("." if decimal == "," else ",", "").replace(",", ".")
+    elif comma and dot:
+        if value.rfind(",") > value.rfind("."):
+            value = value.replace(".", "").replace(",", ".")
         else:
-            entities.append(
-                Unit(
-                    label="UNIT",
-                    start=match.start(),
-                    end=match.end(),
-                    text=match.group(),
-                    unit=unit,
-                    categories=_get_categories_for_unit(unit)
-                )
+            value = value.replace(",", "")
+    elif comma > 1 or dot > 1:
+        value = value.replace(",", "").replace(".", "")
+    else:
+        value = value.replace(",", ".")
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def decompose(unit: Unit) -> Optional[Numeric]:
+    """
+    Decomposes the numeric expression of a measure into its components, such
+    as ranges (900 - 950 km/h), tolerances (5 ± 0.1 mm) and dimensions
+    (10 × 20 × 30 cm).
+
+    The decomposition is based on the value already found by units() and its
+    position in the text, the numeric patterns are not applied again.
+
+    Args:
+        unit (Unit): Unit object from units().
+
+    Returns:
+        Optional[Numeric]: Structured numeric expression with the positions of
+            the values in the original text, or None if the unit has no value.
+    """
+    if not unit.value:
+        return None
+    numeric = _decompose_numeric(unit.value)
+    # The numeric expression is always at the beginning of a measure.
+    return numeric._replace(
+        spans=tuple((unit.start + start, unit.start + end) for start, end in numeric.spans)
+    )
+
+
+_UNIT_SYMBOLS_SET = _re_unescape_units(_UNIT_SYMBOLS_PATTERN)
+_UNIT_IEC_SYMBOLS_SET = _re_unescape_units(_UNIT_IEC_SYMBOLS_PATTERN)
+_UNIT_SI_SYMBOLS_M_PREFIX_SET = _re_unescape_units(_UNIT_SI_SYMBOLS_M_PREFIX_PATTERN)
+_UNIT_SI_SYMBOLS_S_PREFIX_SET = _re_unescape_units(_UNIT_SI_SYMBOLS_S_PREFIX_PATTERN)
+_UNIT_SI_SYMBOLS_SUFFIX_SET = _re_unescape_units(_UNIT_SI_SYMBOLS_SUFFIX_PATTERN)
+_UNIT_SI_SYMBOLS_PREFIX_SUFFIX_SET = _re_unescape_units(_UNIT_SI_SYMBOLS_PREFIX_SUFFIX_PATTERN)
+
+# Prefixes as (base, power), so that the scale can be calculated exactly.
+_UNIT_SI_PREFIX_M_SCALES = {
+    "Q": (10, 30), "R": (10, 27), "Y": (10, 24), "Z": (10, 21), "E": (10, 18), "P": (10, 15),
+    "T": (10, 12), "G": (10, 9), "M": (10, 6), "k": (10, 3), "h": (10, 2), "da": (10, 1)
+}
+_UNIT_SI_PREFIX_S_SCALES = {
+    "d": (10, -1), "c": (10, -2), "m": (10, -3), "µ": (10, -6), "n": (10, -9), "p": (10, -12),
+    "f": (10, -15), "a": (10, -18), "z": (10, -21), "y": (10, -24), "r": (10, -27), "q": (10, -30)
+}
+_UNIT_IEC_PREFIX_SCALES = {
+    "Ki": (2, 10), "Mi": (2, 20), "Gi": (2, 30), "Ti": (2, 40),
+    "Pi": (2, 50), "Ei": (2, 60), "Zi": (2, 70), "Yi": (2, 80)
+}
+_UNIT_PREFIX_SCALES = {
+    **_UNIT_SI_PREFIX_M_SCALES,
+    **_UNIT_SI_PREFIX_S_SCALES,
+    **_UNIT_IEC_PREFIX_SCALES
+}
+
+_UNIT_SI_SUFFIX_EXPONENTS = {
+    "¹": 1, "²": 2, "³": 3,
+    "⁻¹": -1, "⁻²": -2, "⁻³": -3
+}
+_UNIT_SI_SUFFIX_SUPERSCRIPTS = {
+    "-": "⁻", "0": "⁰", "1": "¹", "2": "²", "3": "³", "4": "⁴",
+    "5": "⁵", "6": "⁶", "7": "⁷", "8": "⁸", "9": "⁹"
+}
+_UNIT_INFORMAL_SUFFIX_EXPONENTS = {"2": 2, "3": 3}
+_UNIT_INFORMAL_PREFIX_EXPONENTS = {"sq. ": 2, "sq.": 2, "q": 2, "c": 3}
+
+_UNIT_OPERATORS_DIVISION_PATTERN = re.compile(r"^\s*/\s*$")
+
+
+class UnitFactor(NamedTuple):
+    """
+    Represents a single unit of a unit expression, e.g. km in km/h.
+
+    Attributes:
+        prefix (Optional[str]): SI or IEC prefix, e.g. 'k' or 'Mi'.
+        symbol (str): Unit symbol without prefix and exponent, e.g. 'm'.
+        exponent (int): Exponent, negative for units in the denominator.
+    """
+    prefix: Optional[str]
+    symbol: str
+    exponent: int = 1
+
+
+class UnitExpression:
+    """
+    Represents the normalized structure (AST) of a unit expression.
+
+    Unit expressions are created by parse_unit() and are interned, different
+    spellings of the same unit, e.g. 'km/h', 'km / h' and 'km·h⁻¹', share the
+    same object. Hash and comparison therefore do not depend on the length of
+    the expression.
+
+    Attributes:
+        factors (tuple[UnitFactor, ...]): Units of the expression in canonical
+            order, positive exponents first.
+    """
+
+    __slots__ = ("factors", "_hash", "__weakref__")
+
+    def __init__(self, factors: tuple[UnitFactor, ...]) -> None:
+        self.factors = factors
+        self._hash = hash(factors)
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, UnitExpression):
+            return NotImplemented
+        return self._hash == other._hash and self.factors == other.factors
+
+    def __reduce__(self):
+        return _intern_unit_expression, (self.factors,)
+
+    def __repr__(self) -> str:
+        return f"UnitExpression({str(self)!r})"
+
+    def __str__(self) -> str:
+        def _exponent(exponent: int) -> str:
+            if exponent == 1:
+                return ""
+            return "".join(_UNIT_SI_SUFFIX_SUPERSCRIPTS[digit] for digit in str(exponent))
+        return "·".join(
+            f"{factor.prefix or ''}{factor.symbol}{_exponent(factor.exponent)}"
+            for factor in self.factors
+        )
+
+    @property
+    def scale(self) -> float:
+        """
+        Factor of the prefixes in relation to the base expression, e.g. 1000
+        for km/h (base m/h) or 0.000001 for cm³ (base m³). Only prefixes are
+        considered, there is no conversion between different units.
+        """
+        scale = 1.0
+        for factor in self.factors:
+            if factor.prefix:
+                base, power = _UNIT_PREFIX_SCALES[factor.prefix]
+                scale *= float(base) ** (power * factor.exponent)
+        return scale
+
+    @property
+    def base(self) -> "UnitExpression":
+        """
+        Same expression without prefixes, e.g. m/s for km/h.
+        """
+        return _intern_unit_expression(tuple(
+            factor._replace(prefix=None) for factor in self.factors
+        ))
+
+
+_UNIT_EXPRESSIONS: dict[tuple[UnitFactor, ...], UnitExpression] = {}
+_UNIT_EXPRESSIONS_LOCK = threading.Lock()
+
+
+def _intern_unit_expression(factors: tuple[UnitFactor, ...]) -> UnitExpression:
+    # Equal factors (same prefix and symbol) are merged, factors without an
+    # exponent are omitted and the rest is sorted, so that equal units result
+    # in the same key regardless of their spelling and order.
+    exponents: dict[tuple[Optional[str], str], int] = {}
+    for factor in factors:
+        key = (factor.prefix, factor.symbol)
+        exponents[key] = exponents.get(key, 0) + factor.exponent
+    factors = tuple(sorted(
+        (UnitFactor(prefix, symbol, exponent) for (prefix, symbol), exponent in exponents.items() if exponent),
+        key=lambda factor: (factor.exponent < 0, factor.symbol, factor.prefix or "")
+    ))
+    expression = _UNIT_EXPRESSIONS.get(factors)
+    if expression is None:
+        with _UNIT_EXPRESSIONS_LOCK:
+            expression = _UNIT_EXPRESSIONS.setdefault(factors, UnitExpression(factors))
+    return expression
+
+
+def _parse_unit_factor(unit: str) -> Optional[UnitFactor]:
+
+    # The plain symbol has priority over combinations with prefixes, e.g. Pa
+    # is pascal and not peta-are, min is minute and not milli-inch.
+    exponent = 1
+    for suffix in (unit[-2:], unit[-1:]):
+        if suffix in _UNIT_SI_SUFFIX_EXPONENTS:
+            exponent = _UNIT_SI_SUFFIX_EXPONENTS[suffix]
+            unit = unit[:-len(suffix)]
+            break
+
+    if unit in _UNIT_SYMBOLS_SET:
+        return UnitFactor(None, unit, exponent)
+    # q and sq. are used informally for square units, e.g. qm, quecto as the
+    # SI prefix q is not relevant for these units.
+    if exponent == 1:
+        for prefix in ("sq. ", "sq.", "q"):
+            if unit.startswith(prefix) and unit[len(prefix):] in _UNIT_INFORMAL_SYMBOLS_SET:
+                return UnitFactor(None, unit[len(prefix):], _UNIT_INFORMAL_PREFIX_EXPONENTS[prefix])
+    for length in (2, 1):
+        prefix, symbol = unit[:length], unit[length:]
+        if prefix in _UNIT_IEC_PREFIX_SCALES and symbol in _UNIT_IEC_SYMBOLS_SET:
+            return UnitFactor(prefix, symbol, exponent)
+        if prefix in _UNIT_SI_PREFIX_M_SCALES and symbol in _UNIT_SI_SYMBOLS_M_PREFIX_SET:
+            return UnitFactor(prefix, symbol, exponent)
+        if prefix in _UNIT_SI_PREFIX_S_SCALES and symbol in _UNIT_SI_SYMBOLS_S_PREFIX_SET:
+            return UnitFactor(prefix, symbol, exponent)
+
+    # Informal spellings: prefix and suffix express the exponent,
+    # e.g. qm, sq. ft, m2, cm3
+    if exponent != 1:
+        return None
+    if unit[-1:] in _UNIT_INFORMAL_SUFFIX_EXPONENTS:
+        exponent = _UNIT_INFORMAL_SUFFIX_EXPONENTS[unit[-1:]]
+        unit = unit[:-1]
+        if unit in _UNIT_INFORMAL_SYMBOLS_SET:
+            return UnitFactor(None, unit, exponent)
+        factor = _parse_unit_factor(unit)
+        if factor and factor.symbol in _UNIT_INFORMAL_SI_SYMBOLS_SET:
+            return factor._replace(exponent=exponent)
+        return None
+    for prefix, exponent in _UNIT_INFORMAL_PREFIX_EXPONENTS.items():
+        if unit.startswith(prefix) and unit[len(prefix):] in _UNIT_INFORMAL_SYMBOLS_SET:
+            return UnitFactor(None, unit[len(prefix):], exponent)
+    return None
+
+
+@lru_cache(maxsize=1024)
+def parse_unit(unit: str) -> Optional[UnitExpression]:
+    """
+    Parses a unit expression, e.g. 'kg·m/s²', 'W / m2' or 'km x h', into its
+    normalized structure.
+
+    Different spellings of the same unit lead to the same (interned) object,
+    so that units can be grouped and compared without string comparisons. The
+    results are memoized per distinct expression.
+
+    Args:
+        unit (str): Unit expression, e.g. Unit.unit from units().
+
+    Returns:
+        Optional[UnitExpression]: Normalized unit expression, or None if the
+            expression contains unknown units.
+    """
+    if not unit or not unit.strip():
+        return None
+    factors = []
+    division = False
+    # The split with a capturing group alternates between units (even) and
+    # operators (odd). A division only applies to the directly following unit.
+    for index, entry in enumerate(re.split(f"({_UNIT_OPERATORS_PATTERN})", unit.strip())):
+        if index % 2:
+            division = bool(_UNIT_OPERATORS_DIVISION_PATTERN.match(entry))
+            continue
+        factor = _parse_unit_factor(entry)
+        if not factor:
+            return None
+        if division:
+            factor = factor._replace(exponent=-factor.exponent)
+        factors.append(factor)
+    return _intern_unit_expression(tuple(factors))
+
+
+# Texts up to this length (characters) are processed directly in the event
+# loop, because handing them over to an executor costs more than the scan.
+_EXECUTOR_INLINE_THRESHOLD = 16384
+
+# Maximum number of texts that are processed in the executor at the same time.
+# Further calls wait in the event loop (backpressure) instead of piling up in
+# the queue of the executor.
+_EXECUTOR_CONCURRENCY = max(1, min(4, os.cpu_count() or 1))
+
+_executor: Optional[Executor] = None
+_executor_lock = threading.Lock()
+_executor_semaphores: WeakKeyDictionary = WeakKeyDictionary()
+
+
+def _get_executor() -> Executor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=_EXECUTOR_CONCURRENCY,
+                thread_name_prefix="seanox-ai-nlp-units"
             )
+        return _executor
+
+
+def _get_executor_semaphore(loop: asyncio.AbstractEventLoop) -> asyncio.Semaphore:
+    # asyncio.Semaphore is bound to the event loop in which it is used first,
+    # so each loop gets its own. Loops can run in different threads, the
+    # WeakKeyDictionary itself is not thread-safe.
+    with _executor_lock:
+        semaphore = _executor_semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(_EXECUTOR_CONCURRENCY)
+            _executor_semaphores[loop] = semaphore
+        return semaphore
+
+
+async def _offload(
+        function: Callable[..., Any],
+        text: str,
+        executor: Optional[Executor],
+        threshold: Optional[int]
+) -> Any:
+    if threshold is None:
+        threshold = _EXECUTOR_INLINE_THRESHOLD
+    if not text or len(text) <= threshold:
+        return function(text)
+    loop = asyncio.get_running_loop()
+    async with _get_executor_semaphore(loop):
+        # If the awaiting task is cancelled, the pending job is removed from
+        # the executor. A job that is already running cannot be interrupted,
+        # it is finished and its result is discarded.
+        return await loop.run_in_executor(executor or _get_executor(), function, text)
+
+
+async def units_async(
+        text: str,
+        executor: Optional[Executor] = None,
+        threshold: Optional[int] = None,
+        *,
+        locales: Iterable[NumericLocale] = None,
+        languages: Iterable[str] = None,
+        names: bool = False
+) -> list[Unit]:
+    """
+    Asynchronous variant of units() for use in asyncio-based applications.
 
-    return entities
+    Short texts are processed directly in the event loop. Longer texts are
+    dispatched to an executor so that the event loop is not blocked. The
+    number of texts processed at the same time is limited, further calls wait
+    without blocking the event loop.
+
+    Args:
+        text (str): Input string to analyze.
+        executor (Executor, optional): Executor for longer texts, e.g. a
+            ProcessPoolExecutor for true parallelism. Default is a shared
+            ThreadPoolExecutor of the module.
+        threshold (int, optional): Maximum text length (characters) that is
+            processed directly in the event loop.
+        locales (Iterable[NumericLocale], optional): Restricts the numeric
+            formats to the given locales. Default is all locales.
+        languages (Iterable[str], optional): Suppresses units without value
+            that are ambiguous with common words in these languages.
+        names (bool, optional): Also extracts spelled-out names of units.
+
+    Returns:
+        list[Unit]: List of Unit objects representing detected unit entities.
+    """
+    if locales is not None or languages is not None or names:
+        # frozenset, so that the arguments can also be passed to a process pool
+        function = partial(
+            units,
+            locales=frozenset(locales) if locales is not None else None,
+            languages=frozenset(languages) if languages is not None else None,
+            names=names
+        )
+        return await _offload(function, text, executor, threshold)
+    return await _offload(units, text, executor, threshold)
+
+
+async def spacing_async(
+        text: str,
+        mode: SpacingMode = SpacingMode.NUMERIC,
+        executor: Optional[Executor] = None,
+        threshold: Optional[int] = None
+) -> str:
+    """
+    Asynchronous variant of spacing() for use in asyncio-based applications.
+
+    Short texts are processed directly in the event loop. Longer texts are
+    dispatched to an executor so that the event loop is not blocked.
+
+    Args:
+        text (str): Input string to be corrected
+        mode (SpacingMode, optional): Correction mode for spacing.
+            Default is SpacingMode.NUMERIC.
+        executor (Executor, optional): Executor for longer texts. Default is a
+            shared ThreadPoolExecutor of the module.
+        threshold (int, optional): Maximum text length (characters) that is
+            processed directly in the event loop.
+
+    Returns:
+        str: Corrected text with corrected spacing
+    """
+    return await _offload(partial(spacing, mode=mode), text, executor, threshold)
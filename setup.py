@@ -19,6 +19,15 @@ setup(
         "jinja2>=3.0.0",
         "stanza>=1.10.1"
     ],
+    extras_require={
+        "parquet": ["pyarrow>=14.0"],
+        "spacy": ["spacy>=3.7.0"]
+    },
+    entry_points={
+        "console_scripts": [
+            "seanox-ai-nlp-units=seanox_ai_nlp.units.batch:main"
+        ]
+    },
     classifiers=[
         "Development Status :: 5 - Production/Stable",
         "Intended Audience :: Developers",
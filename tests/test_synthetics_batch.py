@@ -0,0 +1,79 @@
+# tests/test_synthetics_batch.py
+
+from seanox_ai_nlp.synthetics import synthetics, synthetics_batch, Synthetic, TemplateConditionException
+from seanox_ai_nlp.synthetics.synthetics import _TEMPLATES
+from time import perf_counter
+from pathlib import Path
+
+import itertools
+import json
+import random
+import pytest
+
+TESTS_PATH = Path("./tests") if Path("./tests").is_dir() else Path(".")
+
+
+def _load_datas(filename: str) -> list[dict]:
+    with open(TESTS_PATH / filename, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def test_synthetics_batch_01():
+    datas = _load_datas("synthetics-planets_en.json") * 3
+
+    # The same random sequence produces the same results as synthetics().
+    _TEMPLATES.clear()
+    random.seed(1)
+    expected = [synthetics(TESTS_PATH, "synthetics_en_annotate.yaml", data) for data in datas]
+    _TEMPLATES.clear()
+    random.seed(1)
+    results = synthetics_batch(TESTS_PATH, "synthetics_en_annotate.yaml", datas)
+    assert not isinstance(results, list)
+    results = list(results)
+    assert results == expected
+    assert all(isinstance(result, Synthetic) and result.text for result in results)
+
+
+def test_synthetics_batch_02():
+
+    # Results are streamed, records are consumed lazily.
+    datas = _load_datas("synthetics-planets_de.json")
+    records = itertools.cycle(datas)
+    results = synthetics_batch(TESTS_PATH, "synthetics_de_annotate.yaml", records)
+    assert len(list(itertools.islice(results, 100))) == 100
+
+    assert list(synthetics_batch(TESTS_PATH, "synthetics_de_annotate.yaml", [])) == []
+    assert list(synthetics_batch(TESTS_PATH, "", [{}, {}])) == [Synthetic("", "", [], [])] * 2
+
+
+def test_synthetics_batch_03():
+
+    # Errors of the template file are raised already when called.
+    with pytest.raises(FileNotFoundError):
+        synthetics_batch(TESTS_PATH, "synthetics_unknown.yaml", [])
+
+    # Errors of the conditions are raised for the record.
+    datas = _load_datas("synthetics-planets_de.json")
+    results = synthetics_batch(TESTS_PATH, "synthetics_de_annotate.yaml", [datas[0], {}])
+    assert next(results).text
+    with pytest.raises(TemplateConditionException):
+        next(results)
+
+
+def test_synthetics_batch_benchmark_01():
+    datas = _load_datas("synthetics-planets_de.json") * 500
+    synthetics(TESTS_PATH, "synthetics_de_annotate.yaml", datas[0])
+
+    start = perf_counter()
+    for data in datas:
+        synthetics(TESTS_PATH, "synthetics_de_annotate.yaml", data)
+    end = perf_counter()
+    print()
+    print(f"Benchmark iterations: {len(datas)} x")
+    print(f"Benchmark synthetics: {(end - start) * 1000:.2f} ms")
+
+    start = perf_counter()
+    for _ in synthetics_batch(TESTS_PATH, "synthetics_de_annotate.yaml", datas):
+        pass
+    end = perf_counter()
+    print(f"Benchmark synthetics_batch: {(end - start) * 1000:.2f} ms")
@@ -0,0 +1,136 @@
+# tests/test_synthetics_bundle.py
+
+from seanox_ai_nlp.synthetics import synthetics_bundle, synthetics_cache, TemplateException
+from seanox_ai_nlp.synthetics.synthetics import _Template, _create_bundle_key, _BUNDLE_FILE_SIGNATURE
+from time import perf_counter
+from pathlib import Path
+
+import json
+import marshal
+import random
+import shutil
+import pytest
+import yaml
+
+TESTS_PATH = Path("./tests") if Path("./tests").is_dir() else Path(".")
+
+
+@pytest.fixture(autouse=True)
+def _reset_cache():
+    synthetics_cache(clear=True)
+    yield
+    synthetics_cache(clear=True)
+
+
+def _copy_template(path, filename: str) -> str:
+    shutil.copy(TESTS_PATH / filename, path / filename)
+    return filename
+
+
+def _generate(template: _Template, datas: list[dict], markers: bool = True) -> list:
+    rng = random.Random(1)
+    return [template.generate(data, rng, markers) for data in datas]
+
+
+@pytest.mark.parametrize("template, datas", [
+    ("synthetics_en_annotate.yaml", "synthetics-planets_en.json"),
+    ("synthetics_de_annotate.yaml", "synthetics-planets_de.json"),
+    ("synthetics_spans_expression.yaml", None)
+])
+def test_synthetics_bundle_01(tmp_path, template, datas):
+    template = _copy_template(tmp_path, template)
+    if datas:
+        with open(TESTS_PATH / datas, encoding="utf-8") as file:
+            datas = json.load(file) * 3
+    else:
+        datas = [{"template": index} for index in range(1, 6)]
+
+    expected = _Template(tmp_path, template)
+    assert synthetics_bundle(tmp_path, template) == str(tmp_path / f"{template}.bundle")
+    assert (tmp_path / f"{template}.bundle").read_bytes().startswith(_BUNDLE_FILE_SIGNATURE)
+    result = _Template(tmp_path, template)
+
+    assert result.payloads == expected.payloads
+    assert [variant[:1] + variant[2:] for variant in result.variants.values()] \
+        == [variant[:1] + variant[2:] for variant in expected.variants.values()]
+    for markers in (True, False):
+        assert _generate(result, datas, markers) == _generate(expected, datas, markers)
+
+
+def test_synthetics_bundle_02(tmp_path):
+    file = tmp_path / "synthetics_bundle.yaml"
+    templates = [{"name": "Bundle", "condition": "True", "template": "{{ 'A' | custom }}"}]
+    file.write_text(yaml.safe_dump({"templates": templates}), encoding="utf-8")
+    filters = {"custom": str.lower}
+    synthetics_bundle(tmp_path, file.name, filters)
+    assert _Template(tmp_path, file.name, filters).generate({})[0] == "a"
+
+    # Filters are part of the key, because Jinja evaluates constant
+    # expressions with filters at compile time.
+    assert _Template(tmp_path, file.name, {"custom": str.upper}).generate({})[0] == "A"
+
+    # Lambdas have the same qualified name, the code distinguishes them.
+    synthetics_bundle(tmp_path, file.name, {"custom": lambda value: value.lower()})
+    assert _Template(tmp_path, file.name, {"custom": lambda value: value + "!"}).generate({})[0] == "A!"
+
+    # Functions with a closure cannot be bundled.
+    suffix = "?"
+    with pytest.raises(ValueError):
+        synthetics_bundle(tmp_path, file.name, {"custom": lambda value: value + suffix})
+
+    # With other filters the bundle is not used and the template is validated.
+    with pytest.raises(TemplateException):
+        _Template(tmp_path, file.name)
+
+    # With changed content the bundle is not used.
+    templates[0]["template"] = "{{ 'B' | custom }}"
+    file.write_text(yaml.safe_dump({"templates": templates}), encoding="utf-8")
+    assert _Template(tmp_path, file.name, filters).generate({})[0] == "b"
+
+    # Invalid bundles are ignored.
+    for data in (b"", b"XXXX", _BUNDLE_FILE_SIGNATURE + b"\x00\x01"):
+        (tmp_path / "synthetics_bundle.yaml.bundle").write_bytes(data)
+        assert _Template(tmp_path, file.name, filters).generate({})[0] == "b"
+
+    with pytest.raises(FileNotFoundError):
+        synthetics_bundle(tmp_path, "synthetics_missing.yaml")
+    templates[0]["template"] = "{{ 'B' | missing }}"
+    file.write_text(yaml.safe_dump({"templates": templates}), encoding="utf-8")
+    with pytest.raises(TemplateException):
+        synthetics_bundle(tmp_path, file.name)
+
+
+def test_synthetics_bundle_03(tmp_path):
+    file = tmp_path / "synthetics_bundle.yaml"
+    templates = [{"name": "Bundle", "condition": "True", "template": "{{ 'A' | lower }}"}]
+    file.write_text(yaml.safe_dump({"templates": templates}), encoding="utf-8")
+    synthetics_bundle(tmp_path, file.name)
+    variants = marshal.loads(
+        (tmp_path / "synthetics_bundle.yaml.bundle").read_bytes()[len(_BUNDLE_FILE_SIGNATURE):]
+    )["variants"]
+
+    # Bundles with a matching key but damaged variants are ignored.
+    key = _create_bundle_key(file.read_bytes(), None)
+    for damaged in (None, 1, [("garbage",)], [variants[0][:5] + (b"garbage",)], variants + [None]):
+        data = marshal.dumps({"key": key, "variants": damaged})
+        (tmp_path / "synthetics_bundle.yaml.bundle").write_bytes(_BUNDLE_FILE_SIGNATURE + data)
+        template = _Template(tmp_path, file.name)
+        assert list(template.variants) == [0]
+        assert template.generate({})[0] == "a"
+
+
+def test_synthetics_bundle_benchmark_01(tmp_path):
+    template = _copy_template(tmp_path, "synthetics_en_annotate.yaml")
+    _Template(tmp_path, template)
+    print()
+    start = perf_counter()
+    for _ in range(20):
+        _Template(tmp_path, template)
+    end = perf_counter()
+    print(f"Benchmark template, YAML: {(end - start) * 1000 / 20:.2f} ms per load")
+    synthetics_bundle(tmp_path, template)
+    start = perf_counter()
+    for _ in range(20):
+        _Template(tmp_path, template)
+    end = perf_counter()
+    print(f"Benchmark template, bundle: {(end - start) * 1000 / 20:.2f} ms per load")
@@ -0,0 +1,158 @@
+# tests/test_synthetics_cache.py
+
+from seanox_ai_nlp.synthetics import synthetics, synthetics_cache, TemplateCacheInfo
+from seanox_ai_nlp.synthetics.synthetics import _Template, _TEMPLATES, _TEMPLATE_CACHE_SIZE, _TEMPLATE_CACHE_INTERVAL
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+
+import os
+import pytest
+import sys
+import threading
+import yaml
+
+
+@pytest.fixture(autouse=True)
+def _reset_cache():
+    synthetics_cache(clear=True)
+    yield
+    synthetics_cache(_TEMPLATE_CACHE_SIZE, _TEMPLATE_CACHE_INTERVAL, clear=True)
+
+
+def _write_template(path, text: str, filename: str = "synthetics_cache.yaml") -> str:
+    file = path / filename
+    templates = [{"name": "Cache", "condition": "True", "template": text}]
+    file.write_text(yaml.safe_dump({"templates": templates}), encoding="utf-8")
+    return filename
+
+
+def _touch(path, filename: str, seconds: int = 10) -> None:
+    # Modification time in the future, so that the change is detected
+    # regardless of the resolution of the file system.
+    status = os.stat(path / filename)
+    os.utime(path / filename, ns=(status.st_atime_ns, status.st_mtime_ns + seconds * 1_000_000_000))
+
+
+def test_synthetics_cache_01(tmp_path):
+    info = synthetics_cache()
+    assert isinstance(info, TemplateCacheInfo)
+    assert (info.size, info.maxsize, info.interval) == (0, _TEMPLATE_CACHE_SIZE, _TEMPLATE_CACHE_INTERVAL)
+
+    synthetics_cache(interval=0)
+    template = _write_template(tmp_path, "A")
+    start = synthetics_cache()
+    assert synthetics(tmp_path, template).text == "A"
+    assert synthetics(tmp_path, template).text == "A"
+    info = synthetics_cache()
+    assert (info.misses - start.misses, info.hits - start.hits, info.size) == (1, 1, 1)
+
+    # Changed content is loaded again.
+    _write_template(tmp_path, "B")
+    _touch(tmp_path, template)
+    assert synthetics(tmp_path, template).text == "B"
+    assert synthetics_cache().reloads - start.reloads == 1
+
+    # Changed modification time with the same content is not loaded again.
+    _touch(tmp_path, template, 20)
+    cached = next(iter(_TEMPLATES.values()))
+    assert synthetics(tmp_path, template).text == "B"
+    assert next(iter(_TEMPLATES.values())) is cached
+    assert synthetics_cache().reloads - start.reloads == 1
+
+    # Deleted files cause the same error as when loading.
+    os.remove(tmp_path / template)
+    with pytest.raises(FileNotFoundError):
+        synthetics(tmp_path, template)
+    assert synthetics_cache().size == 0
+
+
+def test_synthetics_cache_02(tmp_path):
+
+    # Without revalidation, changes are not detected.
+    synthetics_cache(interval=-1)
+    template = _write_template(tmp_path, "A")
+    assert synthetics(tmp_path, template).text == "A"
+    _write_template(tmp_path, "B")
+    _touch(tmp_path, template)
+    assert synthetics(tmp_path, template).text == "A"
+
+    # Within the interval, changes are not detected.
+    synthetics_cache(interval=3600)
+    assert synthetics(tmp_path, template).text == "A"
+    synthetics_cache(interval=0)
+    assert synthetics(tmp_path, template).text == "B"
+
+
+def test_synthetics_cache_03(tmp_path):
+    synthetics_cache(maxsize=2)
+    templates = [_write_template(tmp_path, str(index), f"synthetics_cache_{index}.yaml") for index in range(3)]
+    start = synthetics_cache()
+    synthetics(tmp_path, templates[0])
+    synthetics(tmp_path, templates[1])
+    synthetics(tmp_path, templates[0])
+    synthetics(tmp_path, templates[2])
+
+    # The least recently used template is removed.
+    assert [key[1] for key in _TEMPLATES] == [templates[0], templates[2]]
+    info = synthetics_cache()
+    assert (info.evictions - start.evictions, info.size) == (1, 2)
+
+    # Filters are part of the key.
+    synthetics(tmp_path, templates[0], filters={"custom": str.upper})
+    assert synthetics_cache().size == 2
+    assert synthetics_cache().evictions - start.evictions == 2
+
+    info = synthetics_cache(maxsize=1)
+    assert (info.size, info.maxsize, info.evictions - start.evictions) == (1, 1, 3)
+    with pytest.raises(ValueError):
+        synthetics_cache(maxsize=0)
+
+
+def test_synthetics_cache_04(tmp_path):
+    synthetics_cache(interval=0)
+    template = _write_template(tmp_path, "A")
+    start = synthetics_cache()
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda _: synthetics(tmp_path, template).text, range(200)))
+    assert results == ["A"] * 200
+    info = synthetics_cache()
+    assert (info.misses - start.misses, info.hits - start.hits) == (1, 199)
+
+
+def test_synthetics_cache_05(tmp_path, monkeypatch):
+    slow = _write_template(tmp_path, "S", "synthetics_cache_slow.yaml")
+    template = _write_template(tmp_path, "A")
+    loading = threading.Event()
+    release = threading.Event()
+
+    class _SlowTemplate(_Template):
+        def __init__(self, datasource, template, filters=None):
+            if template == slow:
+                loading.set()
+                assert release.wait(10)
+            super().__init__(datasource, template, filters)
+
+    # While a template is loaded, lookups of other templates are not blocked.
+    monkeypatch.setattr(sys.modules[_Template.__module__], "_Template", _SlowTemplate)
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futures = [executor.submit(synthetics, tmp_path, slow) for _ in range(2)]
+        assert loading.wait(10)
+        assert synthetics(tmp_path, template).text == "A"
+        assert not any(future.done() for future in futures)
+        release.set()
+        assert [future.result(10).text for future in futures] == ["S", "S"]
+    assert synthetics_cache().size == 2
+    assert not _TEMPLATES.loading
+
+
+def test_synthetics_cache_benchmark_01(tmp_path):
+    template = _write_template(tmp_path, "A")
+    synthetics(tmp_path, template)
+    print()
+    for interval in (-1, _TEMPLATE_CACHE_INTERVAL, 0):
+        synthetics_cache(interval=interval)
+        start = perf_counter()
+        for _ in range(5000):
+            synthetics(tmp_path, template)
+        end = perf_counter()
+        print(f"Benchmark synthetics, cache interval {interval}: {(end - start) * 1000 / 5000:.4f} ms per call")
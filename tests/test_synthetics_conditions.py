@@ -0,0 +1,139 @@
+# tests/test_synthetics_conditions.py
+
+from seanox_ai_nlp.synthetics import synthetics, TemplateConditionException
+from seanox_ai_nlp.synthetics.synthetics import _TEMPLATES, _CONDITION_GLOBALS, _get_condition_names
+from time import perf_counter
+from types import CodeType
+
+import pytest
+import yaml
+
+_VARIANTS = 200
+
+
+def _create_template(path, variants: int = _VARIANTS) -> str:
+    templates = [
+        {
+            "name": f"Variant {index}",
+            "condition": f"value % {variants} == {index} and len(name) > 0 and name not in ('x', 'y')",
+            "template": f"{{{{ name }}}} {index}"
+        }
+        for index in range(variants)
+    ]
+    (path / "synthetics_conditions.yaml").write_text(yaml.safe_dump({"templates": templates}), encoding="utf-8")
+    return "synthetics_conditions.yaml"
+
+
+def test_synthetics_conditions_01(tmp_path):
+    template = _create_template(tmp_path)
+    for value in (0, 7, 199, 207):
+        assert synthetics(tmp_path, template, {"value": value, "name": "n"}).text == f"n {value % _VARIANTS}"
+    assert synthetics(tmp_path, template, {"value": 7, "name": "x"}).text == ""
+
+    # The conditions are compiled once when loading.
+    variants = next(value for key, value in _TEMPLATES.items() if key[:2] == (tmp_path, template)).variants
+    assert all(isinstance(code, CodeType) for name, _, condition, code, spans in variants.values())
+
+    with pytest.raises(TemplateConditionException) as exception:
+        synthetics(tmp_path, template, {"name": "n"})
+    assert "[Variant 0] Condition error (NameError)" in str(exception.value)
+
+
+def _get_template(path, template: str):
+    return next(value for key, value in _TEMPLATES.items() if key[:2] == (path, template))
+
+
+@pytest.mark.parametrize("condition, names", [
+    ("True", ()),
+    ("type != 'gas' and moons > 2", ("moons", "type")),
+    ("len(moons) > 0 and re.match('M', name)", ("len", "moons", "name")),
+    ("all(item > 1 for item in items)", ("all", "item", "items")),
+    ("random.random() > 0.5", None),
+    ("(count := len(items)) > 2", None),
+])
+def test_synthetics_conditions_02(condition, names):
+    assert _get_condition_names(condition) == names
+
+
+def test_synthetics_conditions_03(tmp_path):
+    templates = [
+        {"name": "A", "condition": "value > 1", "template": "A"},
+        {"name": "B", "condition": "value > 1", "template": "B"},
+        {"name": "C", "condition": "other == 'x'", "template": "C"},
+        {"name": "D", "condition": "value > 1 and other == 'x'", "template": "D"},
+        {"name": "E", "condition": "random.random() >= 0", "template": "E"},
+        {"name": "F", "condition": "len(items) == 2", "template": "F"}
+    ]
+    (tmp_path / "synthetics_index.yaml").write_text(yaml.safe_dump({"templates": templates}), encoding="utf-8")
+    synthetics(tmp_path, "synthetics_index.yaml", {"value": 0, "other": "", "items": []})
+    template = _get_template(tmp_path, "synthetics_index.yaml")
+
+    # Identical conditions are evaluated once, conditions with the same names
+    # share one memo.
+    groups = {group.names: [condition.indices for condition in group.conditions] for group in template.conditions}
+    assert groups == {
+        ("value",): [[0, 1]],
+        ("other",): [[2]],
+        ("other", "value"): [[3]],
+        None: [[4]],
+        ("items", "len"): [[5]]
+    }
+
+    def selection(data: dict) -> set[str]:
+        texts = set()
+        for _ in range(60):
+            texts.add(synthetics(tmp_path, "synthetics_index.yaml", data).text)
+        return texts
+
+    assert selection({"value": 2, "other": "", "items": []}) == {"A", "B", "E"}
+    assert selection({"value": 2, "other": "x", "items": [1, 2]}) == {"A", "B", "C", "D", "E", "F"}
+    assert selection({"value": 0, "other": "x", "items": (1, 2)}) == {"C", "E", "F"}
+    assert selection({"value": 2.0, "other": "x", "items": {1, 2}}) == {"A", "B", "C", "D", "E", "F"}
+
+    # Builtins can be overwritten by the data.
+    assert selection({"value": 0, "other": "", "items": [], "len": lambda items: 2}) == {"E", "F"}
+
+    # Memo per projection, unsupported values (sets, callables) are not memoised.
+    memos = {group.names: group.memo for group in template.conditions}
+    assert len(memos[("value",)]) == 3
+    assert len(memos[("other", "value")]) == 5
+    assert len(memos[("items", "len")]) == 3
+    assert memos[None] == {}
+
+
+def test_synthetics_conditions_benchmark_01(tmp_path):
+    template = _create_template(tmp_path)
+    synthetics(tmp_path, template, {"value": 0, "name": "n"})
+    variants = next(value for key, value in _TEMPLATES.items() if key[:2] == (tmp_path, template)).variants
+    samples = 200
+    context = {"value": 3, "name": "n"}
+
+    start = perf_counter()
+    for _ in range(samples):
+        for name, _, condition, code, spans in variants.values():
+            eval(condition, {"__builtins__": _CONDITION_GLOBALS["__builtins__"]}, context)
+    end = perf_counter()
+    print()
+    print(f"Benchmark variants: {len(variants)}, samples: {samples}")
+    print(f"Benchmark conditions as string: {(end - start) * 1000 / samples:.3f} ms per sample")
+
+    start = perf_counter()
+    for _ in range(samples):
+        for name, _, condition, code, spans in variants.values():
+            eval(code, _CONDITION_GLOBALS, context)
+    end = perf_counter()
+    print(f"Benchmark conditions as code: {(end - start) * 1000 / samples:.3f} ms per sample")
+
+    start = perf_counter()
+    for index in range(samples):
+        synthetics(tmp_path, template, {"value": index, "name": "n"})
+    end = perf_counter()
+    print(f"Benchmark synthetics, distinct values: {(end - start) * 1000 / samples:.3f} ms per sample")
+
+    # Records that only differ in data that the conditions do not read use the
+    # memoised selection.
+    start = perf_counter()
+    for index in range(samples):
+        synthetics(tmp_path, template, {"value": index % 20, "name": "n", "other": index})
+    end = perf_counter()
+    print(f"Benchmark synthetics, repeated values: {(end - start) * 1000 / samples:.3f} ms per sample")
@@ -0,0 +1,76 @@
+# tests/test_synthetics_entities.py
+
+from seanox_ai_nlp.synthetics.synthetics import _extract_entities, _annotate, _compile_span_pattern, _SPAN_PATTERN_CACHE_SIZE
+from time import perf_counter
+
+
+def test_synthetics_entities_01():
+    text = f"A {_annotate('Mars', 'planet')} and {_annotate('Mars Express', 'probe')}, {_annotate('', 'empty')}."
+    synthetic = _extract_entities(text)
+    assert synthetic.text == "A Mars and Mars Express, ."
+    assert "[[[empty]]]" not in text
+    assert synthetic.annotation == text
+    assert synthetic.entities == [(2, 6, "planet"), (11, 23, "probe")]
+    assert synthetic.spans == []
+    for start, end, label in synthetic.entities[:2]:
+        assert synthetic.text[start:end] in ("Mars", "Mars Express")
+
+    assert _extract_entities("") == _extract_entities("", {})
+    assert _extract_entities("no markers").text == "no markers"
+
+
+def test_synthetics_entities_02():
+    _compile_span_pattern.cache_clear()
+    patterns = {"PAIR": r"{$a} and {$b}"}
+
+    # Longer values are matched first, regardless of the order of occurrence.
+    text = f"{_annotate('X', 'a')} {_annotate('X Y', 'a')} and {_annotate('Z', 'b')}"
+    assert _extract_entities(text, patterns).spans == [(2, 11, "PAIR")]
+
+    # The same values in a different order use the cached pattern.
+    text = f"{_annotate('X Y', 'a')} and {_annotate('Z', 'b')} {_annotate('X', 'a')}"
+    assert _extract_entities(text, patterns).spans == [(0, 9, "PAIR")]
+    assert _compile_span_pattern.cache_info().currsize == 1
+
+    # Labels that are not used in the pattern are not part of the key.
+    text = f"{_annotate('X', 'a')} and {_annotate('Z', 'b')} {_annotate('Q', 'c')}"
+    assert _extract_entities(text, patterns).spans == [(0, 7, "PAIR")]
+    text = f"{_annotate('X', 'a')} and {_annotate('Z', 'b')} {_annotate('R', 'c')}"
+    assert _extract_entities(text, patterns).spans == [(0, 7, "PAIR")]
+    assert _compile_span_pattern.cache_info().currsize == 2
+    assert _compile_span_pattern.cache_info().maxsize == _SPAN_PATTERN_CACHE_SIZE
+
+    # Patterns with unknown labels are ignored.
+    assert _extract_entities(text, {"NONE": r"{$x}"}).spans == []
+
+
+def test_synthetics_entities_benchmark_01():
+    patterns = {"PAIR": r"{$planet} \({$moon}"}
+    for count in (1000, 10000):
+        text = " ".join(
+            f"{_annotate(f'Planet {index % 8}', 'planet')} ({_annotate(f'Moon {index % 5}', 'moon')})"
+            for index in range(count)
+        )
+        start = perf_counter()
+        synthetic = _extract_entities(text, patterns)
+        end = perf_counter()
+        assert len(synthetic.entities) == count * 2
+        assert len(synthetic.spans) == count
+        print()
+        print(f"Benchmark entities: {count * 2}, extraction: {(end - start) * 1000:.2f} ms")
+
+
+def test_synthetics_entities_benchmark_02():
+
+    # Many small samples with recurring values use the cached span patterns.
+    patterns = {"PAIR": r"{$planet} \({$moon}"}
+    texts = [
+        f"{_annotate(f'Planet {index % 8}', 'planet')} ({_annotate(f'Moon {index % 5}', 'moon')}) is visible."
+        for index in range(5000)
+    ]
+    start = perf_counter()
+    for text in texts:
+        assert len(_extract_entities(text, patterns).spans) == 1
+    end = perf_counter()
+    print()
+    print(f"Benchmark samples: {len(texts)}, extraction: {(end - start) * 1000:.2f} ms")
@@ -0,0 +1,86 @@
+# tests/test_synthetics_markers.py
+
+from seanox_ai_nlp.synthetics import synthetics, synthetics_batch, synthetics_parallel
+from seanox_ai_nlp.synthetics.synthetics import _TEMPLATES, _extract_entities
+from time import perf_counter
+from pathlib import Path
+
+import json
+import random
+import pytest
+import yaml
+
+TESTS_PATH = Path("./tests") if Path("./tests").is_dir() else Path(".")
+
+
+def _load_datas(filename: str) -> list[dict]:
+    with open(TESTS_PATH / filename, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def _generate(template: str, datas: list[dict], markers: bool) -> list:
+    synthetics(TESTS_PATH, template, datas[0])
+    next(value for key, value in _TEMPLATES.items() if key[:2] == (TESTS_PATH, template)).registry.clear()
+    return list(synthetics_batch(TESTS_PATH, template, datas, rng=random.Random(1), markers=markers))
+
+
+@pytest.mark.parametrize("template, datas", [
+    ("synthetics_en_annotate.yaml", "synthetics-planets_en.json"),
+    ("synthetics_de_annotate.yaml", "synthetics-planets_de.json")
+])
+def test_synthetics_markers_01(template, datas):
+    datas = _load_datas(datas) * 5
+    expected = _generate(template, datas, True)
+    results = _generate(template, datas, False)
+    assert any(result.entities for result in results)
+    assert any(result.spans for result in results)
+    for result, synthetic in zip(results, expected):
+        assert result.annotation == ""
+        assert (result.text, result.entities, result.spans) == (synthetic.text, synthetic.entities, synthetic.spans)
+        assert "\ufdd0" not in result.text and "\ufdd1" not in result.text
+
+    parallel = list(synthetics_parallel(TESTS_PATH, template, datas, workers=1, markers=False))
+    assert all(result.annotation == "" and result.text for result in parallel)
+
+
+def test_synthetics_markers_02():
+    for index in (4, 5):
+        expected = synthetics(TESTS_PATH, "synthetics_spans_expression.yaml", {"template": index})
+        result = synthetics(TESTS_PATH, "synthetics_spans_expression.yaml", {"template": index}, markers=False)
+        assert (result.text, result.entities, result.spans) == (expected.text, expected.entities, expected.spans)
+
+
+def test_synthetics_markers_03(tmp_path):
+    templates = [{
+        "name": "Markers",
+        "condition": "True",
+        "template": (
+            "{{ 'a' | annotate('x') }} {{ ' ' | annotate('x') }} {{ 'b' | annotate('') }}"
+            " {{ 'c' | annotate('y') | upper }} {{ 'd' | annotate('x') }}{{ items | map('annotate', 'z') | join(', ') }}"
+        )
+    }]
+    (tmp_path / "synthetics_markers.yaml").write_text(yaml.safe_dump({"templates": templates}), encoding="utf-8")
+    data = {"items": [1, 2]}
+    expected = synthetics(tmp_path, "synthetics_markers.yaml", data)
+    result = synthetics(tmp_path, "synthetics_markers.yaml", data, markers=False)
+    assert result.text == expected.text == "a   b C d1, 2"
+    assert result.entities == [(0, 1, "x"), (6, 7, "y"), (8, 9, "x"), (9, 10, "z"), (12, 13, "z")]
+
+    # Filters applied to annotated values also apply to the markers, but not
+    # to the sentinels.
+    assert expected.entities[1] == (6, 7, "Y")
+
+    # Without labels in the context, the text is taken over unchanged.
+    assert _extract_entities("\ufdd0", None, {}).text == "\ufdd0"
+
+
+def test_synthetics_markers_benchmark_01():
+    datas = _load_datas("synthetics-planets_en.json") * 300
+    _generate("synthetics_en_annotate.yaml", datas[:1], True)
+    print()
+    print(f"Benchmark iterations: {len(datas)} x")
+    for markers in (True, False):
+        start = perf_counter()
+        _generate("synthetics_en_annotate.yaml", datas, markers)
+        end = perf_counter()
+        print(f"Benchmark synthetics_batch, markers={markers}: {(end - start) * 1000:.2f} ms")
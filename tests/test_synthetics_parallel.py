@@ -0,0 +1,84 @@
+# tests/test_synthetics_parallel.py
+
+from seanox_ai_nlp.synthetics import synthetics, synthetics_parallel, Synthetic, TemplateConditionException
+from seanox_ai_nlp.synthetics.synthetics import _get_template
+from time import perf_counter
+from pathlib import Path
+
+import json
+import os
+import random
+import pytest
+
+TESTS_PATH = Path("./tests") if Path("./tests").is_dir() else Path(".")
+
+
+def _load_datas(filename: str) -> list[dict]:
+    with open(TESTS_PATH / filename, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def test_synthetics_parallel_01():
+    datas = _load_datas("synthetics-planets_de.json") * 40
+
+    # Identical results for a seed regardless of the number of workers.
+    results = list(synthetics_parallel(TESTS_PATH, "synthetics_de_annotate.yaml", datas, seed=7, workers=1, chunk_size=32))
+    assert len(results) == len(datas)
+    assert all(isinstance(result, Synthetic) and result.text for result in results)
+    for workers in (2, 3):
+        assert list(synthetics_parallel(
+            TESTS_PATH, "synthetics_de_annotate.yaml", iter(datas), seed=7, workers=workers, chunk_size=32
+        )) == results
+
+    # Other seeds produce other results.
+    assert list(synthetics_parallel(
+        TESTS_PATH, "synthetics_de_annotate.yaml", datas, seed=8, workers=1, chunk_size=32
+    )) != results
+
+
+def test_synthetics_parallel_02():
+    datas = _load_datas("synthetics-planets_en.json")
+
+    # The global random state of the caller is not changed by the generation.
+    synthetics_parallel(TESTS_PATH, "synthetics_en_annotate.yaml", [])
+    state = random.getstate()
+    results = list(synthetics_parallel(TESTS_PATH, "synthetics_en_annotate.yaml", datas, workers=1))
+    assert random.getstate() == state
+    assert results == list(synthetics_parallel(TESTS_PATH, "synthetics_en_annotate.yaml", datas, workers=1))
+
+    assert list(synthetics_parallel(TESTS_PATH, "synthetics_en_annotate.yaml", [], workers=2)) == []
+    assert list(synthetics_parallel(TESTS_PATH, "", [{}], workers=2)) == [Synthetic("", "", [], [])]
+    with pytest.raises(FileNotFoundError):
+        synthetics_parallel(TESTS_PATH, "synthetics_unknown.yaml", datas)
+    with pytest.raises(ValueError):
+        synthetics_parallel(TESTS_PATH, "synthetics_en_annotate.yaml", datas, chunk_size=0)
+    with pytest.raises(TemplateConditionException):
+        list(synthetics_parallel(TESTS_PATH, "synthetics_en_annotate.yaml", [{}], workers=2))
+
+
+def test_synthetics_parallel_03():
+    datas = _load_datas("synthetics-planets_en.json")
+
+    # In the current process, the registry of the recently used variants of
+    # the cached template is not changed by the chunks.
+    for data in datas:
+        synthetics(TESTS_PATH, "synthetics_en_annotate.yaml", data)
+    registry = _get_template(TESTS_PATH, "synthetics_en_annotate.yaml").registry
+    expected = list(registry)
+    assert expected
+    results = list(synthetics_parallel(TESTS_PATH, "synthetics_en_annotate.yaml", datas, seed=3, workers=1))
+    assert list(registry) == expected
+    registry.clear()
+    assert list(synthetics_parallel(TESTS_PATH, "synthetics_en_annotate.yaml", datas, seed=3, workers=1)) == results
+
+
+def test_synthetics_parallel_benchmark_01():
+    datas = _load_datas("synthetics-planets_de.json") * 1000
+    print()
+    print(f"Benchmark iterations: {len(datas)} x")
+    for workers in sorted({1, os.cpu_count() or 1}):
+        start = perf_counter()
+        for _ in synthetics_parallel(TESTS_PATH, "synthetics_de_annotate.yaml", datas, workers=workers):
+            pass
+        end = perf_counter()
+        print(f"Benchmark synthetics_parallel, {workers} workers: {(end - start) * 1000:.2f} ms")
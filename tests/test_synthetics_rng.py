@@ -0,0 +1,83 @@
+# tests/test_synthetics_rng.py
+
+from seanox_ai_nlp.synthetics import synthetics, synthetics_batch
+from seanox_ai_nlp.synthetics.synthetics import _random_range, _random_set
+from time import perf_counter
+from pathlib import Path
+
+import json
+import random
+import yaml
+
+TESTS_PATH = Path("./tests") if Path("./tests").is_dir() else Path(".")
+
+
+def _load_datas(filename: str) -> list[dict]:
+    with open(TESTS_PATH / filename, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def _generate(datas: list[dict], seed: int) -> list:
+    rng = random.Random(seed)
+    return [synthetics(TESTS_PATH, "synthetics_en_annotate.yaml", data, rng=rng) for data in datas]
+
+
+def test_synthetics_rng_01():
+    datas = _load_datas("synthetics-planets_en.json") * 5
+    synthetics(TESTS_PATH, "synthetics_en_annotate.yaml", datas[0])
+
+    # The global random state is not used.
+    state = random.getstate()
+    expected = _generate(datas, 1)
+    assert random.getstate() == state
+    random.seed(99)
+    assert _generate(datas, 1) == expected
+    assert _generate(datas, 2) != expected
+
+    # Calls without and with other generators do not change the sequence.
+    rng = random.Random(1)
+    results = []
+    for data in datas:
+        synthetics(TESTS_PATH, "synthetics_en_annotate.yaml", data)
+        synthetics(TESTS_PATH, "synthetics_en_annotate.yaml", data, rng=random.Random(2))
+        results.append(synthetics(TESTS_PATH, "synthetics_en_annotate.yaml", data, rng=rng))
+    assert results == expected
+    _generate([], 1)
+    assert list(synthetics_batch(TESTS_PATH, "synthetics_en_annotate.yaml", datas, rng=random.Random(1))) == expected
+
+
+def test_synthetics_rng_02(tmp_path):
+    templates = [{
+        "name": "Random",
+        "condition": "random.random() >= 0",
+        "template": (
+            "{{ items | random }} {{ items | random_set(2) }} {{ items | random_range }}"
+            " {{ items | random_range_join('-') }} {{ items | random_range_join_phrase(', ', ' and ') }}"
+        )
+    }]
+    (tmp_path / "synthetics_rng.yaml").write_text(yaml.safe_dump({"templates": templates}), encoding="utf-8")
+    data = {"items": list(range(20))}
+    texts = {synthetics(tmp_path, "synthetics_rng.yaml", data, rng=random.Random(5)).text for _ in range(10)}
+    assert len(texts) == 1
+    assert synthetics(tmp_path, "synthetics_rng.yaml", data, rng=random.Random(6)).text not in texts
+
+    assert _random_range([1, 2, 3], rng=random.Random(1)) == _random_range([1, 2, 3], rng=random.Random(1))
+    assert _random_set(list(range(10)), 3, random.Random(1)) == _random_set(list(range(10)), 3, random.Random(1))
+
+
+def test_synthetics_rng_benchmark_01():
+    datas = _load_datas("synthetics-planets_de.json") * 500
+    synthetics(TESTS_PATH, "synthetics_de_annotate.yaml", datas[0])
+    print()
+    print(f"Benchmark iterations: {len(datas)} x")
+    start = perf_counter()
+    for data in datas:
+        synthetics(TESTS_PATH, "synthetics_de_annotate.yaml", data)
+    end = perf_counter()
+    print(f"Benchmark synthetics, random module: {(end - start) * 1000:.2f} ms")
+    rng = random.Random(1)
+    start = perf_counter()
+    for data in datas:
+        synthetics(TESTS_PATH, "synthetics_de_annotate.yaml", data, rng=rng)
+    end = perf_counter()
+    print(f"Benchmark synthetics, rng: {(end - start) * 1000:.2f} ms")
@@ -0,0 +1,163 @@
+# tests/test_synthetics_writers.py
+
+from seanox_ai_nlp.synthetics import synthetics_batch, Synthetic, write_jsonl, write_parquet, write_docbin
+from time import perf_counter
+from pathlib import Path
+
+import itertools
+import json
+import random
+import pytest
+
+TESTS_PATH = Path("./tests") if Path("./tests").is_dir() else Path(".")
+
+
+def _create_samples(count: int) -> list[Synthetic]:
+    with open(TESTS_PATH / "synthetics-planets_en.json", encoding="utf-8") as file:
+        datas = json.load(file)
+    records = itertools.islice(itertools.cycle(datas), count)
+    return list(synthetics_batch(TESTS_PATH, "synthetics_en_annotate.yaml", records, rng=random.Random(1)))
+
+
+def _read_jsonl(files: list[str]) -> list[Synthetic]:
+    samples = []
+    for file in files:
+        with open(file, encoding="utf-8") as lines:
+            for line in lines:
+                data = json.loads(line)
+                samples.append(Synthetic(
+                    data["text"],
+                    data["annotation"],
+                    [tuple(entity) for entity in data["entities"]],
+                    [tuple(span) for span in data["spans"]]
+                ))
+    return samples
+
+
+def test_synthetics_writers_jsonl_01(tmp_path):
+    samples = _create_samples(100)
+    assert any(sample.spans for sample in samples)
+
+    files = write_jsonl(iter(samples), tmp_path / "synthetics.jsonl", chunk_size=7)
+    assert files == [str(tmp_path / "synthetics.jsonl")]
+    assert _read_jsonl(files) == samples
+
+    # Shards are rotated before the size is exceeded, with at least one sample.
+    files = write_jsonl(samples, tmp_path / "sharded.jsonl", shard_size=2000, chunk_size=7)
+    assert len(files) > 1
+    assert files[0] == str(tmp_path / "sharded-00000.jsonl")
+    assert files[-1] == str(tmp_path / f"sharded-{len(files) - 1:05d}.jsonl")
+    assert all(Path(file).stat().st_size <= 2000 or len(_read_jsonl([file])) == 1 for file in files)
+    assert _read_jsonl(files) == samples
+    files = write_jsonl(samples[:3], tmp_path / "small.jsonl", shard_size=1)
+    assert len(files) == 3
+    assert _read_jsonl(files) == samples[:3]
+
+    assert write_jsonl([], tmp_path / "empty.jsonl") == []
+    assert not (tmp_path / "empty.jsonl").exists()
+    with pytest.raises(ValueError):
+        write_jsonl(samples, tmp_path / "error.jsonl", shard_size=0)
+    with pytest.raises(ValueError):
+        write_jsonl(samples, tmp_path / "error.jsonl", chunk_size=0)
+
+
+def test_synthetics_writers_jsonl_02(tmp_path):
+
+    # Generators are consumed as a stream.
+    consumed = []
+
+    def generate():
+        for sample in _create_samples(50):
+            consumed.append(sample)
+            yield sample
+
+    files = write_jsonl(generate(), tmp_path / "synthetics.jsonl", chunk_size=10)
+    assert len(_read_jsonl(files)) == len(consumed) == 50
+
+
+def test_synthetics_writers_parquet_01(tmp_path):
+    pytest.importorskip("pyarrow")
+    parquet = pytest.importorskip("pyarrow.parquet")
+    samples = _create_samples(300)
+
+    def read(files: list[str]) -> list[Synthetic]:
+        return [
+            Synthetic(
+                row["text"],
+                row["annotation"],
+                [(entity["start"], entity["end"], entity["label"]) for entity in row["entities"]],
+                [(span["start"], span["end"], span["label"]) for span in row["spans"]]
+            )
+            for file in files
+            for row in parquet.read_table(file).to_pylist()
+        ]
+
+    files = write_parquet(samples, tmp_path / "synthetics.parquet", chunk_size=64)
+    assert files == [str(tmp_path / "synthetics.parquet")]
+    assert parquet.ParquetFile(files[0]).num_row_groups == 5
+    assert parquet.read_table(files[0]).column_names == ["text", "annotation", "entities", "spans"]
+    assert read(files) == samples
+
+    files = write_parquet(iter(samples), tmp_path / "sharded.parquet", shard_size=1, chunk_size=64)
+    assert files == [str(tmp_path / f"sharded-{index:05d}.parquet") for index in range(5)]
+    assert read(files) == samples
+
+    assert write_parquet([], tmp_path / "empty.parquet") == []
+
+
+def test_synthetics_writers_docbin_01(tmp_path):
+    spacy = pytest.importorskip("spacy")
+    from spacy.tokens import DocBin
+
+    nlp = spacy.blank("en")
+    samples = _create_samples(100)
+    files = write_docbin(iter(samples), tmp_path / "synthetics.spacy", nlp)
+    assert files == [str(tmp_path / "synthetics.spacy")]
+
+    docs = list(DocBin().from_disk(files[0]).get_docs(nlp.vocab))
+    assert len(docs) == len(samples)
+
+    # The blank tokenizer does not split all entities, e.g. values with units,
+    # such entities are skipped.
+    count = 0
+    for doc, sample in zip(docs, samples):
+        assert doc.text == sample.text
+        entities = [(entity.start_char, entity.end_char, entity.label_) for entity in doc.ents]
+        assert set(entities) <= set(sample.entities)
+        spans = [(span.start_char, span.end_char, span.label_) for span in doc.spans.get("sc", [])]
+        assert set(spans) <= set(sample.spans)
+        count += len(entities)
+    assert count > sum(len(sample.entities) for sample in samples) * 0.9
+
+    files = write_docbin(samples, tmp_path / "sharded.spacy", nlp, spans_key="spans", shard_size=2000)
+    assert len(files) > 1
+    docs = [doc for file in files for doc in DocBin().from_disk(file).get_docs(nlp.vocab)]
+    assert [doc.text for doc in docs] == [sample.text for sample in samples]
+    assert any(doc.spans.get("spans") for doc in docs)
+
+    # Entities that cannot be aligned to tokens are skipped.
+    sample = Synthetic("Mars and Venus", "", [(0, 4, "planet"), (9, 11, "planet")], [])
+    files = write_docbin([sample], tmp_path / "alignment.spacy", nlp)
+    doc = next(DocBin().from_disk(files[0]).get_docs(nlp.vocab))
+    assert [entity.text for entity in doc.ents] == ["Mars"]
+    files = write_docbin([sample], tmp_path / "alignment.spacy", nlp, alignment_mode="expand")
+    doc = next(DocBin().from_disk(files[0]).get_docs(nlp.vocab))
+    assert [entity.text for entity in doc.ents] == ["Mars", "Venus"]
+
+
+def test_synthetics_writers_benchmark_01(tmp_path):
+    samples = _create_samples(1000) * 20
+    print()
+    print(f"Benchmark samples: {len(samples)}")
+    start = perf_counter()
+    files = write_jsonl(samples, tmp_path / "synthetics.jsonl", shard_size=1024 * 1024)
+    end = perf_counter()
+    print(f"Benchmark write_jsonl: {(end - start) * 1000:.2f} ms, {len(files)} shards")
+    try:
+        import pyarrow
+    except ImportError:
+        return
+    start = perf_counter()
+    files = write_parquet(samples, tmp_path / "synthetics.parquet", shard_size=1024 * 1024)
+    end = perf_counter()
+    print(f"Benchmark write_parquet: {(end - start) * 1000:.2f} ms, {len(files)} shards")
@@ -0,0 +1,58 @@
+# tests/test_units_async.py
+
+from seanox_ai_nlp.units import units, units_async, spacing, spacing_async, SpacingMode
+from concurrent.futures import ThreadPoolExecutor
+
+import asyncio
+import pytest
+
+_TEXT = (
+    "The cruising speed of the Boeing 747 is approximately 900 - 950 km/h (559 mph)."
+    " It is typically expressed in kilometers per hour (km/h) and miles per hour (mph)."
+)
+
+
+def test_units_async_01():
+    # short texts are processed inline
+    assert asyncio.run(units_async(_TEXT)) == units(_TEXT)
+    assert asyncio.run(units_async("")) == []
+
+
+def test_units_async_02():
+    # long texts are processed in the executor
+    text = _TEXT * 10
+    assert asyncio.run(units_async(text, threshold=0)) == units(text)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        assert asyncio.run(units_async(text, executor=executor, threshold=0)) == units(text)
+        # executor and threshold are positional as before, options keyword-only
+        assert asyncio.run(units_async(text, executor, 0)) == units(text)
+        with pytest.raises(TypeError):
+            asyncio.run(units_async(text, executor, 0, None))
+
+
+def test_units_async_03():
+    # more concurrent calls than the executor processes at the same time
+    async def run():
+        texts = [_TEXT * index for index in range(1, 25)]
+        results = await asyncio.gather(*(units_async(text, threshold=0) for text in texts))
+        return texts, results
+    texts, results = asyncio.run(run())
+    assert results == [units(text) for text in texts]
+
+
+def test_units_async_04():
+    async def run():
+        task = asyncio.create_task(units_async(_TEXT * 1000, threshold=0))
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        # after cancellation, the executor is still usable
+        return await units_async(_TEXT, threshold=0)
+    assert asyncio.run(run()) == units(_TEXT)
+
+
+def test_spacing_async_01():
+    text = "10  km and 20   kg"
+    assert asyncio.run(spacing_async(text)) == spacing(text)
+    assert asyncio.run(spacing_async(text, SpacingMode.ALL, threshold=0)) == spacing(text, SpacingMode.ALL)
@@ -0,0 +1,96 @@
+# tests/test_units_batch.py
+
+from seanox_ai_nlp.units import units, units_parquet, NumericLocale
+from seanox_ai_nlp.units.batch import main
+from time import perf_counter
+
+import pytest
+
+pyarrow = pytest.importorskip("pyarrow")
+parquet = pytest.importorskip("pyarrow.parquet")
+
+_TEXTS = [
+    "Die Batterie hält ca. 10h bei −20.5 °C.",
+    "Der Reifendruck liegt bei 2500hPa, empfohlen sind aber nur 2.5 bar.",
+    None,
+    "",
+    "Input voltage 220 - 240 V, 50 Hz and 1,500 W.",
+    "Keine Einheiten hier."
+]
+
+
+def _create_source(path, count=1, row_group_size=2):
+    texts = _TEXTS * count
+    table = pyarrow.table({
+        "id": [f"doc-{index}" for index in range(len(texts))],
+        "text": texts
+    })
+    parquet.write_table(table, path, row_group_size=row_group_size)
+    return texts
+
+
+def _expected(texts, locales=None):
+    return [
+        (row, f"doc-{row}", entity.label, entity.start, entity.end, entity.text, entity.unit, entity.value)
+        for row, text in enumerate(texts) if text
+        for entity in units(text, locales)
+    ]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_units_batch_01(tmp_path, workers):
+    source = tmp_path / "source.parquet"
+    target = tmp_path / "target.parquet"
+    texts = _create_source(source)
+    count = units_parquet(str(source), str(target), id_column="id", workers=workers)
+    table = parquet.read_table(target)
+    assert count == table.num_rows == len(_expected(texts))
+    assert table.column_names == [
+        "source", "row", "id", "label", "start", "end", "text", "unit", "value", "categories"
+    ]
+    rows = table.to_pylist()
+    assert [
+        (row["row"], row["id"], row["label"], row["start"], row["end"], row["text"], row["unit"], row["value"])
+        for row in rows
+    ] == _expected(texts)
+    assert rows[0]["categories"] == list(units(texts[0])[0].categories)
+
+
+def test_units_batch_02(tmp_path):
+    (tmp_path / "source").mkdir()
+    _create_source(tmp_path / "source" / "a.parquet")
+    texts = _create_source(tmp_path / "source" / "b.parquet", row_group_size=4)
+    target = tmp_path / "target.parquet"
+    count = units_parquet(str(tmp_path / "source"), str(target), locales=[NumericLocale.EN], workers=1)
+    table = parquet.read_table(target)
+    assert count == len(_expected(texts, [NumericLocale.EN])) * 2
+    assert table.column_names[:3] == ["source", "row", "label"]
+    assert sorted(set(table.column("source").to_pylist())) == [
+        str(tmp_path / "source" / "a.parquet"), str(tmp_path / "source" / "b.parquet")
+    ]
+
+
+def test_units_batch_03(tmp_path, capsys):
+    source = tmp_path / "source.parquet"
+    target = tmp_path / "target.parquet"
+    texts = _create_source(source)
+    assert main([str(source), str(target), "--workers", "1", "--locale", "DE"]) == 0
+    assert f"{len(_expected(texts, [NumericLocale.DE]))} units + measures" in capsys.readouterr().out
+    assert main([str(source), str(target), "--column", "content"]) == 1
+    assert "Column not found" in capsys.readouterr().err
+    assert main([str(tmp_path / "missing"), str(target)]) == 1
+    with pytest.raises(FileNotFoundError):
+        units_parquet(str(tmp_path / "missing"), str(target))
+
+
+def test_units_batch_benchmark_01(tmp_path):
+    source = tmp_path / "source.parquet"
+    _create_source(source, count=2000, row_group_size=1000)
+    for workers in (1, 4):
+        start = perf_counter()
+        count = units_parquet(str(source), str(tmp_path / "target.parquet"), workers=workers)
+        end = perf_counter()
+        print()
+        print(f"Benchmark workers: {workers}")
+        print(f"Benchmark detections: {count} units + measures")
+        print(f"Benchmark duration: {(end - start) * 1000:.2f} ms")
@@ -0,0 +1,98 @@
+# tests/test_units_bytes.py
+
+from seanox_ai_nlp.units import (
+    units, units_bytes, char_offsets, numeric_bytes_patterns, NumericLocale
+)
+from seanox_ai_nlp.units.buffers import _get_ranges
+from time import perf_counter
+
+import pytest
+import re
+
+_TEXT = (
+    "Die Größe beträgt 10 µm, der Widerstand 4,7 kΩ und die Fläche 3 m²."
+    " Die Verpackung hat Maße von 35×22×12 cm, Ärger 5 m, Gewicht 12 345 kg."
+    " Der Reifendruck liegt bei 2500hPa, bei −20.5 °C sind es nur 2.5 bar."
+    " Die Geschwindigkeit beträgt 50km/h, das Volumen 9.24 l und 1’250 kg."
+)
+
+
+def test_units_bytes_01():
+    buffer = "Die Größe beträgt 10 µm".encode("utf-8")
+    entities = units_bytes(buffer)
+    assert [(entity.start, entity.end, entity.text) for entity in entities] == [(21, 27, "10 µm")]
+    entities = char_offsets(buffer, entities)
+    assert [(entity.start, entity.end, entity.text) for entity in entities] == [(18, 23, "10 µm")]
+    assert units_bytes(b"") == []
+    assert char_offsets(buffer, []) == []
+
+
+@pytest.mark.parametrize("locales", [None, [NumericLocale.DE], [NumericLocale.EN, NumericLocale.CH]])
+def test_units_bytes_02(locales):
+    buffer = _TEXT.encode("utf-8")
+    entities = units(_TEXT, locales)
+    assert entities
+    for data in (buffer, bytearray(buffer), memoryview(buffer)):
+        assert char_offsets(data, units_bytes(data, locales)) == entities
+    for entity in units_bytes(buffer, locales):
+        assert buffer[entity.start:entity.end].decode("utf-8") == entity.text
+
+
+def test_units_bytes_03():
+    buffer = memoryview(_TEXT.encode("utf-8"))
+    offset = len("Die Größe beträgt ".encode("utf-8"))
+    entities = units_bytes(buffer[offset:])
+    assert entities[0].start == 0
+    assert entities[0].text == "10 µm"
+    assert numeric_bytes_patterns().numeric_validation.match("1’234".encode("utf-8"))
+    assert not numeric_bytes_patterns([NumericLocale.DE]).numeric_validation.match("1’234".encode("utf-8"))
+    with pytest.raises(ValueError):
+        numeric_bytes_patterns([])
+
+
+@pytest.mark.parametrize("atom", [
+    "\\d", "\\D", "\\w", "\\W", "\\s", "\\S", ".",
+    "[\\u00B1+\\-,\\.\\u2019\\w\\d]", "[^\\w\\u00B7\\u002F]", "[\\W\\d]", "[]a-c]", "[\\uD7FF-\\uE001]"
+])
+def test_units_bytes_04(atom):
+    # The ranges of classes are translated directly, they must correspond to
+    # the characters that the str class matches.
+    # Surrogates cannot be encoded in UTF-8 and are never included.
+    pattern = re.compile(atom)
+    ranges = _get_ranges(atom)
+    for code in (*range(0x3100), *range(0xD700, 0xE100), *range(0x1D7C0, 0x1D800), 0x10FFFF):
+        expected = not 0xD800 <= code <= 0xDFFF and pattern.fullmatch(chr(code)) is not None
+        assert any(low <= code <= high for low, high in ranges) == expected, hex(code)
+
+
+@pytest.mark.parametrize("locales", [None, [NumericLocale.DE]])
+def test_units_bytes_05(locales):
+    # Names are matched case-insensitively, also with case variants outside
+    # of ASCII (Ä, ẞ, ſ), as with units().
+    text = (
+        "Das Flugzeug fliegt 900 Kilometer pro Stunde, 3 FUSS und 5 FU\u1E9E, 2 ATMOSPH\u00C4REN,"
+        " 5 \u017Feconds, bits per second and 20 km/h."
+    )
+    buffer = text.encode("utf-8")
+    entities = units(text, locales, names=True)
+    assert [entity.unit for entity in entities] == ["km/h", "ft", "ft", "atm", "s", "Bit/s", "km/h"]
+    assert char_offsets(buffer, units_bytes(buffer, locales, names=True)) == entities
+    assert char_offsets(buffer, units_bytes(buffer, locales)) == units(text, locales)
+    with pytest.raises(ValueError):
+        units_bytes(buffer, [], names=True)
+
+
+def test_units_bytes_benchmark_01():
+    text = _TEXT * 100
+    buffer = text.encode("utf-8")
+    units(text)
+    units_bytes(buffer)
+    start = perf_counter()
+    entities = units(buffer.decode("utf-8"))
+    end = perf_counter()
+    print()
+    print(f"Benchmark units(decode): {len(entities)} units + measures, {(end - start) * 1000:.2f} ms")
+    start = perf_counter()
+    entities = units_bytes(buffer)
+    end = perf_counter()
+    print(f"Benchmark units_bytes: {len(entities)} units + measures, {(end - start) * 1000:.2f} ms")
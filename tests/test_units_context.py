@@ -0,0 +1,88 @@
+# tests/test_units_context.py
+
+from seanox_ai_nlp.units import units, units_bytes, units_incremental
+from seanox_ai_nlp.units.units import _get_context_scores
+from time import perf_counter
+
+import random
+import pytest
+
+
+@pytest.mark.parametrize("text, categories", [
+    ("The file has a size of 5 GB.", ("it", "storage")),
+    ("Die Datei ist 5 GB groß.", ("it", "storage")),
+    ("The noise level rose by 2 B.", ("acoustics",)),
+    ("Der Lärm stieg um 2 B.", ("acoustics",)),
+    ("The ship travels at 25 kt in strong wind.", ("speed",)),
+    ("Das Schiff fährt mit 25 kt.", ("speed",)),
+    ("The bomb had a yield of 15 kt TNT.", ("mass",)),
+    ("Die Ernte betrug 40 dz Weizen.", ("mass",)),
+    ("Wir kaufen 3 dz Eier.", ("quantity",)),
+    ("Es sind 3 dz.", ("quantity",)),
+    ("Die Datei hat 3 dz.", ("quantity",)),
+    ("The transfer rate is 100 MB/s.", ("acoustics", "it", "storage", "time")),
+    ("It is 5 GB.", ("acoustics", "it", "storage")),
+    ("The file with 5 GB makes noise.", ("acoustics", "it", "storage")),
+    ("The file and the disk with 5 GB makes noise.", ("it", "storage")),
+    ("Download 100 MB/s", ("it", "storage", "time")),
+    ("The wind blows 25 m/s.", ("length", "time")),
+])
+def test_units_context_01(text, categories):
+    entities = [entity for entity in units(text) if entity.label == "MEASURE"]
+    assert len(entities) == 1
+    assert entities[0].categories == categories
+
+
+def test_units_context_02():
+
+    # Cues outside the context window have no effect.
+    text = "noise " + "x" * 60 + " 5 GB"
+    assert units(text)[0].categories == ("acoustics", "it", "storage")
+    text = "5 GB " + "x" * 60 + " noise"
+    assert units(text)[0].categories == ("acoustics", "it", "storage")
+    text = "noise " + "x" * 30 + " 5 GB"
+    assert units(text)[0].categories == ("acoustics",)
+
+    # The scores are cached per symbol and cue.
+    memo = _get_context_scores.__self__
+    memo.clear()
+    units("The file has 5 GB, the disk 10 GB, the file 20 GB.")
+    assert set(memo) == {("B", "file"), ("B", "disk")}
+
+
+def test_units_context_03():
+    text = (
+        "Die Datei hat 5 GB. Der Lärm steigt um 2 B. Über den Gräben weht Wind mit 25 kt."
+        " Grüße, Maße und Größen: 40 dz Weizen, 3 dz Eier und 15 kt TNT."
+    )
+    buffer = text.encode("utf-8")
+    entities = units(text)
+    assert [entity.categories for entity in units_bytes(buffer)] == [entity.categories for entity in entities]
+    assert [entity.categories for entity in units_bytes(memoryview(buffer)[:])] == [entity.categories for entity in entities]
+
+
+@pytest.mark.parametrize("seed", [1, 2])
+def test_units_context_04(seed):
+    pieces = ["5 GB", "2 B", "25 kt", "3 dz", " ", "noise ", "file ", "wind ", "TNT ", "Eier ", "x", "."]
+    generator = random.Random(seed)
+    text = " ".join(generator.choice(pieces) for _ in range(80))
+    entities = units(text)
+    for _ in range(300):
+        offset = generator.randrange(len(text) + 1)
+        deleted = generator.randrange(min(8, len(text) - offset) + 1)
+        inserted = "".join(generator.choice(pieces) for _ in range(generator.randrange(3)))
+        entities = units_incremental(text, entities, offset, deleted, inserted, margin=8)
+        text = text[:offset] + inserted + text[offset + deleted:]
+        assert entities == units(text), f"Edit {offset}, {deleted}, {inserted!r}"
+
+
+def test_units_context_benchmark_01():
+    text = " ".join(["The file has 5 GB and the wind blows at 25 kt, the road is 12 km long."] * 2000)
+    units(text)
+    start = perf_counter()
+    entities = units(text)
+    end = perf_counter()
+    assert len(entities) == 6000
+    print()
+    print(f"Benchmark units with context: {(end - start) * 1000:.2f} ms")
+    print(f"Benchmark context scores: {len(_get_context_scores.__self__)} cached")
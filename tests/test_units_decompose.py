@@ -0,0 +1,35 @@
+# tests/test_units_decompose.py
+
+from seanox_ai_nlp.units import units, decompose, NumericType
+
+import pytest
+
+
+@pytest.mark.parametrize("text, type, values, operators, sign", [
+    ("900 - 950 km/h", NumericType.RANGE, ("900", "950"), ("-",), None),
+    ("12–14 h", NumericType.RANGE, ("12", "14"), ("–",), None),
+    ("4 −44nm", NumericType.RANGE, ("4", "44"), ("−",), None),
+    ("5 ± 0.1 mm", NumericType.TOLERANCE, ("5", "0.1"), ("±",), None),
+    ("±5 m", NumericType.TOLERANCE, ("5",), (), "±"),
+    ("10 x 20 x 30 cm", NumericType.DIMENSIONS, ("10", "20", "30"), ("x", "x"), None),
+    ("35×22×12 cm", NumericType.DIMENSIONS, ("35", "22", "12"), ("×", "×"), None),
+    ("1.2 × 10^3W", NumericType.OPERATION, ("1.2", "10", "3"), ("×", "^"), None),
+    ("-11nm", NumericType.VALUE, ("11",), (), "-"),
+    ("1 000,5 kg", NumericType.VALUE, ("1 000,5",), (), None),
+])
+def test_units_decompose_01(text, type, values, operators, sign):
+    text = f"The value is {text}."
+    entities = units(text)
+    assert len(entities) == 1
+    numeric = decompose(entities[0])
+    assert numeric.type == type
+    assert numeric.values == values
+    assert numeric.operators == operators
+    assert numeric.sign == sign
+    assert tuple(text[start:end] for start, end in numeric.spans) == values
+
+
+def test_units_decompose_02():
+    entities = units("It is typically expressed in km/h.")
+    assert entities
+    assert all(decompose(entity) is None for entity in entities)
@@ -0,0 +1,61 @@
+# tests/test_units_incremental.py
+
+from seanox_ai_nlp.units import units, units_incremental, NumericLocale
+from time import perf_counter
+
+import random
+import pytest
+
+_TEXT = (
+    " Die Batterie hält ca. 10h bei −20.5 °C."
+    " Das Solarpanel produziert etwa 1.2 × 10^3W unter optimalen Bedingungen."
+    " Der Reifendruck liegt bei 2500hPa, empfohlen sind aber nur 2.5 bar."
+    " Die Verpackung hat Maße von 35×22×12 cm und ein Volumen von ca. 9.24 l."
+    " Die Geschwindigkeit beträgt 900 - 950 km/h, der Verbrauch 21.5kWh auf 100km."
+    " Die Spannung beträgt 230 ± 10 V und die Leistung 1.500,5 W bei 12 345 kg."
+)
+
+_PIECES = ["5", "12 ", "km", "kg", " ", ",", "3.5", "-", " x ", "h", "10^3", "°C", "a", "Abc ", "\n", "±", "/"]
+
+
+def test_units_incremental_01():
+    text = "Die Länge beträgt 5 km, die Breite 2 m."
+    entities = units_incremental(text, units(text), 18, 1, "15")
+    assert entities == units("Die Länge beträgt 15 km, die Breite 2 m.")
+    assert entities[0].value == "15"
+    assert entities[1].start == 36
+    assert units_incremental(text, units(text), 0, len(text), "") == []
+    assert units_incremental("", [], 0, 0, "5 km") == units("5 km")
+    with pytest.raises(ValueError):
+        units_incremental(text, units(text), len(text), 1, "")
+    with pytest.raises(ValueError):
+        units_incremental(text, units(text), -1, 0, "")
+
+
+@pytest.mark.parametrize("seed, locales", [(1, None), (2, None), (3, [NumericLocale.DE])])
+def test_units_incremental_02(seed, locales):
+    generator = random.Random(seed)
+    text = _TEXT
+    entities = units(text, locales)
+    for _ in range(500):
+        offset = generator.randrange(len(text) + 1)
+        deleted = generator.randrange(min(8, len(text) - offset) + 1)
+        inserted = "".join(generator.choice(_PIECES) for _ in range(generator.randrange(3)))
+        entities = units_incremental(text, entities, offset, deleted, inserted, locales)
+        text = text[:offset] + inserted + text[offset + deleted:]
+        assert entities == units(text, locales), f"Edit {offset}, {deleted}, {inserted!r}"
+
+
+def test_units_incremental_benchmark_01():
+    text = _TEXT * 100
+    entities = units(text)
+    offset = len(text) // 2
+    start = perf_counter()
+    units(text[:offset] + "5" + text[offset:])
+    end = perf_counter()
+    print()
+    print(f"Benchmark units: {(end - start) * 1000:.2f} ms")
+    start = perf_counter()
+    units_incremental(text, entities, offset, 0, "5")
+    end = perf_counter()
+    print(f"Benchmark units_incremental: {(end - start) * 1000:.2f} ms")
@@ -0,0 +1,97 @@
+# tests/test_units_index.py
+
+from seanox_ai_nlp.units import units, UnitIndex
+from time import perf_counter
+
+import pytest
+
+_DOCUMENTS = {
+    "doc-1": "Input voltage 220 - 240 V, 50 Hz.",
+    "doc-2": "Battery 12 V with 0.2 kV output, the box measures 10 x 20 x 30 cm.",
+    "doc-3": "Nominal voltage 230 ± 10 V, top speed 900 km/h.",
+    "doc-4": "No measures in this text.",
+    "doc-5": "Temperature -20 K to +5 K, 1.000,5 m.",
+}
+
+
+def _create_index() -> UnitIndex:
+    index = UnitIndex()
+    for document, text in _DOCUMENTS.items():
+        index.add(document, units(text))
+    return index
+
+
+def _assert_index(index: UnitIndex):
+    assert index.query("V", 200, 240) == ["doc-1", "doc-2", "doc-3"]
+    assert index.query("V", 235, 236) == ["doc-1", "doc-3"]
+    assert index.query("V", 245, 250) == []
+    assert index.query("kV", 0.1, 0.21) == ["doc-2"]
+    assert index.query("V", high=20) == ["doc-2"]
+    assert index.query("mm", 150, 250) == ["doc-2"]
+    assert index.query("m", 1000) == ["doc-5"]
+    assert index.query("K", -25, -10) == ["doc-5"]
+    assert index.query("km/h", 800) == ["doc-3"]
+    assert index.query("xyz", 0, 1) == []
+    assert index.query(category="electricity") == ["doc-1", "doc-2", "doc-3"]
+    assert index.units() == ["Hz", "K", "V", "m", "m·h⁻¹"]
+    assert index.units("electricity") == ["V"]
+
+
+def test_units_index_01():
+    index = _create_index()
+    # documents without measures are not included
+    assert len(index) == 4
+    _assert_index(index)
+
+
+def test_units_index_02(tmp_path):
+    path = str(tmp_path / "units.idx")
+    _create_index().save(path)
+    with UnitIndex.load(path) as index:
+        _assert_index(index)
+        index.add("doc-6", units("Output 300 V"))
+        assert index.query("V", 250, 400) == ["doc-6"]
+        assert index.query("V", 200, 240) == ["doc-1", "doc-2", "doc-3"]
+
+
+def test_units_index_03(tmp_path):
+    path = tmp_path / "units.idx"
+    path.write_bytes(b"invalid")
+    with pytest.raises(ValueError):
+        UnitIndex.load(str(path))
+    index = UnitIndex()
+    index.add(("doc", 1), units("10 V"))
+    with pytest.raises(TypeError):
+        index.save(str(tmp_path / "invalid.idx"))
+
+
+def test_units_index_04(tmp_path):
+    # The arrays of a loaded index are views on its file, saving to the same
+    # file must not overwrite them while they are written.
+    path = str(tmp_path / "units.idx")
+    _create_index().save(path)
+    with UnitIndex.load(path) as index:
+        index.save(path)
+        _assert_index(index)
+        index.add("doc-6", units("Output 300 V"))
+        index.save(path)
+    with UnitIndex.load(path) as index:
+        assert index.query("V", 200, 240) == ["doc-1", "doc-2", "doc-3"]
+        assert index.query("V", 250, 400) == ["doc-6"]
+        assert index.query("km/h", 800) == ["doc-3"]
+    assert [file.name for file in tmp_path.iterdir()] == ["units.idx"]
+
+
+def test_units_index_benchmark_01():
+    index = UnitIndex()
+    for number in range(10000):
+        index.add(number, units(f"Voltage {number % 400} V, current {number % 16} A"))
+    start = perf_counter()
+    for number in range(1000):
+        index.query("V", number % 400, number % 400 + 10)
+    end = perf_counter()
+
+    print()
+    print(f"Benchmark documents: {len(index)}")
+    print(f"Benchmark queries: 1000")
+    print(f"Benchmark duration: {(end - start) * 1000:.2f} ms")
@@ -0,0 +1,51 @@
+# tests/test_units_languages.py
+
+from seanox_ai_nlp.units import units, units_async, units_bytes, units_incremental
+from time import perf_counter
+
+import asyncio
+import pytest
+
+_TEXT_EN = (
+    "I'm sure it's fine, don't worry. We can't say a word in the end at 5 o'clock."
+    " He is a man of the world, as it is. It is 5 m long and runs at 30 km/h in a car."
+    " The value is stored in kWh, as in the manual."
+)
+
+_TEXT_DE = "Das ist ab sofort am besten in Ordnung. Am Ende sind es 5 A und 3 m in km/h."
+
+
+def test_units_languages_01():
+    assert [entity.text for entity in units(_TEXT_EN)] == [
+        "m", "s", "t", "t", "a", "in", "a", "as", "5 m", "30 km/h", "in", "a", "in", "kWh", "as", "in"
+    ]
+    assert [entity.text for entity in units(_TEXT_EN, languages=["en"])] == ["5 m", "30 km/h", "kWh"]
+    assert [entity.text for entity in units(_TEXT_DE, languages=["de"])] == ["5 A", "3 m", "km/h"]
+    assert [entity.text for entity in units(_TEXT_DE, languages=["en"])] == ["ab", "5 A", "3 m", "km/h"]
+    assert units(_TEXT_EN, languages=[]) == units(_TEXT_EN)
+
+
+def test_units_languages_02():
+    with pytest.raises(ValueError):
+        units(_TEXT_EN, languages=["xx"])
+    buffer = _TEXT_EN.encode("utf-8")
+    assert [entity.text for entity in units_bytes(buffer, languages=["en"])] == ["5 m", "30 km/h", "kWh"]
+    entities = units(_TEXT_EN, languages=["en"])
+    entities = units_incremental(_TEXT_EN, entities, 64, 2, "", languages=["en"])
+    assert entities == units(_TEXT_EN[:64] + _TEXT_EN[66:], languages=["en"])
+    for threshold in (None, 0):
+        entities = asyncio.run(units_async(_TEXT_EN, languages=["en"], threshold=threshold))
+        assert entities == units(_TEXT_EN, languages=["en"])
+
+
+def test_units_languages_benchmark_01():
+    text = _TEXT_EN * 100
+    units(text, languages=["en"])
+    for languages in (None, ["en"]):
+        start = perf_counter()
+        entities = units(text, languages=languages)
+        end = perf_counter()
+        print()
+        print(f"Benchmark languages: {languages}")
+        print(f"Benchmark detections: {len(entities)} units + measures")
+        print(f"Benchmark duration: {(end - start) * 1000:.2f} ms")
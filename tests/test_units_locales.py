@@ -0,0 +1,56 @@
+# tests/test_units_locales.py
+
+from seanox_ai_nlp.units import (
+    units, numeric_patterns, NumericLocale, UNIT_PATTERN, NUMERIC_VALIDATION_PATTERN
+)
+from time import perf_counter
+
+import pytest
+
+_TEXT = "Die Leistung liegt bei 1.500,5 W, also 1,500 W und 12 345,6 kg."
+
+
+def test_units_locales_01():
+    assert numeric_patterns() == numeric_patterns(NumericLocale)
+    assert numeric_patterns().unit is UNIT_PATTERN
+    assert numeric_patterns().numeric_validation is NUMERIC_VALIDATION_PATTERN
+    assert numeric_patterns([NumericLocale.DE]) is numeric_patterns({NumericLocale.DE})
+    with pytest.raises(ValueError):
+        numeric_patterns([])
+
+
+@pytest.mark.parametrize("locales, valid, invalid", [
+    ([NumericLocale.DE], ["1.234", "12.345,67", "123456"], ["1,000,000.99", "1’234"]),
+    ([NumericLocale.EN], ["1,234", "12,345.67", "123456"], ["1.000.000,99", "1 234"]),
+    ([NumericLocale.CH, NumericLocale.FR], ["1’234", "1 234,5"], ["1.000.000,99", "1,000.5"]),
+])
+def test_units_locales_02(locales, valid, invalid):
+    pattern = numeric_patterns(locales).numeric_validation
+    for numeric in valid:
+        assert pattern.match(numeric), f"Should match: {numeric}"
+    for numeric in invalid:
+        assert not pattern.match(numeric), f"Should NOT match: {numeric}"
+
+
+def test_units_locales_03():
+    assert [entity.value for entity in units(_TEXT)] == ["1.500,5", "1,500", "12 345,6"]
+    assert [entity.value for entity in units(_TEXT, [NumericLocale.DE])] == ["1.500,5", "1,500", "345,6"]
+    assert [entity.value for entity in units(_TEXT, [NumericLocale.EN])] == [None, "1,500", None]
+    assert [entity.value for entity in units(_TEXT, NumericLocale)] == ["1.500,5", "1,500", "12 345,6"]
+
+
+def test_units_locales_benchmark_01():
+    text = (
+        "Der Reifendruck liegt bei 2500hPa, empfohlen sind aber nur 2.5 bar."
+        " Die Verpackung hat Maße von 35×22×12 cm und ein Volumen von ca. 9.24 l."
+        " Der Stromverbrauch liegt bei max. 65 W, die Ladezeit bei 3.5h."
+    ) * 100
+    for locales in (None, [NumericLocale.EN]):
+        units(text, locales)
+        start = perf_counter()
+        entities = units(text, locales)
+        end = perf_counter()
+        print()
+        print(f"Benchmark locales: {'all' if locales is None else ', '.join(locale.name for locale in locales)}")
+        print(f"Benchmark detections: {len(entities)} units + measures")
+        print(f"Benchmark duration: {(end - start) * 1000:.2f} ms")
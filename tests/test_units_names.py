@@ -0,0 +1,105 @@
+# tests/test_units_names.py
+
+from seanox_ai_nlp.units import units, units_async, units_incremental, Scanner, NumericLocale
+from time import perf_counter
+
+import asyncio
+import pytest
+
+
+@pytest.mark.parametrize("text, unit, value", [
+    ("The plane flies 900 kilometers per hour.", "km/h", "900"),
+    ("The room has 20 square meters.", "m²", "20"),
+    ("The tank holds 3 cubic metres.", "m³", "3"),
+    ("It took 5 seconds.", "s", "5"),
+    ("It took 5 milliseconds.", "ms", "5"),
+    ("The battery has 10 kilowatt hours.", "kWh", "10"),
+    ("The file has 3 kibibytes.", "KiB", "3"),
+    ("The file has 3 Gigabytes.", "GB", "3"),
+    ("Der Raum hat 20 Quadratmeter.", "m²", "20"),
+    ("Es sind 5 Grad Celsius.", "ºC", "5"),
+    ("Es sind 5 Grad  Celsius.", "ºC", "5"),
+    ("Der Speicher hat 10 Kilowattstunden.", "kWh", "10"),
+    ("Das Auto fährt 120 Kilometer pro Stunde.", "km/h", "120"),
+])
+def test_units_names_01(text, unit, value):
+    entities = [entity for entity in units(text, names=True) if entity.label == "MEASURE"]
+    assert len(entities) == 1
+    assert entities[0].unit == unit
+    assert entities[0].value == value
+    assert text[entities[0].start:entities[0].end] == entities[0].text
+    assert entities[0].text.split()[-1] in text
+
+
+def test_units_names_02():
+
+    # Without names, the result is unchanged.
+    text = "The plane flies 900 kilometers per hour, 5 Bit/s and 20 km/h."
+    assert [entity.text for entity in units(text)] == ["5 Bit/s", "20 km/h"]
+    assert [entity.text for entity in units(text, names=True)] == [
+        "900 kilometers per hour", "5 Bit/s", "20 km/h"
+    ]
+
+    # Symbols remain symbols.
+    assert [entity.text for entity in units("Die Leitung hat 5 Bit/s.", names=True)] == ["5 Bit/s"]
+    assert units("20 km/h", names=True) == units("20 km/h")
+
+    # Names without value.
+    entities = units("kilometers are long", names=True)
+    assert [(entity.label, entity.unit) for entity in entities] == [("UNIT", "km")]
+
+    # Ambiguous names are only extracted with a value.
+    assert [entity.text for entity in units("Wait a second, 2 seconds.", names=True, languages=["en"])] \
+        == ["2 seconds"]
+    assert [entity.text for entity in units("Eine Bar mit 2 Bar.", names=True, languages=["de"])] \
+        == ["2 Bar"]
+
+
+def test_units_names_03():
+    text = "Das Auto fährt 120,5 Kilometer pro Stunde."
+    entities = units(text, [NumericLocale.DE], names=True)
+    assert [(entity.unit, entity.value) for entity in entities] == [("km/h", "120,5")]
+    with pytest.raises(ValueError):
+        units(text, [], names=True)
+
+
+def test_units_names_04():
+    text = "The plane flies 900 kilometers per hour and the car 20 km/h for 5 seconds."
+    entities = units(text, names=True)
+    assert asyncio.run(units_async(text, names=True)) == entities
+    assert asyncio.run(units_async(text, names=True, threshold=0)) == entities
+    assert Scanner(names=True).scan(text) == entities
+
+    edited = text.replace("900", "950")
+    result = units_incremental(text, units(text, names=True), text.index("900"), 3, "950", names=True)
+    assert result == units(edited, names=True)
+    edited = text.replace("hour", "hour ")
+    result = units_incremental(text, units(text, names=True), text.index("hour") + 4, 0, " ", names=True)
+    assert result == units(edited, names=True)
+
+
+@pytest.mark.parametrize("text, unit", [
+    ("5 \u017Feconds", "s"),
+    ("2 \u0130nches", "in"),
+    ("4 \u212Ailograms", "kg"),
+    ("5 FU\u1E9E", "ft")
+])
+def test_units_names_05(text, unit):
+    # Case variants outside of ASCII, which lower() does not map to the name.
+    assert [entity.unit for entity in units(text, names=True)] == [unit]
+
+
+def test_units_names_benchmark_01():
+    text = " ".join(["The plane flies 900 kilometers per hour, the road is 12 km long."] * 2000)
+    units(text)
+    units(text, names=True)
+    start = perf_counter()
+    units(text)
+    end = perf_counter()
+    print()
+    print(f"Benchmark units: {(end - start) * 1000:.2f} ms")
+    start = perf_counter()
+    entities = units(text, names=True)
+    end = perf_counter()
+    assert len(entities) == 4000
+    print(f"Benchmark units with names: {(end - start) * 1000:.2f} ms")
@@ -0,0 +1,67 @@
+# tests/test_units_parse_unit.py
+
+from seanox_ai_nlp.units import units, parse_unit, UnitFactor
+
+import pickle
+import pytest
+
+
+@pytest.mark.parametrize("unit, expected", [
+    ("kg·m/s²", "kg·m·s⁻²"),
+    ("W / m2", "W·m⁻²"),
+    ("km x h", "h·km"),
+    ("km/h", "km·h⁻¹"),
+    ("kWh/m²", "kWh·m⁻²"),
+    ("mol·L⁻¹", "mol·L⁻¹"),
+    ("hPa", "hPa"),
+    ("MiB", "MiB"),
+    ("qm", "m²"),
+    ("sq. ft", "ft²"),
+    ("cm3", "cm³"),
+    ("m·m", "m²"),
+    ("min", "min"),
+    ("Pa", "Pa"),
+    ("db(A)", "db(A)"),
+])
+def test_units_parse_unit_01(unit, expected):
+    assert str(parse_unit(unit)) == expected
+
+
+def test_units_parse_unit_02():
+    # different spellings, same object
+    assert parse_unit("km/h") is parse_unit("km / h")
+    assert parse_unit("km/h") is parse_unit("km·h⁻¹")
+    assert parse_unit("N·m") is parse_unit("m × N")
+    assert parse_unit("m²") is parse_unit("m2")
+    assert parse_unit("km/h") != parse_unit("m/h")
+    assert pickle.loads(pickle.dumps(parse_unit("km/h"))) is parse_unit("km/h")
+    assert parse_unit("kg·m/s²").factors == (
+        UnitFactor("k", "g", 1),
+        UnitFactor(None, "m", 1),
+        UnitFactor(None, "s", -2)
+    )
+
+
+def test_units_parse_unit_03():
+    assert parse_unit("km/h").scale == 1000
+    assert parse_unit("km/h").base is parse_unit("m/h")
+    assert parse_unit("cm³").scale == 1e-6
+    assert parse_unit("MiB").scale == 2 ** 20
+    assert parse_unit("hPa").base is parse_unit("Pa")
+
+
+def test_units_parse_unit_04():
+    assert parse_unit("") is None
+    assert parse_unit("xyz") is None
+    assert parse_unit("km/xyz") is None
+
+
+def test_units_parse_unit_05():
+    text = (
+        "The cruising speed of the Boeing 747 is approximately 900 - 950 km/h (559 mph)."
+        " At 10 km / h and 20 km/h it is slower."
+    )
+    groups = {}
+    for entity in units(text):
+        groups.setdefault(parse_unit(entity.unit), []).append(entity.text)
+    assert groups[parse_unit("km/h")] == ["900 - 950 km/h", "10 km / h", "20 km/h"]
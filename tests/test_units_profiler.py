@@ -0,0 +1,72 @@
+# tests/test_units_profiler.py
+
+from seanox_ai_nlp.units import units, profile_units, UnitsProfile, PatternProfile, NumericLocale
+from seanox_ai_nlp.units.units import _UNIT_RAW_PATTERN, _NUMERIC_PATTERN, _re_compile
+from seanox_ai_nlp.units.profiler import _PROFILER_UNIT_ALTERNATIVES
+from time import perf_counter
+
+import pytest
+
+_TEXTS = [
+    "Die Strecke beträgt 12,5 km bei 900 km/h und 1.000,5 kg.",
+    "The file has 5 KiB, the road is 1,200.5 ft long at 25 mph.",
+    "Es sind 12 345 m² bei 20 ºC und 3 dz.",
+    "Ohne Einheiten."
+]
+
+
+def test_units_profiler_01():
+
+    # The alternatives are the complete top-level alternation.
+    expression = "|".join(_re_compile(alternative, debug=True) for alternative in _PROFILER_UNIT_ALTERNATIVES.values())
+    assert f"(?:{expression})" == _re_compile(_UNIT_RAW_PATTERN, debug=True)
+    expression = "|".join(locale.value for locale in NumericLocale)
+    assert f"(?:{expression})" == _re_compile(_NUMERIC_PATTERN, debug=True)
+
+
+def test_units_profiler_02():
+    profile = profile_units(_TEXTS, repeat=1)
+    assert isinstance(profile, UnitsProfile)
+    assert all(isinstance(alternative, PatternProfile) for alternative in profile.alternatives)
+    assert profile.matches >= sum(len(units(text)) for text in _TEXTS)
+    names = {alternative.name for alternative in profile.alternatives}
+    assert names == {"unit.si", "unit.informal", "unit.iec", "unit.common"} \
+        | {f"numeric.{locale.name}" for locale in NumericLocale}
+    times = [alternative.time for alternative in profile.alternatives]
+    assert times == sorted(times, reverse=True)
+    assert sum(alternative.share for alternative in profile.alternatives) == pytest.approx(1.0)
+
+    attributed = {alternative.name: alternative.attributed for alternative in profile.alternatives}
+    assert attributed["unit.si"] == 7
+    assert attributed["unit.informal"] == 2
+    assert attributed["unit.iec"] == 1
+    assert attributed["unit.common"] == 1
+    assert attributed["numeric.DE"] == 7
+    assert attributed["numeric.EN"] == 1
+    assert attributed["numeric.FR"] == 1
+    assert attributed["numeric.IN"] == 0
+
+
+def test_units_profiler_03():
+    profile = profile_units(_TEXTS, locales=[NumericLocale.EN], repeat=1)
+    names = {alternative.name for alternative in profile.alternatives}
+    assert names == {"unit.si", "unit.informal", "unit.iec", "unit.common", "numeric.EN"}
+    assert profile_units([], repeat=1).matches == 0
+    with pytest.raises(ValueError):
+        profile_units(_TEXTS, locales=[])
+    with pytest.raises(ValueError):
+        profile_units(_TEXTS, repeat=0)
+
+
+def test_units_profiler_benchmark_01():
+    start = perf_counter()
+    profile = profile_units(_TEXTS * 500)
+    end = perf_counter()
+    print()
+    print(f"Benchmark profile_units: {(end - start) * 1000:.2f} ms")
+    print(f"Unit pattern: {profile.time * 1000:.2f} ms, {profile.matches} matches")
+    for alternative in profile.alternatives:
+        print(
+            f"{alternative.name:16} {alternative.time * 1000:8.2f} ms {alternative.share:6.1%}"
+            f" {alternative.matches:8} {alternative.attributed:8}"
+        )
@@ -0,0 +1,155 @@
+# tests/test_units_scanner.py
+
+from seanox_ai_nlp.units import units, Scanner, ScannerMatch, NumericLocale
+from time import perf_counter
+
+import re
+import pytest
+
+_TEXT = (
+    " Gehäuse nach DIN EN 60529 mit Schutzart IP67, Teilenummer AB-1234-X."
+    " Die Batterie hält ca. 10h bei −20.5 °C, die Spannung beträgt 230 ± 10 V."
+    " Ersatzteil CD-5678-Y nach ISO 9001, Schutzart IP5X, Gewicht 12 345 kg."
+)
+
+_NORM_PATTERN = r"\b(?:DIN|EN|ISO)(?:\s(?:EN|ISO))*\s\d+\b"
+_IP_PATTERN = r"\bIP(?P<ip>\d[\dX])\b"
+_PART_PATTERN = r"\b[A-Z]{2}-\d{4}-[A-Z]\b"
+
+
+def _create_scanner(**kwargs) -> Scanner:
+    return (
+        Scanner(**kwargs)
+        .register("NORM", _NORM_PATTERN)
+        .register("IP", _IP_PATTERN)
+        .register("PART", _PART_PATTERN)
+    )
+
+
+def test_units_scanner_01():
+    entities = _create_scanner().scan(_TEXT)
+    matches = [entity for entity in entities if isinstance(entity, ScannerMatch)]
+    assert [(entity.label, entity.text) for entity in matches] == [
+        ("NORM", "DIN EN 60529"),
+        ("IP", "IP67"),
+        ("PART", "AB-1234-X"),
+        ("PART", "CD-5678-Y"),
+        ("NORM", "ISO 9001"),
+        ("IP", "IP5X")
+    ]
+    assert matches[1].groups == {"ip": "67"}
+    assert all(_TEXT[entity.start:entity.end] == entity.text for entity in matches)
+    # Units within the matches (EN in DIN EN 60529) are omitted.
+    assert [entity for entity in entities if not isinstance(entity, ScannerMatch)] == [
+        entity for entity in units(_TEXT)
+        if not any(match.start <= entity.start < match.end for match in matches)
+    ]
+    assert len(entities) - len(matches) == len(units(_TEXT)) - 1
+    assert [entity.start for entity in entities] == sorted(entity.start for entity in entities)
+
+
+def test_units_scanner_02():
+    assert Scanner().scan(_TEXT) == units(_TEXT)
+    assert Scanner(locales=[NumericLocale.DE]).scan(_TEXT) == units(_TEXT, [NumericLocale.DE])
+    assert Scanner(languages=["de"]).scan("in 5 m") == units("in 5 m", languages=["de"])
+    assert Scanner().scan("") == []
+    assert Scanner(units=False).scan(_TEXT) == []
+    scanner = Scanner(units=False).register("IP", _IP_PATTERN)
+    assert [entity.text for entity in scanner.scan(_TEXT)] == ["IP67", "IP5X"]
+    assert len(scanner) == 1
+    assert "IP" in scanner
+
+
+def test_units_scanner_03():
+
+    # Registered patterns take precedence over units at the same position.
+    scanner = Scanner().register("SIZE", r"\b\d+ km\b")
+    entities = scanner.scan("Die Strecke ist 5 km lang.")
+    assert entities == [ScannerMatch(label="SIZE", start=16, end=20, text="5 km", groups={})]
+
+    # Flags of compiled patterns are only applied to the pattern.
+    scanner = Scanner(units=False)
+    scanner.register("PART", re.compile(r" p \d+  # part number", re.IGNORECASE | re.VERBOSE))
+    scanner.register("WORD", r"part")
+    assert [entity.text for entity in scanner.scan("P12, p7, PART, part")] == ["P12", "p7", "part"]
+
+    # Function creates the result, None skips the match.
+    scanner = Scanner(units=False)
+    scanner.register("NUMBER", r"\d+", lambda match: int(match.group()) if match.group() != "0" else None)
+    assert scanner.scan("1 0 22") == [1, 22]
+
+
+def test_units_scanner_04():
+    scanner = Scanner().register("IP", _IP_PATTERN)
+    with pytest.raises(ValueError):
+        scanner.register("IP", _IP_PATTERN)
+    with pytest.raises(ValueError):
+        scanner.register("1P", _IP_PATTERN)
+    with pytest.raises(ValueError):
+        scanner.register("_units", _IP_PATTERN)
+    with pytest.raises(ValueError):
+        scanner.register("BROKEN", r"(")
+    with pytest.raises(ValueError):
+        scanner.register("OTHER", r"(?P<ip>\d)")
+    with pytest.raises(ValueError):
+        scanner.register("unit_unit", r"x")
+    with pytest.raises(ValueError):
+        scanner.register("BYTES", re.compile(rb"x"))
+    assert len(scanner) == 1
+    assert scanner.scan("IP67") == [ScannerMatch(label="IP", start=0, end=4, text="IP67", groups={"ip": "67"})]
+
+
+@pytest.mark.parametrize("pattern", [
+    r"IP(\d\d)",
+    r"(?P<a>x)(y)",
+    re.compile(r"(\d+) mm", re.IGNORECASE)
+])
+def test_units_scanner_05(pattern):
+    # Numbered groups would be shifted by the combined pattern.
+    scanner = Scanner()
+    with pytest.raises(ValueError, match="Numbered groups"):
+        scanner.register("NUMBERED", pattern)
+    assert len(scanner) == 0
+
+
+@pytest.mark.parametrize("pattern", [
+    r"(?P<a>x)\1",
+    r"(?P<a>x)-\\\1",
+    r"(?P<a>x)?(?(1)y|z)",
+    r"(?P<a>[a-z])[\]]\1"
+])
+def test_units_scanner_06(pattern):
+    # Numbered backreferences would be shifted by the combined pattern.
+    scanner = Scanner()
+    with pytest.raises(ValueError, match="Numbered backreferences"):
+        scanner.register("NUMBERED", pattern)
+    assert len(scanner) == 0
+
+
+def test_units_scanner_07():
+
+    # Named backreferences, literal backslashes and octal escapes are valid.
+    scanner = Scanner()
+    for name, pattern in enumerate([
+        r"(?P<a>x)(?P=a)", r"(?P<b>y)?(?(b)y|z)", r"\\1", r"[\1]", r"\101", r"\0", r"(?:x)"
+    ]):
+        scanner.register(f"VALID_{name}", pattern)
+    assert len(scanner) == 7
+    assert [match.text for match in scanner.scan("xx \\1 A")][:3] == ["xx", "\\1", "A"]
+
+
+def test_units_scanner_benchmark_01():
+    text = _TEXT * 500
+    patterns = [re.compile(pattern) for pattern in (_NORM_PATTERN, _IP_PATTERN, _PART_PATTERN)]
+    scanner = _create_scanner()
+    start = perf_counter()
+    units(text)
+    for pattern in patterns:
+        list(pattern.finditer(text))
+    end = perf_counter()
+    print()
+    print(f"Benchmark units + {len(patterns)} patterns: {(end - start) * 1000:.2f} ms")
+    start = perf_counter()
+    scanner.scan(text)
+    end = perf_counter()
+    print(f"Benchmark Scanner: {(end - start) * 1000:.2f} ms")
@@ -0,0 +1,69 @@
+# tests/test_units_threads.py
+
+from seanox_ai_nlp.units import units, units_bytes
+from seanox_ai_nlp.units.units import _get_categories_for_unit, _get_symbols_for_unit
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+
+import sys
+import threading
+
+_TEXT = (
+    " Die Batterie hält ca. 10h bei −20.5 °C, die Datei hat 5 GB."
+    " Das Solarpanel produziert etwa 1.2 × 10^3W unter optimalen Bedingungen."
+    " Der Reifendruck liegt bei 2500hPa, der Wind weht mit 25 kt."
+    " Die Verpackung hat Maße von 35×22×12 cm und ein Volumen von ca. 9.24 l."
+    " Die Geschwindigkeit beträgt 900 - 950 km/h, der Verbrauch 21.5kWh auf 100km."
+)
+
+
+def _is_gil_enabled() -> bool:
+    function = getattr(sys, "_is_gil_enabled", None)
+    return function() if function else True
+
+
+def test_units_threads_01():
+
+    # Results in threads are identical to the single thread, also while the
+    # caches are cleared at the same time.
+
+    texts = [_TEXT[index:] + _TEXT[:index] for index in range(0, len(_TEXT), 7)]
+    expected = [units(text) for text in texts]
+    expected_bytes = [units_bytes(text.encode("utf-8")) for text in texts]
+
+    stop = threading.Event()
+
+    def clear():
+        while not stop.is_set():
+            _get_categories_for_unit.__self__.clear()
+            _get_symbols_for_unit.__self__.clear()
+
+    def extract(index: int):
+        return units(texts[index]), units_bytes(texts[index].encode("utf-8"))
+
+    thread = threading.Thread(target=clear)
+    thread.start()
+    try:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            for _ in range(3):
+                results = list(executor.map(extract, range(len(texts))))
+                assert [result[0] for result in results] == expected
+                assert [result[1] for result in results] == expected_bytes
+    finally:
+        stop.set()
+        thread.join()
+
+
+def test_units_threads_benchmark_01():
+    texts = [_TEXT * 20] * 64
+    units(texts[0])
+    print()
+    print(f"Benchmark threads with GIL enabled: {_is_gil_enabled()}")
+    baseline = None
+    for workers in (1, 2, 4, 8):
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            start = perf_counter()
+            list(executor.map(units, texts))
+            end = perf_counter()
+        baseline = baseline or end - start
+        print(f"Benchmark units {workers} threads: {(end - start) * 1000:.2f} ms, speedup {baseline / (end - start):.2f}")
@@ -166,6 +166,19 @@ def test_units_02(text):
     assert actual == expected, f"\nExpected:\n{expected}\n\nGot:\n{actual}"
 
 
+@pytest.mark.parametrize("text, unit, categories", [
+    ("20 ºC", "ºC", ("temperature",)),
+    ("10 Ω", "Ω", ("electricity",)),
+    ("4,7 kΩ", "kΩ", ("electricity",)),
+    ("5′", "′", ("length",)),
+    ("3″", "″", ("length",))
+])
+def test_units_03(text, unit, categories):
+    # The symbols are escaped in the classification table.
+    entities = units(text)
+    assert [(entity.unit, entity.categories) for entity in entities] == [(unit, categories)]
+
+
 def test_units_benchmark_01():
     text = _TEST_CASE_01 + _TEST_CASE_02
     start = perf_counter()
@@ -0,0 +1,66 @@
+# tests/test_units_validation.py
+
+from seanox_ai_nlp.units import units, UNIT_PATTERN, UNIT_EXPRESSION_VALIDATION_PATTERN
+from time import perf_counter
+
+import importlib
+import pytest
+
+_units = importlib.import_module("seanox_ai_nlp.units.units")
+
+_TEXT = (
+    " Die Batterie hält ca. 10h bei −20.5 °C."
+    " Das Solarpanel produziert etwa 1.2 × 10^3W unter optimalen Bedingungen."
+    " Der Reifendruck liegt bei 2500hPa, empfohlen sind aber nur 2.5 bar."
+    " Die Verpackung hat Maße von 35×22×12 cm und ein Volumen von ca. 9.24 l."
+    " Die Geschwindigkeit beträgt 900 - 950 km/h, der Verbrauch 21.5kWh auf 100km."
+    " Die Fläche beträgt 12 sq. ft bzw. 3 m², die Dichte 7,8 g/cm³ und 16 GiB RAM."
+)
+
+
+def _candidates(text):
+    return [
+        match.group("unit_value_unit") or match.group("unit_unit")
+        for match in UNIT_PATTERN.finditer(text)
+    ]
+
+
+@pytest.mark.parametrize("unit", [
+    "m", "km", "m²", "cm³", "m⁻¹", "kWh", "hPa", "µm", "GiB", "B", "sq. ft", "qm", "ft2", "\u00BAC", "%", "oz. tr."
+])
+def test_units_validation_01(unit):
+    assert unit in _units._UNIT_TOKENS_SET
+    assert UNIT_EXPRESSION_VALIDATION_PATTERN.match(unit)
+
+
+@pytest.mark.parametrize("unit", ["km/h", "kg·m/s²", "W / m2", "km x h"])
+def test_units_validation_02(unit):
+    assert unit not in _units._UNIT_TOKENS_SET
+    assert _units._is_valid_unit(unit)
+
+
+def test_units_validation_03():
+    for token in _units._UNIT_TOKENS_SET:
+        assert UNIT_EXPRESSION_VALIDATION_PATTERN.match(token), token
+    for unit in _candidates(_TEXT) + ["das", "ca", "GPS", "kmh", "m/", "xyz"]:
+        assert _units._is_valid_unit(unit) == bool(UNIT_EXPRESSION_VALIDATION_PATTERN.match(unit)), unit
+
+
+def test_units_validation_benchmark_01():
+    candidates = _candidates(_TEXT * 100)
+    units(_TEXT)
+    start = perf_counter()
+    for unit in candidates:
+        UNIT_EXPRESSION_VALIDATION_PATTERN.match(unit)
+    end = perf_counter()
+    pattern = (end - start) / len(candidates)
+    start = perf_counter()
+    for unit in candidates:
+        _units._is_valid_unit(unit)
+    end = perf_counter()
+    tokens = (end - start) / len(candidates)
+    print()
+    print(f"Benchmark candidates: {len(candidates)}")
+    print(f"Benchmark pattern: {pattern * 1000000:.3f} µs per match")
+    print(f"Benchmark token set + pattern: {tokens * 1000000:.3f} µs per match")
+    print(f"Benchmark saved: {(pattern - tokens) * 1000000:.3f} µs per match")